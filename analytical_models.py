@@ -5,88 +5,317 @@ This file contains:
 - chu_lmax
 - ham_lmax
 and helper functions for multiple runs.
+
+The closed-form models are evaluated by ``*_lmax_batch`` functions that take
+column arrays (anything NumPy can broadcast) and return a ``BatchResult`` with
+one Lmax per row plus a validity mask, so a single bad row never aborts a
+screening batch. The scalar functions are thin wrappers around them.
 """
 
 from __future__ import annotations
 
 import math
-from typing import Iterable, List
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List
+
+import numpy as np
+from scipy.special import erf, erfcinv, erfinv
+
+from model_cache import memoize
+
+
+# -------------------------
+# BATCH HELPERS
+# -------------------------
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Lmax per row; invalid rows are NaN and carry their message in ``errors``."""
+
+    lmax: np.ndarray
+    valid: np.ndarray
+    errors: np.ndarray
+
+    def raise_for_errors(self) -> None:
+        """Raise the first row error as ``ValueError`` (scalar/legacy behaviour)."""
+        valid = np.ravel(self.valid)
+        if not valid.all():
+            first = int(np.flatnonzero(~valid)[0])
+            raise ValueError(str(np.ravel(self.errors)[first]))
+
+
+class _RowErrors:
+    """Collect per-row validation failures; the first failing check wins."""
+
+    def __init__(self, shape: tuple):
+        self.valid = np.ones(shape, dtype=bool)
+        self.errors = np.full(shape, None, dtype=object)
+
+    def flag(self, mask: np.ndarray, message: str) -> None:
+        mask = np.logical_and(mask, self.valid)
+        self.errors[mask] = message
+        self.valid &= ~mask
 
-from scipy.special import erf, erfcinv
+    def result(self, lmax: np.ndarray) -> BatchResult:
+        return BatchResult(lmax=np.where(self.valid, lmax, np.nan), valid=self.valid, errors=self.errors)
+
+
+def _columns(*values: Any) -> tuple[list[np.ndarray], _RowErrors]:
+    columns = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+    errors = _RowErrors(columns[0].shape)
+    errors.flag(~np.all([np.isfinite(c) for c in columns], axis=0), "All inputs must be finite numbers")
+    return columns, errors
+
+
+def _entry_columns(entries: Iterable[Iterable[float]], width: int) -> np.ndarray:
+    """Turn the legacy list-of-rows input into ``width`` column arrays."""
+    return np.asarray(list(entries), dtype=float).reshape(-1, width).T
 
 
 # -------------------------
 # LIEDL et al. (2005)
 # -------------------------
 
-def liedl_lmax(M: float, alpha_Tv: float, gamma: float, C_EA0: float, C_ED0: float) -> float:
-    if alpha_Tv <= 0:
-        raise ValueError("alpha_Tv must be positive")
-    if C_EA0 <= 0:
-        raise ValueError("C_EA0 must be positive")
+def liedl_lmax_batch(M, alpha_Tv, gamma, C_EA0, C_ED0) -> BatchResult:
+    (M, alpha_Tv, gamma, C_EA0, C_ED0), errors = _columns(M, alpha_Tv, gamma, C_EA0, C_ED0)
+    errors.flag(alpha_Tv <= 0, "alpha_Tv must be positive")
+    errors.flag(C_EA0 <= 0, "C_EA0 must be positive")
+
+    with np.errstate(all="ignore"):
+        inside_log = ((gamma * C_ED0 + C_EA0) / C_EA0) * (4.0 / np.pi)
+        errors.flag(~(inside_log > 0), "Log argument must be > 0")
+        lmax = ((4.0 * M * M) / (np.pi * np.pi * alpha_Tv)) * np.log(inside_log)
+    return errors.result(lmax)
 
-    lmax = ((4.0 * M * M) / (math.pi * math.pi * alpha_Tv)) * math.log(
-        ((gamma * C_ED0 + C_EA0) / C_EA0) * (4.0 / math.pi)
-    )
-    return float(lmax)
+
+@memoize("liedl")
+def liedl_lmax(M: float, alpha_Tv: float, gamma: float, C_EA0: float, C_ED0: float) -> float:
+    result = liedl_lmax_batch(M, alpha_Tv, gamma, C_EA0, C_ED0)
+    result.raise_for_errors()
+    return float(result.lmax)
 
 
 def compute_liedl_multiple(entries: Iterable[Iterable[float]]) -> List[float]:
-    results: List[float] = []
-    for row in entries:
-        M, alpha_Tv, gamma, C_EA0, C_ED0 = row
-        results.append(liedl_lmax(M, alpha_Tv, gamma, C_EA0, C_ED0))
-    return results
+    result = liedl_lmax_batch(*_entry_columns(entries, 5))
+    result.raise_for_errors()
+    return result.lmax.tolist()
 
 
 # -------------------------
 # CHU et al.
 # -------------------------
 
-def chu_lmax(W: float, alpha_Th: float, gamma: float, C_EA0: float, C_ED0: float, epsilon: float) -> float:
-    if alpha_Th <= 0:
-        raise ValueError("alpha_Th must be positive")
-    if C_EA0 - epsilon <= 0:
-        raise ValueError("C_EA0 - epsilon must be positive")
+def chu_lmax_batch(W, alpha_Th, gamma, C_EA0, C_ED0, epsilon) -> BatchResult:
+    (W, alpha_Th, gamma, C_EA0, C_ED0, epsilon), errors = _columns(W, alpha_Th, gamma, C_EA0, C_ED0, epsilon)
+    errors.flag(alpha_Th <= 0, "alpha_Th must be positive")
+    errors.flag(C_EA0 - epsilon <= 0, "C_EA0 - epsilon must be positive")
 
-    lmax = ((math.pi * W * W) / (16.0 * alpha_Th)) * (((gamma * C_ED0) / (C_EA0 - epsilon)) ** 2)
-    return float(lmax)
+    with np.errstate(all="ignore"):
+        lmax = ((np.pi * W * W) / (16.0 * alpha_Th)) * (((gamma * C_ED0) / (C_EA0 - epsilon)) ** 2)
+    return errors.result(lmax)
+
+
+@memoize("chu")
+def chu_lmax(W: float, alpha_Th: float, gamma: float, C_EA0: float, C_ED0: float, epsilon: float) -> float:
+    result = chu_lmax_batch(W, alpha_Th, gamma, C_EA0, C_ED0, epsilon)
+    result.raise_for_errors()
+    return float(result.lmax)
 
 
 def compute_chu_multiple(entries: Iterable[Iterable[float]]) -> List[float]:
-    results: List[float] = []
-    for row in entries:
-        W, alpha_Th, gamma, C_EA0, C_ED0, epsilon = row
-        results.append(chu_lmax(W, alpha_Th, gamma, C_EA0, C_ED0, epsilon))
-    return results
+    result = chu_lmax_batch(*_entry_columns(entries, 6))
+    result.raise_for_errors()
+    return result.lmax.tolist()
 
 
 # -------------------------
 # HAM et al.
 # -------------------------
 
-def ham_lmax(Q: float, alpha_T: float, gamma: float, C_EA0: float, C_ED0: float) -> float:
-    if alpha_T <= 0:
-        raise ValueError("alpha_T must be positive")
-    if C_EA0 <= 0:
-        raise ValueError("C_EA0 must be positive")
+def ham_lmax_batch(Q, alpha_T, gamma, C_EA0, C_ED0) -> BatchResult:
+    (Q, alpha_T, gamma, C_EA0, C_ED0), errors = _columns(Q, alpha_T, gamma, C_EA0, C_ED0)
+    errors.flag(alpha_T <= 0, "alpha_T must be positive")
+    errors.flag(C_EA0 <= 0, "C_EA0 must be positive")
 
-    lmax = ((Q * Q) / (4.0 * math.pi * alpha_T)) * (((gamma * C_ED0) / C_EA0) ** 2)
-    return float(lmax)
+    with np.errstate(all="ignore"):
+        lmax = ((Q * Q) / (4.0 * np.pi * alpha_T)) * (((gamma * C_ED0) / C_EA0) ** 2)
+    return errors.result(lmax)
+
+
+@memoize("ham")
+def ham_lmax(Q: float, alpha_T: float, gamma: float, C_EA0: float, C_ED0: float) -> float:
+    result = ham_lmax_batch(Q, alpha_T, gamma, C_EA0, C_ED0)
+    result.raise_for_errors()
+    return float(result.lmax)
 
 
 def compute_ham_multiple(entries: Iterable[Iterable[float]]) -> List[float]:
-    results: List[float] = []
-    for row in entries:
-        Q, alpha_T, gamma, C_EA0, C_ED0 = row
-        results.append(ham_lmax(Q, alpha_T, gamma, C_EA0, C_ED0))
-    return results
+    result = ham_lmax_batch(*_entry_columns(entries, 5))
+    result.raise_for_errors()
+    return result.lmax.tolist()
 
 
 # -------------------------
 # LIEDL 3D
 # -------------------------
 
+# The Liedl 3D plume length is the root of
+#   f(x) = erf(a / sqrt(x)) * exp(-b * x) - target
+# with a = W / sqrt(4 alpha_Th), b = alpha_Tv * (pi / 2M)^2 and
+# target = (pi/4) * (gamma Cthres + C_EA0) / (gamma C_ED0 + C_EA0).
+# f falls monotonically from 1 - target (x -> 0) to -target (x -> inf), so the
+# root is unique and bracketed by [0, min(x_erf, x_exp)], where each bound is the
+# root of one factor on its own.
+
+
+@dataclass(frozen=True)
+class Liedl3DBatchResult(BatchResult):
+    """Batch result with per-row Newton iteration counts and convergence flags."""
+
+    iterations: np.ndarray
+    converged: np.ndarray
+
+
+def _liedl3d_residual(x: np.ndarray, a: np.ndarray, b: np.ndarray, target: np.ndarray):
+    """Return f(x) and its closed-form derivative."""
+    root_x = np.sqrt(x)
+    arg = a / root_x
+    erf_term = erf(arg)
+    exp_term = np.exp(-b * x)
+    f = erf_term * exp_term - target
+    df = -exp_term * (a / (math.sqrt(math.pi) * x * root_x) * np.exp(-arg * arg) + b * erf_term)
+    return f, df
+
+
+def _liedl3d_upper_bound(a: np.ndarray, b: np.ndarray, target: np.ndarray) -> np.ndarray:
+    with np.errstate(all="ignore"):
+        x_erf = (a / erfinv(target)) ** 2
+        x_exp = -np.log(target) / b
+    return np.fmin(x_erf, x_exp)
+
+
+def _solve_liedl3d(
+    a: np.ndarray,
+    b: np.ndarray,
+    target: np.ndarray,
+    x0: np.ndarray,
+    tol: float | np.ndarray = 1e-6,
+    rtol: float = 1e-12,
+    max_iter: int = 100,
+):
+    """
+    Safeguarded Newton iteration on all rows at once.
+
+    Newton steps are taken in log(x) using the analytic derivative, which keeps
+    them well scaled from metre to kilometre plumes; a step that leaves the current
+    bracket (or is not finite) is replaced by a bisection step, geometric once
+    the lower bound is positive. A row stops when the step is below ``tol`` or
+    ``rtol`` relative to x (the latter matters for very long plumes, where an
+    absolute 1e-6 m is beyond double precision).
+    """
+    lo = np.zeros_like(x0)
+    hi = _liedl3d_upper_bound(a, b, target)
+    x = np.clip(x0, 1e-6, hi)
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), x.shape)
+    iterations = np.zeros(x.shape, dtype=np.int32)
+    converged = np.zeros(x.shape, dtype=bool)
+
+    active = np.flatnonzero(np.isfinite(x) & (x > 0))
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        xa, aa, ba, ta = x[active], a[active], b[active], target[active]
+        with np.errstate(all="ignore"):
+            fx, dfx = _liedl3d_residual(xa, aa, ba, ta)
+            lo_a = np.where(fx > 0, xa, lo[active])
+            hi_a = np.where(fx < 0, xa, hi[active])
+            x_next = xa * np.exp(-fx / (xa * dfx))
+            bisect = np.where(lo_a > 0, np.sqrt(lo_a * hi_a), 0.5 * hi_a)
+        finite = np.isfinite(x_next)
+        done = (finite & (np.abs(x_next - xa) < np.maximum(tol[active], rtol * xa))) | (fx == 0)
+        unsafe = ~done & (~finite | (x_next <= lo_a) | (x_next >= hi_a))
+        x_next = np.where(unsafe, bisect, x_next)
+
+        x[active] = np.where(fx == 0, xa, x_next)
+        lo[active], hi[active] = lo_a, hi_a
+        iterations[active] += 1
+        converged[active[done]] = True
+        active = active[~done]
+
+    return x, iterations, converged
+
+
+def _liedl3d_starting_point(M, alpha_Th, alpha_Tv, W, ratio, pi_term) -> np.ndarray:
+    """Approximate roots ma_1 (erf only), ma_2 and ma_3 (exp only), combined as before."""
+    with np.errstate(all="ignore"):
+        ma_1 = -1.0 / (np.pi * (alpha_Th / (W * W)) * np.log(1.0 - pi_term))
+        ma_2 = -2.0 / (np.pi * np.pi * (alpha_Tv / (M * M))) * np.log(pi_term)
+        ma_3 = (4.0 / (np.pi * np.pi)) * ((M * M) / alpha_Tv) * np.log((4.0 / np.pi) / ratio)
+    ma_x0 = np.minimum(np.maximum(ma_1, ma_2), ma_3)
+    x0 = np.where(np.isclose(ma_x0, ma_3, rtol=1e-9, atol=1e-9), ma_x0, np.minimum(ma_1, ma_2))
+    return np.maximum(x0, 1e-6)
+
+
+def liedl3d_lmax_batch(
+    M,
+    alpha_Th,
+    alpha_Tv,
+    W,
+    Cthres,
+    C_EA0,
+    C_ED0,
+    gamma,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+    use_table: bool = False,
+) -> Liedl3DBatchResult:
+    """
+    Solve the Liedl 3D plume length for every row with a vectorized safeguarded Newton.
+
+    With ``use_table`` the iteration starts from the precomputed dimensionless
+    surface in ``liedl3d_table`` and usually needs only a polishing step or two;
+    rows outside the table fall back to the analytic starting guesses.
+    """
+    (M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma), errors = _columns(
+        M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma
+    )
+    errors.flag((M <= 0) | (alpha_Th <= 0) | (alpha_Tv <= 0) | (W <= 0), "M, alpha_Th, alpha_Tv, and W must be positive")
+    errors.flag((C_EA0 <= 0) | (C_ED0 <= 0), "C_EA0 and C_ED0 must be positive")
+    errors.flag(Cthres <= 0, "Cthres must be positive")
+
+    with np.errstate(all="ignore"):
+        ratio = (gamma * Cthres + C_EA0) / (gamma * C_ED0 + C_EA0)
+    errors.flag(~(ratio > 0), "Invalid concentration ratio for Liedl 3D.")
+    pi_term = 0.25 * np.pi * ratio
+    errors.flag(~((pi_term > 0) & (pi_term < 1)), "Liedl 3D inputs must satisfy 0 < (pi/4)*ratio < 1.")
+
+    valid = errors.valid
+    with np.errstate(all="ignore"):
+        a = np.where(valid, W / np.sqrt(4.0 * alpha_Th), np.nan)
+        b = np.where(valid, alpha_Tv * (np.pi / (2.0 * M)) ** 2, np.nan)
+        target = np.where(valid, pi_term, np.nan)
+    x0 = _liedl3d_starting_point(M, alpha_Th, alpha_Tv, W, ratio, pi_term)
+    if use_table:
+        from liedl3d_table import initial_guess
+
+        guess = initial_guess(a, b, target)
+        x0 = np.where(np.isfinite(guess), guess, x0)
+    x, iterations, converged = _solve_liedl3d(
+        np.ravel(a), np.ravel(b), np.ravel(target), np.ravel(np.where(valid, x0, np.nan)),
+        tol=tol, max_iter=max_iter,
+    )
+    shape = valid.shape
+    x, iterations, converged = x.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+    errors.flag(~converged, "Liedl 3D solver did not converge for the provided inputs.")
+    base = errors.result(x)
+    return Liedl3DBatchResult(
+        lmax=base.lmax, valid=base.valid, errors=base.errors,
+        iterations=iterations, converged=converged & base.valid,
+    )
+
+
+@memoize("liedl3d")
 def liedl3d_lmax(
     M: float,
     alpha_Th: float,
@@ -96,71 +325,37 @@ def liedl3d_lmax(
     C_EA0: float,
     C_ED0: float,
     gamma: float,
+    use_table: bool = False,
 ) -> float:
-    if M <= 0 or alpha_Th <= 0 or alpha_Tv <= 0 or W <= 0:
-        raise ValueError("M, alpha_Th, alpha_Tv, and W must be positive")
-    if C_EA0 <= 0 or C_ED0 <= 0:
-        raise ValueError("C_EA0 and C_ED0 must be positive")
-    if Cthres <= 0:
-        raise ValueError("Cthres must be positive")
-
-    ratio = (gamma * Cthres + C_EA0) / (gamma * C_ED0 + C_EA0)
-    if ratio <= 0:
-        raise ValueError("Invalid concentration ratio for Liedl 3D.")
-
-    pi_term = 0.25 * math.pi * ratio
-    if not (0 < pi_term < 1):
-        raise ValueError("Liedl 3D inputs must satisfy 0 < (pi/4)*ratio < 1.")
-
-    def f_lm(x: float) -> float:
-        if x <= 0:
-            raise ValueError("Liedl 3D requires a positive plume length iterate.")
-        return erf(W / math.sqrt(4.0 * alpha_Th * x)) * math.exp(
-            -alpha_Tv * x * (math.pi / (2.0 * M)) ** 2
-        ) - (math.pi / 4.0) * ratio
-
-    def df_lm(x: float) -> float:
-        h = 1e-4
-        return (f_lm(x + h) - f_lm(max(x - h, 1e-8))) / max((x + h) - max(x - h, 1e-8), 1e-8)
-
-    ma_1 = -1.0 / (math.pi * (alpha_Th / (W * W)) * math.log(1.0 - pi_term))
-    ma_2 = -2.0 / (math.pi * math.pi * (alpha_Tv / (M * M))) * math.log(pi_term)
-    ma_3 = (4.0 / (math.pi * math.pi)) * ((M * M) / alpha_Tv) * math.log((4.0 / math.pi) / ratio)
-
-    ma_x0 = min(max(ma_1, ma_2), ma_3)
-    min_x0 = min(ma_1, ma_2)
-    x = ma_x0 if math.isclose(ma_x0, ma_3, rel_tol=1e-9, abs_tol=1e-9) else min_x0
-    x = max(float(x), 1e-6)
-
-    tol = 1e-6
-    for _ in range(100):
-        fx = f_lm(x)
-        dfx = df_lm(x)
-        if abs(dfx) < 1e-12:
-            raise ValueError("Liedl 3D solver encountered a zero derivative.")
-        step = fx / dfx
-        x_next = x - step
-        if x_next <= 0:
-            x_next = x / 2.0
-        if abs(x_next - x) < tol:
-            return float(x_next)
-        x = x_next
-
-    raise ValueError("Liedl 3D solver did not converge for the provided inputs.")
+    result = liedl3d_lmax_batch(M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma, use_table=use_table)
+    result.raise_for_errors()
+    return float(result.lmax)
 
 
 def compute_liedl3d_multiple(entries: Iterable[Iterable[float]]) -> List[float]:
-    results: List[float] = []
-    for row in entries:
-        M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma = row
-        results.append(liedl3d_lmax(M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma))
-    return results
+    result = liedl3d_lmax_batch(*_entry_columns(entries, 8))
+    result.raise_for_errors()
+    return result.lmax.tolist()
 
 
 # -------------------------
 # CIRPKA et al. (2005)
 # -------------------------
 
+def cirpka_lmax_batch(Sw, alpha_Th, gamma, C_A, C_D) -> BatchResult:
+    (Sw, alpha_Th, gamma, C_A, C_D), errors = _columns(Sw, alpha_Th, gamma, C_A, C_D)
+    errors.flag(Sw <= 0, "Sw must be positive")
+    errors.flag(alpha_Th <= 0, "Ath must be positive")
+    errors.flag(C_A <= 0, "Ca must be positive")
+    errors.flag((gamma * C_D + C_A) <= 0, "Ga * Cd + Ca must be positive")
+
+    with np.errstate(all="ignore"):
+        cf = C_A / (gamma * C_D + C_A)
+        lmax = (Sw ** 2) / (16.0 * alpha_Th * erfcinv(cf) ** 2)
+    return errors.result(lmax)
+
+
+@memoize("cirpka")
 def cirpka_2005(Sw: float = 10, Ath: float = 0.1, Ca: float = 8, Cd: float = 5, Ga: float = 3.5) -> float:
     """
     Compute maximum plume length using the Cirpka et al. (2005) horizontal flow model.
@@ -172,18 +367,9 @@ def cirpka_2005(Sw: float = 10, Ath: float = 0.1, Ca: float = 8, Cd: float = 5,
     Cd = source concentration [M/L^3]
     Ga = stoichiometric coefficient of the reactant [-]
     """
-    if Sw <= 0:
-        raise ValueError("Sw must be positive")
-    if Ath <= 0:
-        raise ValueError("Ath must be positive")
-    if Ca <= 0:
-        raise ValueError("Ca must be positive")
-    if (Ga * Cd + Ca) <= 0:
-        raise ValueError("Ga * Cd + Ca must be positive")
-
-    cf = Ca / (Ga * Cd + Ca)
-    Lm = (Sw ** 2) / (16.0 * Ath * erfcinv(cf) ** 2)
-    return float(Lm)
+    result = cirpka_lmax_batch(Sw, Ath, Ga, Ca, Cd)
+    result.raise_for_errors()
+    return float(result.lmax)
 
 
 def cirpka_lmax(Sw: float, alpha_Th: float, gamma: float, C_A: float, C_D: float) -> float:
@@ -198,9 +384,36 @@ def cirpka_domain_length(lmax: float) -> float:
 
 def compute_cirpka_multiple(entries):
     """Batch compute for multiple parameter sets."""
-    results = []
-    for row in entries:
-        Sw, alpha_Th, gamma, C_A, C_D = row
-        lmax = cirpka_lmax(Sw, alpha_Th, gamma, C_A, C_D)
-        results.append({"Lmax": lmax, "LD": cirpka_domain_length(lmax)})
-    return results
+    result = cirpka_lmax_batch(*_entry_columns(entries, 5))
+    result.raise_for_errors()
+    return [{"Lmax": lmax, "LD": cirpka_domain_length(lmax)} for lmax in result.lmax.tolist()]
+
+
+# -------------------------
+# BATCH REGISTRY
+# -------------------------
+
+# model name -> (batch function, column names in call order)
+BATCH_MODELS: dict[str, tuple[Callable[..., BatchResult], tuple[str, ...]]] = {
+    "liedl": (liedl_lmax_batch, ("M", "alpha_Tv", "gamma", "C_EA0", "C_ED0")),
+    "chu": (chu_lmax_batch, ("W", "alpha_Th", "gamma", "C_EA0", "C_ED0", "epsilon")),
+    "ham": (ham_lmax_batch, ("Q", "alpha_T", "gamma", "C_EA0", "C_ED0")),
+    "liedl3d": (
+        liedl3d_lmax_batch,
+        ("M", "alpha_Th", "alpha_Tv", "W", "Cthres", "C_EA0", "C_ED0", "gamma"),
+    ),
+    "cirpka": (cirpka_lmax_batch, ("Sw", "alpha_Th", "gamma", "C_A", "C_D")),
+}
+
+
+def compute_batch(model: str, data: Any) -> BatchResult:
+    """
+    Evaluate ``model`` over a structured array, DataFrame or mapping of columns.
+
+    Column names follow ``BATCH_MODELS``; values may be scalars or arrays and are
+    broadcast against each other.
+    """
+    if model not in BATCH_MODELS:
+        raise ValueError(f"Unknown analytical model '{model}'.")
+    func, names = BATCH_MODELS[model]
+    return func(*(np.asarray(data[name], dtype=float) for name in names))
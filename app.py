@@ -6,6 +6,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from analytical_routes import analytical_bp
 from data_queries import get_db_connection
 from empirical_routes import empirical_bp
+from job_routes import job_bp
 from numerical_routes import numerical_bp
 from plot_routes import plot_bp
 from settings import FLASK_DEBUG, FLASK_HOST, FLASK_PORT, SECRET_KEY
@@ -46,6 +47,7 @@ app.register_blueprint(site_bp)
 app.register_blueprint(analytical_bp)
 app.register_blueprint(empirical_bp)
 app.register_blueprint(numerical_bp)
+app.register_blueprint(job_bp)
 
 
 @app.route("/")
@@ -0,0 +1,140 @@
+"""
+One registry of vectorised Lmax evaluators covering every screening model.
+
+Each entry maps a model name to a ``ModelSpec`` whose batch function takes
+broadcastable column arrays (in ``params`` order) and returns a
+``BatchResult``. Monte Carlo, sensitivity analysis and response surfaces all
+go through ``evaluate`` so they never fall back to per-row Python loops for
+the closed-form models. Models whose evaluation is inherently per-row
+(``iterative=True``) are split into chunks and spread over a process pool.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+from analytical_models import (
+    BatchResult,
+    chu_lmax_batch,
+    cirpka_lmax_batch,
+    ham_lmax_batch,
+    liedl3d_lmax_batch,
+    liedl_lmax_batch,
+)
+from bioscreen_model import bioscreen_lmax_batch
+from empirical_models import birla_lmax_batch, maier_lmax_batch
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    name: str
+    label: str
+    func: Callable[..., BatchResult]
+    params: tuple[str, ...]
+    iterative: bool = False
+
+
+MODELS: dict[str, ModelSpec] = {
+    spec.name: spec
+    for spec in (
+        ModelSpec("liedl", "Liedl et al. (2005)", liedl_lmax_batch, ("M", "alpha_Tv", "gamma", "C_EA0", "C_ED0")),
+        ModelSpec("chu", "Chu et al.", chu_lmax_batch, ("W", "alpha_Th", "gamma", "C_EA0", "C_ED0", "epsilon")),
+        ModelSpec("ham", "Ham et al.", ham_lmax_batch, ("Q", "alpha_T", "gamma", "C_EA0", "C_ED0")),
+        ModelSpec(
+            "liedl3d",
+            "Liedl 3D",
+            liedl3d_lmax_batch,
+            ("M", "alpha_Th", "alpha_Tv", "W", "Cthres", "C_EA0", "C_ED0", "gamma"),
+        ),
+        ModelSpec("cirpka", "Cirpka et al. (2005)", cirpka_lmax_batch, ("Sw", "alpha_Th", "gamma", "C_A", "C_D")),
+        ModelSpec("maier", "Maier & Grathwohl", maier_lmax_batch, ("M", "tv", "g", "Ca", "Cd")),
+        ModelSpec("birla", "Birla et al.", birla_lmax_batch, ("M", "tv", "g", "Ca", "Cd", "R")),
+        ModelSpec(
+            "bioscreen",
+            "BIOSCREEN",
+            bioscreen_lmax_batch,
+            ("Cthres", "time", "H", "c0", "W", "v", "ax", "ay", "az", "Df", "R", "gamma", "lam", "ng"),
+            iterative=True,
+        ),
+    )
+}
+
+
+def get_model(model: str) -> ModelSpec:
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}'. Expected one of: {', '.join(MODELS)}.")
+    return MODELS[model]
+
+
+_PROCESS_POOL: ProcessPoolExecutor | None = None
+_PROCESS_POOL_WORKERS = 0
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by every ``evaluate`` call; rebuilt only when ``workers`` changes."""
+    global _PROCESS_POOL, _PROCESS_POOL_WORKERS
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None or _PROCESS_POOL_WORKERS != workers:
+            if _PROCESS_POOL is not None:
+                # Work already submitted to the old pool still runs to completion.
+                _PROCESS_POOL.shutdown(wait=False)
+            _PROCESS_POOL = ProcessPoolExecutor(max_workers=workers)
+            _PROCESS_POOL_WORKERS = workers
+        return _PROCESS_POOL
+
+
+def _evaluate_chunk(model: str, columns: list[np.ndarray]) -> BatchResult:
+    # Module-level so it can be pickled into worker processes.
+    return MODELS[model].func(*columns)
+
+
+def evaluate(
+    model: str,
+    columns: Mapping[str, Any],
+    workers: int | None = None,
+    chunk_size: int = 256,
+) -> BatchResult:
+    """
+    Evaluate ``model`` for every row of ``columns`` (a mapping, DataFrame or structured array).
+
+    Missing parameters raise ``ValueError``. Iterative models are split into
+    ``chunk_size`` rows and evaluated on ``workers`` processes (default: one per
+    core; ``workers=1`` keeps everything in-process). The process pool is kept
+    between calls, so chunked callers such as Monte Carlo start it only once.
+    """
+    spec = get_model(model)
+    missing = [name for name in spec.params if name not in _names(columns)]
+    if missing:
+        raise ValueError(f"Missing parameters for '{model}': {', '.join(missing)}")
+
+    arrays = np.broadcast_arrays(*(np.asarray(columns[name], dtype=float) for name in spec.params))
+    shape = arrays[0].shape
+    n_rows = int(np.prod(shape, dtype=int))
+    workers = workers or os.cpu_count() or 1
+
+    if not spec.iterative or workers <= 1 or n_rows <= chunk_size:
+        return spec.func(*arrays)
+
+    flat = [np.ascontiguousarray(a).reshape(-1) for a in arrays]
+    bounds = range(0, n_rows, chunk_size)
+    pool = _process_pool(workers)
+    parts = list(pool.map(_evaluate_chunk, [model] * len(bounds), [[c[s:s + chunk_size] for c in flat] for s in bounds]))
+    return BatchResult(
+        lmax=np.concatenate([p.lmax for p in parts]).reshape(shape),
+        valid=np.concatenate([p.valid for p in parts]).reshape(shape),
+        errors=np.concatenate([p.errors for p in parts]).reshape(shape),
+    )
+
+
+def _names(columns: Any) -> set[str]:
+    names = getattr(getattr(columns, "dtype", None), "names", None)
+    if names is not None:
+        return set(names)
+    return set(columns.keys())
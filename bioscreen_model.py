@@ -1,7 +1,343 @@
+import functools
+from dataclasses import dataclass
+
 import numpy as np
 import scipy as sp
 
+from analytical_models import _columns
+from model_cache import memoize
+
+
+@functools.lru_cache(maxsize=None)
+def gauss_legendre(ng):
+    """Process-wide cache of Gauss-Legendre nodes and weights on [-1, 1] (read-only arrays)."""
+    roots, weights = sp.special.roots_legendre(int(ng))
+    roots.setflags(write=False)
+    weights.setflags(write=False)
+    return roots, weights
+
+
+class BioscreenKernel:
+    """
+    BIOSCREEN-AT concentration for one parameter set (legacy bioScreenFormula.py).
+
+    Everything that depends only on the quadrature variable tau -- nodes,
+    tau**4, the decay exponent and the transverse erfc products -- is computed
+    once here, so ``concentration`` reduces to one exp over an (x, ng) outer
+    product and a matrix-vector product with the precomputed weights.
+    """
+
+    def __init__(
+        self,
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+        y=0.0,
+        z=None,
+        chunk_bytes=32 * 1024 * 1024,
+    ):
+        self.time = float(time)
+        self.H = float(sourceThicknessH)
+        self.W = float(sourceWidthW)
+        self.z_1 = 0.0
+        self.y = float(y)
+        self.z = (self.z_1 + self.H) / 2.0 if z is None else float(z)
+        self.ng = int(numberOfGaussPoints)
+
+        v = averageLinearGroundwaterVelocityv
+        R = retardationFactorR
+        Df = effectiveDiffusionCoefficientDf
+        self.vr = v / R
+        self.Dxr = (longitudinalDispersivity_ax * v + Df) / R
+        self.Dyr = (horizontalTransverseDispersivity_ay * v + Df) / R
+        self.Dzr = (verticalTransverseDispersivity_az * v + Df) / R
+
+        self.source_concentration = float(sourceConcentrationc0 * np.exp(-sourceDecayCoefficient_gamma * self.time))
+        self.prefactor = 4.0 * self.source_concentration / (8.0 * np.sqrt(np.pi * self.Dxr))
+
+        roots, weights = gauss_legendre(self.ng)
+        top = np.sqrt(np.sqrt(self.time))
+        tau = (roots * top + top) / 2.0
+        self.tau4 = tau ** 4
+        self.vr_tau4 = self.vr * self.tau4
+        self.inv_4Dxr_tau4 = 1.0 / (4.0 * self.Dxr * self.tau4)
+        self.decay_tau4 = (effectiveFirstOrderDecayCoefficient_lambda_eff - sourceDecayCoefficient_gamma) * self.tau4
+        self.quad_weights = weights * (top / 2.0) / tau ** 3
+        self.line_weights = self.quad_weights * self.y_term(self.y)[0] * self.z_term(self.z)[0]
+        self.chunk_rows = max(1, int(chunk_bytes // (8 * 3 * self.ng)))
+
+    def y_term(self, y):
+        """Horizontal erfc factor, shape (len(y), ng)."""
+        y = np.atleast_1d(np.asarray(y, dtype=float))[:, None]
+        scale = 2.0 * np.sqrt(self.Dyr * self.tau4)
+        return sp.special.erfc((y - self.W / 2) / scale) - sp.special.erfc((y + self.W / 2) / scale)
+
+    def z_term(self, z):
+        """Vertical erfc factor, shape (len(z), ng)."""
+        z = np.atleast_1d(np.asarray(z, dtype=float))[:, None]
+        scale = 2.0 * np.sqrt(self.Dzr * self.tau4)
+        return sp.special.erfc((z - self.H) / scale) - sp.special.erfc((z - self.z_1) / scale)
+
+    def x_term(self, x):
+        """Longitudinal factor including the x prefactor, shape (len(x), ng)."""
+        x = np.asarray(x, dtype=float)[:, None]
+        return self.prefactor * x * np.exp(-(self.decay_tau4 + (x - self.vr_tau4) ** 2 * self.inv_4Dxr_tau4))
+
+    def in_source(self, y, z):
+        return (np.abs(y) <= self.W / 2) & (z <= self.H) & (z >= self.z_1)
+
+    def concentration(self, x):
+        """Concentration at (x, y, z) for an array of x, evaluated in memory-bounded chunks."""
+        x = np.asarray(x, dtype=float)
+        flat = x.reshape(-1)
+        out = np.empty(flat.shape)
+        for start in range(0, flat.size, self.chunk_rows):
+            chunk = flat[start:start + self.chunk_rows]
+            out[start:start + chunk.size] = self.x_term(chunk) @ self.line_weights
+        at_source = flat <= 1e-6
+        if at_source.any():
+            out[at_source] = self.source_concentration if self.in_source(self.y, self.z) else 0.0
+        return out.reshape(x.shape)
+
+    def __call__(self, x):
+        return float(self.concentration(np.array([x]))[0])
+
+
+@memoize("bioscreen_kernel")
+def bioscreen_kernel(
+    time,
+    sourceThicknessH,
+    sourceConcentrationc0,
+    sourceWidthW,
+    averageLinearGroundwaterVelocityv,
+    longitudinalDispersivity_ax,
+    horizontalTransverseDispersivity_ay,
+    verticalTransverseDispersivity_az,
+    effectiveDiffusionCoefficientDf,
+    retardationFactorR,
+    sourceDecayCoefficient_gamma,
+    effectiveFirstOrderDecayCoefficient_lambda_eff,
+    numberOfGaussPoints,
+):
+    """Centreline ``BioscreenKernel``, shared across calls with the same parameters."""
+    return BioscreenKernel(
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+    )
+
+
+# The legacy 1 m march stopped after 100000 steps; the search keeps that ceiling.
+MAX_LENGTH = 100000.0
+
+
+def _find_lmax(kernel, threshold, length_tolerance, max_length=MAX_LENGTH):
+    """Distance where the centreline concentration first drops below ``threshold``."""
+    return float(_find_lmax_many(kernel, [threshold], length_tolerance, max_length)[0])
+
+
+def _sample_curve(C, x_max, tolerance=1e-3, initial_points=17, max_points=2049):
+    """
+    Adaptively sample the vectorised profile C on [0, x_max].
+
+    Intervals are bisected wherever the midpoint deviates from linear
+    interpolation by more than ``tolerance`` times the peak concentration, so
+    steep sections near the source get dense points and the tail stays sparse.
+    """
+    x = np.linspace(0.0, x_max, initial_points)
+    c = C(x)
+    while x.size < max_points:
+        mid = 0.5 * (x[:-1] + x[1:])
+        c_mid = C(mid)
+        scale = max(float(np.max(np.abs(c))), 1e-300)
+        refine = np.abs(c_mid - 0.5 * (c[:-1] + c[1:])) > tolerance * scale
+        refine &= np.diff(x) > 1e-6 * max(x_max, 1.0)
+        if not refine.any():
+            break
+        refine_idx = np.flatnonzero(refine)[: max_points - x.size]
+        x = np.insert(x, refine_idx + 1, mid[refine_idx])
+        c = np.insert(c, refine_idx + 1, c_mid[refine_idx])
+    return x, c
+
+
+def _find_lmax_many(kernel, thresholds, length_tolerance, max_length=MAX_LENGTH):
+    """
+    Distance where the centreline concentration first drops below each threshold.
+
+    An upper bound is doubled from 1 m once, out to the smallest threshold;
+    each threshold takes its bracket from that shared profile and all brackets
+    are then bisected together, one vectorised kernel call per step. Like the
+    legacy 1 m march this assumes C decreases along the centreline.
+    """
+    thresholds = np.asarray(thresholds, dtype=float).ravel()
+    lengths = np.zeros(thresholds.shape)
+    source = kernel(0.0)
+    active = thresholds <= source
+    if not active.any():
+        return lengths
+
+    xs, cs = [0.0], [source]
+    while cs[-1] >= thresholds[active].min() and xs[-1] < max_length:
+        xs.append(min(max(2.0 * xs[-1], 1.0), max_length))
+        cs.append(kernel(xs[-1]))
+    xs, cs = np.array(xs), np.array(cs)
+
+    # First sampled point below each threshold closes that threshold's bracket.
+    below = cs[None, :] < thresholds[:, None]
+    first_below = np.where(below.any(axis=1), below.argmax(axis=1), -1)
+    capped = active & (first_below < 0)
+    searching = active & ~capped
+    hi = np.where(searching, xs[np.maximum(first_below, 0)], 0.0)
+    lo = np.where(searching, xs[np.maximum(first_below - 1, 0)], 0.0)
+    if searching.any():
+        steps = int(np.ceil(np.log2(max(float(np.max((hi - lo)[searching])), length_tolerance) / length_tolerance)))
+        for _ in range(steps):
+            mid = 0.5 * (lo + hi)
+            above = kernel.concentration(mid) >= thresholds
+            lo = np.where(searching & above, mid, lo)
+            hi = np.where(searching & ~above, mid, hi)
+    lengths[searching] = 0.5 * (lo + hi)[searching]
+    lengths[capped] = float(max_length)
+    return lengths
+
+
+@memoize("bioscreen_lmax")
+def bio_lmax(
+    thresholdConcentrationCthres,
+    time,
+    sourceThicknessH,
+    sourceConcentrationc0,
+    sourceWidthW,
+    averageLinearGroundwaterVelocityv,
+    longitudinalDispersivity_ax,
+    horizontalTransverseDispersivity_ay,
+    verticalTransverseDispersivity_az,
+    effectiveDiffusionCoefficientDf,
+    retardationFactorR,
+    sourceDecayCoefficient_gamma,
+    effectiveFirstOrderDecayCoefficient_lambda_eff,
+    numberOfGaussPoints,
+    length_tolerance=0.01,
+):
+    """Plume length where the centreline concentration falls to the threshold, to ``length_tolerance`` metres."""
+    kernel = bioscreen_kernel(
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+    )
+    return _find_lmax(kernel, thresholdConcentrationCthres, length_tolerance)
+
 
+@memoize("bioscreen_lmax_thresholds")
+def bio_lmax_thresholds(
+    thresholds,
+    time,
+    sourceThicknessH,
+    sourceConcentrationc0,
+    sourceWidthW,
+    averageLinearGroundwaterVelocityv,
+    longitudinalDispersivity_ax,
+    horizontalTransverseDispersivity_ay,
+    verticalTransverseDispersivity_az,
+    effectiveDiffusionCoefficientDf,
+    retardationFactorR,
+    sourceDecayCoefficient_gamma,
+    effectiveFirstOrderDecayCoefficient_lambda_eff,
+    numberOfGaussPoints,
+    length_tolerance=0.01,
+):
+    """Plume length for each entry of ``thresholds`` (float array, same order) from one shared search."""
+    thresholds = np.asarray(thresholds, dtype=float).ravel()
+    if thresholds.size == 0:
+        raise ValueError("Provide at least one threshold concentration.")
+    if np.any(~np.isfinite(thresholds)) or np.any(thresholds <= 0):
+        raise ValueError("Threshold concentrations must be positive.")
+    kernel = bioscreen_kernel(
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+    )
+    return _find_lmax_many(kernel, thresholds, length_tolerance)
+
+
+def concentration_curve(
+    time,
+    sourceThicknessH,
+    sourceConcentrationc0,
+    sourceWidthW,
+    averageLinearGroundwaterVelocityv,
+    longitudinalDispersivity_ax,
+    horizontalTransverseDispersivity_ay,
+    verticalTransverseDispersivity_az,
+    effectiveDiffusionCoefficientDf,
+    retardationFactorR,
+    sourceDecayCoefficient_gamma,
+    effectiveFirstOrderDecayCoefficient_lambda_eff,
+    numberOfGaussPoints,
+    x_max,
+    tolerance=1e-3,
+    max_points=2049,
+):
+    """Adaptively sampled centreline concentration profile on [0, ``x_max``]."""
+    kernel = bioscreen_kernel(
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+    )
+    return _sample_curve(kernel.concentration, float(x_max), tolerance=tolerance, max_points=max_points)
+
+
+@memoize("bioscreen")
 def bio_with_curve(
     thresholdConcentrationCthres,
     time,
@@ -17,65 +353,42 @@ def bio_with_curve(
     sourceDecayCoefficient_gamma,
     effectiveFirstOrderDecayCoefficient_lambda_eff,
     numberOfGaussPoints,
+    length_tolerance=0.01,
 ):
-    # Directly aligned with legacy bioScreenFormula.py implementation
-    y = 0.0
-    z_1 = 0.0
-    z = (z_1 + sourceThicknessH) / 2.0
-
-    Dx = longitudinalDispersivity_ax * averageLinearGroundwaterVelocityv + effectiveDiffusionCoefficientDf
-    Dy = horizontalTransverseDispersivity_ay * averageLinearGroundwaterVelocityv + effectiveDiffusionCoefficientDf
-    Dz = verticalTransverseDispersivity_az * averageLinearGroundwaterVelocityv + effectiveDiffusionCoefficientDf
-
-    vr = averageLinearGroundwaterVelocityv / retardationFactorR
-    Dxr = Dx / retardationFactorR
-    Dyr = Dy / retardationFactorR
-    Dzr = Dz / retardationFactorR
-
-    roots, weights = sp.special.roots_legendre(int(numberOfGaussPoints))
-
-    def C(x):
-        if x <= 1e-6:
-            if y <= sourceWidthW / 2 and y >= -sourceWidthW / 2 and z <= sourceThicknessH and z >= z_1:
-                return float(sourceConcentrationc0 * np.exp(-sourceDecayCoefficient_gamma * time))
-            return 0.0
-
-        a = sourceConcentrationc0 * np.exp(-sourceDecayCoefficient_gamma * time) * x / (8.0 * np.sqrt(np.pi * Dxr))
-        bot = 0.0
-        top = np.sqrt(np.sqrt(time))
-        tau = (roots * (top - bot) + top + bot) / 2.0
-        tau4 = tau ** 4
-
-        x_term = np.exp(
-            -(
-                ((effectiveFirstOrderDecayCoefficient_lambda_eff - sourceDecayCoefficient_gamma) * tau4)
-                + ((x - vr * tau4) ** 2) / (4.0 * Dxr * tau4)
-            )
-        ) / (tau ** 3)
-        y_term = sp.special.erfc((y - sourceWidthW / 2) / (2.0 * np.sqrt(Dyr * tau4))) - sp.special.erfc(
-            (y + sourceWidthW / 2) / (2.0 * np.sqrt(Dyr * tau4))
-        )
-        z_term = sp.special.erfc((z - sourceThicknessH) / (2.0 * np.sqrt(Dzr * tau4))) - sp.special.erfc(
-            (z - z_1) / (2.0 * np.sqrt(Dzr * tau4))
-        )
-        term = x_term * y_term * z_term
-        integrand = term * (weights * (top - bot) / 2.0)
-        return float(a * 4.0 * np.sum(integrand))
-
-    x_array = np.array([0.0])
-    c_array = np.array([C(0.0)])
-    x = 0.0
-
-    # Same stopping rule as legacy implementation, with high cap safety
-    max_steps = 100000
-    steps = 0
-    while C(x) >= thresholdConcentrationCthres and steps < max_steps:
-        x += 1.0
-        x_array = np.append(x_array, x)
-        c_array = np.append(c_array, C(x))
-        steps += 1
-
-    lmax = float(x)
+    """Return (lmax, x_array, c_array); the curve spans [0, lmax] (at least 1 m)."""
+    lmax = bio_lmax(
+        thresholdConcentrationCthres,
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+        length_tolerance=length_tolerance,
+    )
+    x_array, c_array = concentration_curve(
+        time,
+        sourceThicknessH,
+        sourceConcentrationc0,
+        sourceWidthW,
+        averageLinearGroundwaterVelocityv,
+        longitudinalDispersivity_ax,
+        horizontalTransverseDispersivity_ay,
+        verticalTransverseDispersivity_az,
+        effectiveDiffusionCoefficientDf,
+        retardationFactorR,
+        sourceDecayCoefficient_gamma,
+        effectiveFirstOrderDecayCoefficient_lambda_eff,
+        numberOfGaussPoints,
+        x_max=max(lmax, 1.0),
+    )
     return lmax, x_array, c_array
 
 
@@ -95,7 +408,7 @@ def bio(
     effectiveFirstOrderDecayCoefficient_lambda_eff,
     numberOfGaussPoints,
 ):
-    lmax, _, _ = bio_with_curve(
+    lmax = bio_lmax(
         thresholdConcentrationCthres,
         time,
         sourceThicknessH,
@@ -111,4 +424,177 @@ def bio(
         effectiveFirstOrderDecayCoefficient_lambda_eff,
         numberOfGaussPoints,
     )
-    return f"{lmax:.2f}"
+    return f"{lmax:.2f}"
+
+
+def bioscreen_lmax_batch(Cthres, time, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng):
+    """
+    Evaluate the BIOSCREEN plume length for every row of broadcast column arrays.
+
+    The root search is inherently per-row, so this loops over rows (bypassing the
+    memoization cache, which would only fill up with one-off samples). Rows that
+    raise are reported through the returned ``BatchResult`` instead of aborting.
+    """
+    columns, errors = _columns(Cthres, time, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng)
+    Cthres, time, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng = columns
+    errors.flag((v <= 0) | (R <= 0) | (H <= 0) | (W <= 0), "v, R, H and W must be positive")
+    errors.flag((time <= 0) | (Cthres <= 0), "time and Cthres must be positive")
+    errors.flag(ng < 1, "numberOfGaussPoints must be >= 1")
+
+    lmax = np.full(errors.valid.shape, np.nan)
+    flat_lmax = lmax.reshape(-1)
+    flat_columns = [c.reshape(-1) for c in columns]
+    for i in np.flatnonzero(errors.valid.reshape(-1)):
+        row = [c[i] for c in flat_columns]
+        row[-1] = int(row[-1])
+        try:
+            flat_lmax[i] = bio_lmax.uncached(*row)
+        except (ValueError, ArithmeticError) as exc:
+            row_mask = np.zeros(lmax.size, dtype=bool)
+            row_mask[i] = True
+            errors.flag(row_mask.reshape(lmax.shape), str(exc))
+    return errors.result(lmax)
+
+
+class BioscreenTimeSweep:
+    """
+    Centreline BIOSCREEN-AT concentration at many times at once.
+
+    With tau = t**0.25 * (1 + r) / 2 the Gauss-Legendre nodes r, and so the
+    factor ((1 + r) / 2)**4, are shared by every time; only a per-time scale
+    changes. All tau-only terms are held as (T, ng) arrays and
+    ``concentration`` evaluates one distance per time in a single pass.
+    """
+
+    def __init__(self, times, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng):
+        self.times = np.asarray(times, dtype=float).ravel()
+        t = self.times[:, None]
+        vr = v / R
+        Dxr = (ax * v + Df) / R
+        Dyr = (ay * v + Df) / R
+        Dzr = (az * v + Df) / R
+        z = H / 2.0
+
+        roots, weights = gauss_legendre(int(ng))
+        unit = (roots + 1.0) / 2.0
+        top = np.sqrt(np.sqrt(t))
+        tau4 = t * unit ** 4
+        self.source_concentration = c0 * np.exp(-gamma * self.times)
+        self.vr_tau4 = vr * tau4
+        self.inv_4Dxr_tau4 = 1.0 / (4.0 * Dxr * tau4)
+        self.decay_tau4 = (lam - gamma) * tau4
+        y_scale = 2.0 * np.sqrt(Dyr * tau4)
+        z_scale = 2.0 * np.sqrt(Dzr * tau4)
+        y_term = sp.special.erfc(-W / 2 / y_scale) - sp.special.erfc(W / 2 / y_scale)
+        z_term = sp.special.erfc((z - H) / z_scale) - sp.special.erfc(z / z_scale)
+        prefactor = 4.0 * self.source_concentration[:, None] / (8.0 * np.sqrt(np.pi * Dxr))
+        self.line_weights = prefactor * weights / (2.0 * top ** 2 * unit ** 3) * y_term * z_term
+
+    def concentration(self, x):
+        """Concentration at distance ``x[i]`` for time ``times[i]`` (``x`` has one entry per time)."""
+        x = np.asarray(x, dtype=float)[:, None]
+        terms = x * np.exp(-(self.decay_tau4 + (x - self.vr_tau4) ** 2 * self.inv_4Dxr_tau4))
+        c = np.einsum("tn,tn->t", terms, self.line_weights)
+        return np.where(x[:, 0] <= 1e-6, self.source_concentration, c)
+
+    def lmax(self, threshold, length_tolerance=0.01, max_length=MAX_LENGTH):
+        """
+        Plume length for every time, found by vectorised doubling then bisection.
+
+        Mirrors ``_find_lmax`` row-wise: all times share each bracketing and
+        bisection step, so the cost is a few dozen (T, ng) evaluations.
+        """
+        lo = np.zeros_like(self.times)
+        hi = np.ones_like(self.times)
+        active = self.source_concentration >= threshold
+        capped = np.zeros_like(active)
+        growing = active.copy()
+        while growing.any():
+            growing &= self.concentration(hi) >= threshold
+            capped |= growing & (hi >= max_length)
+            growing &= ~capped
+            lo = np.where(growing, hi, lo)
+            hi = np.where(growing, np.minimum(2.0 * hi, max_length), hi)
+
+        searching = active & ~capped
+        if searching.any():
+            steps = int(np.ceil(np.log2(max(float(np.max((hi - lo)[searching])), length_tolerance) / length_tolerance)))
+            for _ in range(steps):
+                mid = 0.5 * (lo + hi)
+                above = self.concentration(mid) >= threshold
+                lo = np.where(searching & above, mid, lo)
+                hi = np.where(searching & ~above, mid, hi)
+
+        lengths = np.where(searching, 0.5 * (lo + hi), 0.0)
+        return np.where(capped, float(max_length), lengths)
+
+
+@memoize("bioscreen_sweep")
+def bio_time_sweep(Cthres, times, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng, length_tolerance=0.01):
+    """Plume length (float array, one per entry of ``times``) from one batched computation."""
+    times = np.asarray(times, dtype=float).ravel()
+    if times.size == 0:
+        raise ValueError("Provide at least one time value.")
+    if np.any(~np.isfinite(times)) or np.any(times <= 0):
+        raise ValueError("Times must be positive.")
+    if v <= 0 or R <= 0 or H <= 0 or W <= 0:
+        raise ValueError("v, R, H and W must be positive")
+    if Cthres <= 0:
+        raise ValueError("Cthres must be positive")
+    sweep = BioscreenTimeSweep(times, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng)
+    return sweep.lmax(Cthres, length_tolerance)
+
+
+# Quadrature orders tried by the adaptive mode (the Panel ng options).
+NG_ORDERS = (4, 5, 6, 10, 15, 20, 60, 104, 256)
+
+
+@dataclass(frozen=True)
+class BioscreenResult:
+    lmax: float | np.ndarray
+    ng: int
+    error_estimate: float
+    converged: bool
+
+
+def select_ng(evaluate, rtol=1e-3, orders=NG_ORDERS):
+    """
+    Walk ``orders`` until two successive quadrature orders agree to ``rtol``.
+
+    ``evaluate(ng)`` returns a plume length (or array of lengths). The error
+    estimate is the largest relative change between the last two orders,
+    measured against max(Lmax, 1 m) so vanishing plumes do not blow it up.
+    Nodes come from the process-wide ``gauss_legendre`` cache.
+    """
+    if rtol <= 0:
+        raise ValueError("rtol must be positive")
+    previous = None
+    error = float("inf")
+    for ng in orders:
+        current = np.asarray(evaluate(ng), dtype=float)
+        if previous is not None:
+            error = float(np.max(np.abs(current - previous) / np.maximum(np.abs(current), 1.0)))
+            if error <= rtol:
+                return BioscreenResult(_unwrap(current), int(ng), error, True)
+        previous = current
+    return BioscreenResult(_unwrap(previous), int(orders[-1]), error, False)
+
+
+def _unwrap(value):
+    return float(value) if value.ndim == 0 else value
+
+
+def bio_adaptive(Cthres, time, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, rtol=1e-3, length_tolerance=0.01):
+    """Plume length with the smallest Gauss order in ``NG_ORDERS`` that meets ``rtol``."""
+    return select_ng(
+        lambda ng: bio_lmax(Cthres, time, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng, length_tolerance),
+        rtol,
+    )
+
+
+def bio_time_sweep_adaptive(Cthres, times, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, rtol=1e-3, length_tolerance=0.01):
+    """``bio_time_sweep`` with one Gauss order chosen so every time meets ``rtol``."""
+    return select_ng(
+        lambda ng: bio_time_sweep(Cthres, times, H, c0, W, v, ax, ay, az, Df, R, gamma, lam, ng, length_tolerance),
+        rtol,
+    )
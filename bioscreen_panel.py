@@ -1,11 +1,14 @@
 import io
 
+import numpy as np
 import pandas as pd
 import panel as pn
 
-from bioscreen_model import bio
-from panel_analytical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str, summary_card
+from bioscreen_field import default_grid, evaluate_field, plume_metrics
+from bioscreen_model import NG_ORDERS, BioscreenResult, bio_adaptive, bio_lmax_thresholds, bio_time_sweep, bio_time_sweep_adaptive, bioscreen_kernel
+from panel_analytical_common import comparison_plot, error_card, info_card, query_float, query_int, query_str, summary_card
 from pdf_report import CASTReport
+from plot_functions import plot_concentration_slice, plot_plume_evolution
 
 pn.extension("tabulator", sizing_mode="stretch_width")
 
@@ -24,18 +27,56 @@ def _base_widgets():
     r = pn.widgets.FloatInput(name="Retardation factor R (-)", value=query_float("R", 1.0), start=0.01)
     gamma = pn.widgets.FloatInput(name="Source decay gamma (1/yr)", value=query_float("gamma", 0.0), start=0.0, end=1.0)
     lam = pn.widgets.FloatSlider(name="Effective first-order decay lam (1/yr)", value=query_float("lam", 0.1), start=0.0, end=1.0, step=0.01)
-    ng_default = query_int("ng", 60)
-    if ng_default not in [4, 5, 6, 10, 15, 20, 60, 104, 256]:
+    ng_options = ["auto", *NG_ORDERS]
+    ng_default = query_str("ng", "60")
+    ng_default = "auto" if ng_default == "auto" else query_int("ng", 60)
+    if ng_default not in ng_options:
         ng_default = 60
-    ng = pn.widgets.Select(name="Number of Gauss points", value=ng_default, options=[4, 5, 6, 10, 15, 20, 60, 104, 256])
-    return cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng
+    ng = pn.widgets.Select(name="Number of Gauss points", value=ng_default, options=ng_options)
+    ng_tol = pn.widgets.FloatInput(name="Quadrature tolerance (relative, auto mode)", value=query_float("ng_tol", 1e-3), start=1e-8, end=0.1, step=1e-4)
+    ng.param.watch(lambda event: setattr(ng_tol, "visible", event.new == "auto"), "value")
+    ng_tol.visible = ng_default == "auto"
+    return cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, ng_tol
+
+
+def _quadrature_outputs(result: BioscreenResult) -> list[dict]:
+    status = "" if result.converged else " (tolerance not met)"
+    return [
+        {"label": "Gauss Points (auto)", "value": f"{result.ng}{status}", "unit": ""},
+        {"label": "Quadrature Error Estimate", "value": f"{result.error_estimate:.2e}", "unit": "rel."},
+    ]
+
+
+def _parse_times(text: str) -> list[float]:
+    """Comma-separated years; a ``start:stop:step`` entry expands to an inclusive range."""
+    times = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" in part:
+            pieces = [float(p) for p in part.split(":")]
+            if len(pieces) not in (2, 3):
+                raise ValueError(f"Invalid time range '{part}', use start:stop or start:stop:step.")
+            start, stop, step = pieces if len(pieces) == 3 else (*pieces, 1.0)
+            if step <= 0 or stop < start:
+                raise ValueError(f"Invalid time range '{part}'.")
+            count = int(np.floor((stop - start) / step + 1e-9)) + 1
+            times.update((start + step * np.arange(count)).round(9).tolist())
+        else:
+            times.add(float(part))
+    return sorted(times)
 
 
 def bioscreen_single_app():
-    cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng = _base_widgets()
+    cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, ng_tol = _base_widgets()
     run_btn = pn.widgets.Button(name="Run BIOSCREEN simulation", button_type="primary", sizing_mode="stretch_width")
     result_pane = pn.pane.HTML(info_card("Run the BIOSCREEN model to compute plume length."), sizing_mode="stretch_width")
     plot_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=420)
+    extra_thresholds = pn.widgets.TextInput(name="Additional thresholds (mg/L, comma-separated)", value=query_str("thresholds", ""), placeholder="e.g. MCL, detection limit, 10\u00d7MCL")
+    porosity = pn.widgets.FloatInput(name="Effective porosity n (-)", value=query_float("porosity", 0.3), start=0.01, end=0.6, step=0.01)
+    plan_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=380)
+    section_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=380)
     email = query_str("email", "demo@example.com")
     selected_site_id = query_int("site_id", 0)
 
@@ -55,8 +96,35 @@ def bioscreen_single_app():
 
     def _run(_=None):
         try:
-            lmax = float(bio(cthres.value, time.value, h.value, c0.value, w.value, v.value, ax.value, ay.value, az.value, df.value, r.value, gamma.value, lam.value, int(ng.value)))
-            result_pane.object = metric_card("Plume length", f"{lmax:.2f}")
+            inputs = (time.value, h.value, c0.value, w.value, v.value, ax.value, ay.value, az.value, df.value, r.value, gamma.value, lam.value)
+            quadrature = None
+            if ng.value == "auto":
+                quadrature = bio_adaptive(cthres.value, *inputs, rtol=ng_tol.value)
+                ng_used = quadrature.ng
+            else:
+                ng_used = int(ng.value)
+            kernel = bioscreen_kernel(*inputs, ng_used)
+            thresholds = sorted({float(part) for part in extra_thresholds.value.split(",") if part.strip()} - {float(cthres.value)})
+            # Cthres and the extra thresholds share one search; the first entry is the primary Lmax.
+            lmax, *threshold_lengths = bio_lmax_thresholds([cthres.value, *thresholds], *inputs, ng_used).tolist()
+            field = evaluate_field(kernel, *default_grid(kernel, 1.2 * max(lmax, 1.0)))
+            metrics = plume_metrics(field, cthres.value, porosity.value)
+            result_pane.object = summary_card([
+                ("Plume length", f"{lmax:.2f} m"),
+                ("Plume volume (C \u2265 Cthres)", f"{metrics['plume_volume_m3']:,.0f} m\u00b3"),
+                ("Dissolved mass", f"{metrics['dissolved_mass_kg']:,.2f} kg"),
+                *((f"Plume length at {c:g} mg/L", f"{length:.2f} m") for c, length in zip(thresholds, threshold_lengths)),
+                *([("Gauss points (auto)", f"{quadrature.ng} (error {quadrature.error_estimate:.1e})")] if quadrature else []),
+            ])
+            plan_pane.object = plot_concentration_slice(
+                field.plan_view(kernel.z), field.x, field.y,
+                f"Plan view at z = {kernel.z:.2f} m", "x [m]", "y [m]", cthres.value,
+            )
+            x_section = min(lmax / 2.0, float(field.x[-1]))
+            section_pane.object = plot_concentration_slice(
+                field.cross_section(x_section), field.y, field.z,
+                f"Cross-section at x = {x_section:.1f} m", "y [m]", "z [m]", cthres.value,
+            )
             user_x = [selected_site_id if selected_site_id > 0 else 1]
             plot_pane.object = comparison_plot(
                 "BioScreen",
@@ -80,13 +148,26 @@ def bioscreen_single_app():
                     {"symbol": "az", "name": "Vert. Trans. Dispersivity", "value": az.value, "unit": "m"},
                     {"symbol": "\u03bb", "name": "First-order Decay", "value": lam.value, "unit": "1/yr"},
                 ],
-                "outputs": [{"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax:.2f}", "unit": "m"}],
-                "plot_data": {"labels": ["Lmax"], "values": [lmax], "ylabel": "Plume Length (m)", "title": "Maximum Plume Length — BIOSCREEN-AT"},
+                "outputs": [
+                    {"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax:.2f}", "unit": "m"},
+                    *({"label": f"L\u2098\u2090\u2093 at Cthres = {c:g} mg/L", "value": f"{length:.2f}", "unit": "m"} for c, length in zip(thresholds, threshold_lengths)),
+                    {"label": "Plume Volume (C \u2265 Cthres)", "value": f"{metrics['plume_volume_m3']:.0f}", "unit": "m\u00b3"},
+                    {"label": f"Dissolved Mass (n = {porosity.value:g})", "value": f"{metrics['dissolved_mass_kg']:.2f}", "unit": "kg"},
+                    *(_quadrature_outputs(quadrature) if quadrature else []),
+                ],
+                "plot_data": {
+                    "labels": [f"{cthres.value:g} mg/L", *(f"{c:g} mg/L" for c in thresholds)],
+                    "values": [lmax, *threshold_lengths],
+                    "ylabel": "Plume Length (m)",
+                    "title": "Maximum Plume Length — BIOSCREEN-AT",
+                },
             })
             export_btn.visible = True
         except Exception as exc:
             result_pane.object = error_card(str(exc))
             plot_pane.object = None
+            plan_pane.object = None
+            section_pane.object = None
             export_btn.visible = False
 
     run_btn.on_click(_run)
@@ -94,22 +175,23 @@ def bioscreen_single_app():
     controls = pn.Column(
         "## BIOSCREEN-AT (Single)",
         "### Manual inputs",
-        cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng,
+        cthres, extra_thresholds, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, ng_tol, porosity,
         sizing_mode="stretch_width",
         styles={"flex": "1 1 320px", "min-width": "280px"},
     )
-    outputs = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
+    outputs = pn.Column(plot_pane, plan_pane, section_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
     return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
 
 
 def bioscreen_multiple_app():
-    cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng = _base_widgets()
-    w_times = pn.widgets.TextInput(name="Times for sweep (comma-separated years)", value=f"{max(1, time.value // 2)},{time.value},{time.value * 2}")
+    cthres, time, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, ng_tol = _base_widgets()
+    w_times = pn.widgets.TextInput(name="Times for sweep (years, comma-separated or start:stop:step)", value=f"{max(1, time.value // 2)},{time.value},{time.value * 2}")
     run_btn = pn.widgets.Button(name="Run BIOSCREEN scenarios", button_type="primary", sizing_mode="stretch_width")
     result_pane = pn.pane.HTML(info_card("Run the BIOSCREEN sweep to compare plume lengths over time."), sizing_mode="stretch_width")
     table = pn.widgets.Tabulator(pd.DataFrame(columns=["time_years", "lmax_m"]), height=240, sizing_mode="stretch_width")
     plot_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=420)
+    evolution_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=380)
     email = query_str("email", "demo@example.com")
     selected_site_id = query_int("site_id", 0)
 
@@ -129,21 +211,23 @@ def bioscreen_multiple_app():
 
     def _run(_=None):
         try:
-            times = sorted({float(part.strip()) for part in w_times.value.split(",") if part.strip()})
-            if not times:
-                raise ValueError("Provide at least one time value.")
-
-            rows = []
-            for t in times:
-                lmax = float(bio(cthres.value, t, h.value, c0.value, w.value, v.value, ax.value, ay.value, az.value, df.value, r.value, gamma.value, lam.value, int(ng.value)))
-                rows.append({"time_years": t, "lmax_m": lmax})
+            times = _parse_times(w_times.value)
+            inputs = (h.value, c0.value, w.value, v.value, ax.value, ay.value, az.value, df.value, r.value, gamma.value, lam.value)
+            quadrature = None
+            if ng.value == "auto":
+                quadrature = bio_time_sweep_adaptive(cthres.value, times, *inputs, rtol=ng_tol.value)
+                lengths = quadrature.lmax
+            else:
+                lengths = bio_time_sweep(cthres.value, times, *inputs, int(ng.value))
+            rows = [{"time_years": t, "lmax_m": lmax} for t, lmax in zip(times, lengths.tolist())]
 
-            df_out = pd.DataFrame(rows).sort_values("time_years")
+            df_out = pd.DataFrame(rows)
             table.value = df_out
             l_vals = df_out["lmax_m"].tolist()
             result_pane.object = summary_card([
                 ("Successful runs", str(len(l_vals))),
                 ("Max plume length", f"{max(l_vals):.2f} m"),
+                *([("Gauss points (auto)", f"{quadrature.ng} (error {quadrature.error_estimate:.1e})")] if quadrature else []),
             ])
             plot_pane.object = comparison_plot(
                 "BioScreen",
@@ -154,12 +238,14 @@ def bioscreen_multiple_app():
                 email,
                 "Scenario Number",
             )
+            evolution_pane.object = plot_plume_evolution(df_out["time_years"], l_vals, "Plume Length Over Time \u2014 BIOSCREEN-AT")
             _state.update({
                 "parameters": [{"symbol": f"t={r['time_years']:.0f}yr", "name": f"Time {r['time_years']:.0f} yr", "value": f"L={r['lmax_m']:.2f}", "unit": "m"} for r in rows],
                 "outputs": [
                     {"label": "Scenarios run", "value": str(len(l_vals)), "unit": ""},
                     {"label": "Max plume length", "value": f"{max(l_vals):.2f}", "unit": "m"},
                     {"label": "Min plume length", "value": f"{min(l_vals):.2f}", "unit": "m"},
+                    *(_quadrature_outputs(quadrature) if quadrature else []),
                 ],
                 "plot_data": {"labels": [f"t={r['time_years']:.0f}yr" for r in rows], "values": [r["lmax_m"] for r in rows], "ylabel": "Plume Length (m)", "title": "Plume Length Over Time — BIOSCREEN-AT"},
             })
@@ -168,6 +254,7 @@ def bioscreen_multiple_app():
             table.value = pd.DataFrame([{"error": str(exc)}])
             result_pane.object = error_card(str(exc))
             plot_pane.object = None
+            evolution_pane.object = None
             export_btn.visible = False
 
     run_btn.on_click(_run)
@@ -175,10 +262,10 @@ def bioscreen_multiple_app():
     controls = pn.Column(
         "## BIOSCREEN-AT (Multiple)",
         "### Manual scenario inputs",
-        w_times, cthres, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, table,
+        w_times, cthres, h, c0, w, v, ax, ay, az, df, r, gamma, lam, ng, ng_tol, table,
         sizing_mode="stretch_width",
         styles={"flex": "1 1 380px", "min-width": "300px"},
     )
-    outputs = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
+    outputs = pn.Column(evolution_pane, plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
     return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
@@ -0,0 +1,231 @@
+"""
+Inverse calibration of transverse dispersivities against observed plume lengths.
+
+For every site at once this solves for the parameter that makes a model
+reproduce the observed ``plume_length``:
+
+- Liedl: alpha_Tv, Chu / Cirpka: alpha_Th, Maier / Birla: tv. Lmax is inversely
+  proportional to each of these, so param = Lmax(param=1) / L_obs exactly.
+- Liedl 3D: alpha_Th or alpha_Tv. The implicit equation
+  erf(a / sqrt(L)) * exp(-b L) = target can be rearranged for either a or b
+  once L is known, so no root-finding is needed here either.
+
+Site data comes from ``data_queries.get_user_sites`` rows; parameters the
+``sites`` table does not hold are passed in as fixed values.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import erf, erfinv
+
+from analytical_models import BatchResult, _RowErrors, _columns
+from batch_models import evaluate, get_model
+from monte_carlo import Distribution
+
+
+# -------------------------
+# SITE DATA
+# -------------------------
+
+# get_user_sites row index for each numeric sites column
+_SITE_INDEX = {
+    "site_id": 0,
+    "aquifer_thickness": 3,
+    "plume_length": 4,
+    "plume_width": 5,
+    "electron_donor": 7,
+    "electron_acceptor_o2": 8,
+}
+
+# model parameter -> sites column it is read from
+SITE_PARAMETERS = {
+    "M": "aquifer_thickness",
+    "C_ED0": "electron_donor",
+    "C_D": "electron_donor",
+    "Cd": "electron_donor",
+    "C_EA0": "electron_acceptor_o2",
+    "C_A": "electron_acceptor_o2",
+    "Ca": "electron_acceptor_o2",
+    "W": "plume_width",
+    "Sw": "plume_width",
+}
+
+CALIBRATION_PARAMETERS = {
+    "liedl": ("alpha_Tv",),
+    "chu": ("alpha_Th",),
+    "cirpka": ("alpha_Th",),
+    "maier": ("tv",),
+    "birla": ("tv",),
+    "liedl3d": ("alpha_Tv", "alpha_Th"),
+}
+
+
+def site_columns(rows: Sequence[Sequence]) -> dict[str, np.ndarray]:
+    """Numeric ``sites`` columns as float arrays (missing or non-numeric values become NaN)."""
+    if not rows:
+        return {name: np.array([], dtype=float) for name in _SITE_INDEX}
+    frame = pd.DataFrame([[row[i] for i in _SITE_INDEX.values()] for row in rows], columns=list(_SITE_INDEX))
+    return {name: pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float) for name in _SITE_INDEX}
+
+
+# -------------------------
+# INVERSION
+# -------------------------
+
+def _invert_proportional(model: str, parameter: str, observed, columns: Mapping) -> BatchResult:
+    reference = evaluate(model, {**columns, parameter: 1.0})
+    observed, lmax_ref = np.broadcast_arrays(np.asarray(observed, dtype=float), reference.lmax)
+    errors = _RowErrors(observed.shape)
+    rejected = ~np.broadcast_to(reference.valid, observed.shape)
+    errors.errors[rejected] = np.broadcast_to(reference.errors, observed.shape)[rejected]
+    errors.valid &= ~rejected
+    errors.flag(~np.isfinite(observed), "Observed plume length must be a finite number")
+    errors.flag(observed <= 0, "Observed plume length must be positive")
+    errors.flag(lmax_ref <= 0, "Model cannot produce a positive plume length for these inputs")
+    with np.errstate(all="ignore"):
+        return errors.result(lmax_ref / observed)
+
+
+def _invert_liedl3d(parameter: str, observed, columns: Mapping) -> BatchResult:
+    names = ("M", "alpha_Th", "alpha_Tv", "W", "Cthres", "C_EA0", "C_ED0", "gamma")
+    values = [columns.get(name, 1.0) for name in names]
+    (L, M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma), errors = _columns(observed, *values)
+    errors.flag(L <= 0, "Observed plume length must be positive")
+    errors.flag((M <= 0) | (W <= 0), "M and W must be positive")
+    errors.flag((C_EA0 <= 0) | (C_ED0 <= 0) | (Cthres <= 0), "C_EA0, C_ED0 and Cthres must be positive")
+
+    with np.errstate(all="ignore"):
+        target = 0.25 * np.pi * (gamma * Cthres + C_EA0) / (gamma * C_ED0 + C_EA0)
+        errors.flag(~((target > 0) & (target < 1)), "Liedl 3D inputs must satisfy 0 < (pi/4)*ratio < 1.")
+        if parameter == "alpha_Th":
+            errors.flag(alpha_Tv <= 0, "alpha_Tv must be positive")
+            b = alpha_Tv * (np.pi / (2.0 * M)) ** 2
+            s = target * np.exp(b * L)
+            errors.flag(~(s < 1), "Observed length exceeds the vertical-mixing limit for this alpha_Tv")
+            a = np.sqrt(L) * erfinv(s)
+            value = W * W / (4.0 * a * a)
+        else:
+            errors.flag(alpha_Th <= 0, "alpha_Th must be positive")
+            e = erf(W / np.sqrt(4.0 * alpha_Th * L))
+            errors.flag(~(e > target), "Observed length exceeds the horizontal-mixing limit for this alpha_Th")
+            b = np.log(e / target) / L
+            value = b * (2.0 * M / np.pi) ** 2
+    return errors.result(value)
+
+
+def invert(model: str, observed, columns: Mapping, parameter: str | None = None) -> BatchResult:
+    """Per-row value of ``parameter`` that makes ``model`` return ``observed``."""
+    if model not in CALIBRATION_PARAMETERS:
+        raise ValueError(f"Calibration is not available for '{model}'.")
+    parameter = parameter or CALIBRATION_PARAMETERS[model][0]
+    if parameter not in CALIBRATION_PARAMETERS[model]:
+        raise ValueError(f"'{model}' can be calibrated for: {', '.join(CALIBRATION_PARAMETERS[model])}")
+    spec = get_model(model)
+    missing = [p for p in spec.params if p != parameter and p not in columns]
+    if missing:
+        raise ValueError(f"Missing parameters for '{model}': {', '.join(missing)}")
+    if model == "liedl3d":
+        return _invert_liedl3d(parameter, observed, columns)
+    return _invert_proportional(model, parameter, observed, columns)
+
+
+# -------------------------
+# CALIBRATION RESULT
+# -------------------------
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    model: str
+    parameter: str
+    values: np.ndarray
+    valid: np.ndarray
+    errors: np.ndarray
+    observed: np.ndarray
+    representative: float
+    predicted: np.ndarray
+    stats: dict
+
+    @property
+    def distribution(self) -> Distribution:
+        """Lognormal fit of the calibrated values (usable directly in Monte Carlo runs)."""
+        return Distribution.fit(self.values[self.valid], family="lognormal")
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame([self.stats])
+
+
+def _fit_stats(values: np.ndarray, observed: np.ndarray, predicted: np.ndarray) -> dict:
+    logs = np.log(values)
+    both = np.isfinite(predicted) & (predicted > 0) & (observed > 0)
+    residual = predicted[both] - observed[both]
+    ss_tot = np.sum((observed[both] - observed[both].mean()) ** 2) if both.any() else np.nan
+    return {
+        "n_sites": int(values.size),
+        "geometric_mean": float(np.exp(logs.mean())),
+        "median": float(np.median(values)),
+        "p10": float(np.percentile(values, 10)),
+        "p90": float(np.percentile(values, 90)),
+        "log_std": float(logs.std()),
+        "rmse": float(np.sqrt(np.mean(residual ** 2))) if both.any() else np.nan,
+        "bias": float(np.mean(residual)) if both.any() else np.nan,
+        "r2": float(1.0 - np.sum(residual ** 2) / ss_tot) if both.any() and ss_tot > 0 else np.nan,
+        "log_rmse": float(np.sqrt(np.mean(np.log(predicted[both] / observed[both]) ** 2))) if both.any() else np.nan,
+    }
+
+
+def calibrate(model: str, observed, columns: Mapping, parameter: str | None = None) -> CalibrationResult:
+    """
+    Calibrate ``parameter`` for every row and summarise the result.
+
+    Fit statistics describe how well a single representative value (the
+    geometric mean of the per-site values) reproduces the observed lengths.
+    """
+    parameter = parameter or CALIBRATION_PARAMETERS.get(model, (None,))[0]
+    inverse = invert(model, observed, columns, parameter)
+    values = inverse.lmax
+    valid = inverse.valid & np.isfinite(values) & (values > 0)
+    observed = np.broadcast_to(np.asarray(observed, dtype=float), valid.shape)
+    if not valid.any():
+        raise ValueError("No site could be calibrated with the given inputs")
+
+    representative = float(np.exp(np.mean(np.log(values[valid]))))
+    predicted = evaluate(model, {**columns, parameter: representative}).lmax
+    predicted = np.broadcast_to(predicted, valid.shape)
+    return CalibrationResult(
+        model=model,
+        parameter=parameter,
+        values=values,
+        valid=valid,
+        errors=inverse.errors,
+        observed=observed,
+        representative=representative,
+        predicted=predicted,
+        stats=_fit_stats(values[valid], observed[valid], predicted[valid]),
+    )
+
+
+def calibrate_sites(
+    model: str,
+    rows: Sequence[Sequence],
+    fixed: Mapping[str, float],
+    parameter: str | None = None,
+) -> CalibrationResult:
+    """
+    Calibrate against a user's ``sites`` rows.
+
+    Parameters listed in ``SITE_PARAMETERS`` are read per site unless given in
+    ``fixed``; everything else the model needs (gamma, Cthres, ...) must be in
+    ``fixed``.
+    """
+    sites = site_columns(rows)
+    spec = get_model(model)
+    columns = dict(fixed)
+    for name in spec.params:
+        if name not in columns and name in SITE_PARAMETERS:
+            columns[name] = sites[SITE_PARAMETERS[name]]
+    return calibrate(model, sites["plume_length"], columns, parameter)
@@ -0,0 +1,170 @@
+"""
+Recalibration of the empirical-model coefficients against a user's site data.
+
+Coefficients are fitted by nonlinear least squares on log(Lmax) residuals
+(``scipy.optimize.least_squares``), evaluating every site at once through the
+vectorised ``*_lmax_batch`` functions. Standard errors come from the Jacobian
+at the optimum and 95 % confidence intervals from the t distribution. Fits are
+cached per user, model, inputs and data version (a hash of the site arrays), so
+reopening the app does not refit unchanged data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+from scipy.stats import t as student_t
+
+from calibration import SITE_PARAMETERS, site_columns
+from empirical_models import BIRLA_COEFFICIENTS, MAIER_COEFFICIENTS, birla_lmax_batch, maier_lmax_batch
+from model_cache import ModelCache
+from settings import MODEL_CACHE_TTL
+
+
+# model -> (batch function, input names, default coefficients)
+EMPIRICAL_MODELS: dict[str, tuple[Callable, tuple[str, ...], dict[str, float]]] = {
+    "maier": (maier_lmax_batch, ("M", "tv", "g", "Ca", "Cd"), MAIER_COEFFICIENTS),
+    "birla": (birla_lmax_batch, ("M", "tv", "g", "Ca", "Cd", "R"), BIRLA_COEFFICIENTS),
+}
+
+FIT_CACHE = ModelCache(max_entries=256, ttl_seconds=MODEL_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class CoefficientFit:
+    model: str
+    coefficients: dict[str, float]
+    stderr: dict[str, float]
+    ci_low: dict[str, float]
+    ci_high: dict[str, float]
+    fitted: tuple[str, ...]
+    n_sites: int
+    rmse_log: float
+    r2_log: float
+    converged: bool
+    data_version: str
+
+    def as_table(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "coefficient": list(self.coefficients),
+            "value": list(self.coefficients.values()),
+            "fitted": [name in self.fitted for name in self.coefficients],
+            "stderr": [self.stderr.get(name, np.nan) for name in self.coefficients],
+            "ci95_low": [self.ci_low.get(name, np.nan) for name in self.coefficients],
+            "ci95_high": [self.ci_high.get(name, np.nan) for name in self.coefficients],
+        })
+
+
+def data_version(observed: np.ndarray, columns: Mapping[str, np.ndarray]) -> str:
+    digest = hashlib.sha256(np.ascontiguousarray(observed, dtype=float).tobytes())
+    for name in sorted(columns):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(columns[name], dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _default_fit(model: str, columns: Mapping[str, np.ndarray]) -> tuple[str, ...]:
+    names = tuple(EMPIRICAL_MODELS[model][2])
+    # With a single recharge rate the R exponent cannot be told apart from "a".
+    if model == "birla" and np.ptp(np.asarray(columns["R"], dtype=float)) == 0:
+        names = tuple(n for n in names if n != "r_exp")
+    return names
+
+
+def fit_coefficients(
+    model: str,
+    observed,
+    columns: Mapping,
+    fit: Sequence[str] | None = None,
+) -> CoefficientFit:
+    """
+    Fit ``model`` coefficients so the model reproduces ``observed`` plume lengths.
+
+    ``columns`` holds every model input (site arrays or scalars). ``fit`` names
+    the coefficients to fit; the rest keep their published values.
+    """
+    if model not in EMPIRICAL_MODELS:
+        raise ValueError(f"Coefficient fitting is available for: {', '.join(EMPIRICAL_MODELS)}")
+    func, names, defaults = EMPIRICAL_MODELS[model]
+    missing = [n for n in names if n not in columns]
+    if missing:
+        raise ValueError(f"Missing inputs for '{model}': {', '.join(missing)}")
+
+    arrays = np.broadcast_arrays(np.asarray(observed, dtype=float), *(np.asarray(columns[n], dtype=float) for n in names))
+    observed, inputs = arrays[0].ravel(), [a.ravel() for a in arrays[1:]]
+    usable = np.isfinite(observed) & (observed > 0) & func(*inputs).valid
+    observed, inputs = observed[usable], [a[usable] for a in inputs]
+
+    fit = tuple(fit) if fit is not None else _default_fit(model, dict(zip(names, inputs)))
+    unknown = [n for n in fit if n not in defaults]
+    if unknown:
+        raise ValueError(f"Unknown coefficient(s) for '{model}': {', '.join(unknown)}")
+    if observed.size <= len(fit):
+        raise ValueError(f"Need more than {len(fit)} usable sites to fit {', '.join(fit)}")
+
+    log_obs = np.log(observed)
+
+    def residuals(theta):
+        coefficients = {**defaults, **dict(zip(fit, theta))}
+        lmax = func(*inputs, coefficients=coefficients).lmax
+        with np.errstate(all="ignore"):
+            return np.log(np.maximum(np.nan_to_num(lmax, nan=1e-300), 1e-300)) - log_obs
+
+    x0 = np.array([defaults[n] for n in fit], dtype=float)
+    solution = least_squares(residuals, x0, method="lm" if observed.size >= 2 * len(fit) else "trf")
+
+    n, p = observed.size, len(fit)
+    dof = max(n - p, 1)
+    sse = float(np.sum(solution.fun ** 2))
+    jtj = solution.jac.T @ solution.jac
+    stderr = np.full(p, np.nan)
+    if np.linalg.matrix_rank(jtj) == p:
+        stderr = np.sqrt(np.diag(np.linalg.inv(jtj)) * sse / dof)
+    half_width = student_t.ppf(0.975, dof) * stderr
+
+    coefficients = {**defaults, **dict(zip(fit, solution.x.tolist()))}
+    ss_tot = float(np.sum((log_obs - log_obs.mean()) ** 2))
+    return CoefficientFit(
+        model=model,
+        coefficients=coefficients,
+        stderr=dict(zip(fit, stderr.tolist())),
+        ci_low=dict(zip(fit, (solution.x - half_width).tolist())),
+        ci_high=dict(zip(fit, (solution.x + half_width).tolist())),
+        fitted=fit,
+        n_sites=int(n),
+        rmse_log=float(np.sqrt(sse / n)),
+        r2_log=1.0 - sse / ss_tot if ss_tot > 0 else float("nan"),
+        converged=bool(solution.success),
+        data_version=data_version(observed, dict(zip(names, inputs))),
+    )
+
+
+def fit_user_sites(
+    model: str,
+    email: str,
+    rows: Sequence[Sequence],
+    fixed: Mapping[str, float],
+    fit: Sequence[str] | None = None,
+) -> CoefficientFit:
+    """
+    Fit against ``data_queries.get_user_sites`` rows, cached per user and data version.
+
+    M, Ca and Cd are read per site; tv, g (and R for Birla) come from ``fixed``
+    unless the caller overrides a site column there too.
+    """
+    if model not in EMPIRICAL_MODELS:
+        raise ValueError(f"Coefficient fitting is available for: {', '.join(EMPIRICAL_MODELS)}")
+    sites = site_columns(rows)
+    columns = dict(fixed)
+    for name in EMPIRICAL_MODELS[model][1]:
+        if name not in columns and name in SITE_PARAMETERS:
+            columns[name] = sites[SITE_PARAMETERS[name]]
+
+    version = data_version(sites["plume_length"], {k: np.asarray(v, dtype=float) for k, v in columns.items()})
+    key = ("empirical_fit", email, model, version, tuple(fit) if fit is not None else None)
+    return FIT_CACHE.get_or_compute(key, lambda: fit_coefficients(model, sites["plume_length"], columns, fit))
@@ -1,26 +1,59 @@
 # empirical_models.py
-import math
+import numpy as np
 
-def maier_lmax(M, tv, g, Ca, Cd):
+from analytical_models import BatchResult, _columns
+from model_cache import memoize
+
+
+# Published coefficients; empirical_fit can recalibrate them against site data.
+MAIER_COEFFICIENTS = {"scale": 0.5, "exponent": 0.3}
+BIRLA_COEFFICIENTS = {"a": 0.047, "m_exp": 0.404, "r_exp": 1.883}
+
+
+def maier_lmax_batch(M, tv, g, Ca, Cd, coefficients=None) -> BatchResult:
     """
-    Maier & Grathwohl plume length (Lmax)
-    lMax = 0.5 * (M^2 / tv) * ((g*Cd/Ca)^0.3)
+    Maier & Grathwohl plume length (Lmax), one per row
+    lMax = scale * (M^2 / tv) * ((g*Cd/Ca)^exponent)
+    Invalid rows are NaN with their message in ``errors``.
     """
-    if tv <= 0 or Ca <= 0:
-        raise ValueError("tv and Ca must be > 0")
-    lmax = 0.5 * ((M * M) / tv) * (((g * Cd) / Ca) ** 0.3)
-    return float(lmax)
+    c = {**MAIER_COEFFICIENTS, **(coefficients or {})}
+    (M, tv, g, Ca, Cd), errors = _columns(M, tv, g, Ca, Cd)
+    errors.flag((tv <= 0) | (Ca <= 0), "tv and Ca must be > 0")
+    with np.errstate(all="ignore"):
+        lmax = c["scale"] * ((M * M) / tv) * (((g * Cd) / Ca) ** c["exponent"])
+    errors.flag(~np.isfinite(lmax), "g*Cd/Ca must be >= 0")
+    return errors.result(lmax)
 
-def birla_lmax(M, tv, g, Ca, Cd, R):
+
+def birla_lmax_batch(M, tv, g, Ca, Cd, R, coefficients=None) -> BatchResult:
     """
-    Birla et al. plume length (Lmax)
-    lMax = (1 - 0.047*M^0.404*R^1.883) * ((4*M^2)/(pi^2*tv)) * ln((((g*Cd)+Ca)/Ca) * (4/pi))
+    Birla et al. plume length (Lmax), one per row
+    lMax = (1 - a*M^m_exp*R^r_exp) * ((4*M^2)/(pi^2*tv)) * ln((((g*Cd)+Ca)/Ca) * (4/pi))
+    Invalid rows are NaN with their message in ``errors``.
     """
-    if tv <= 0 or Ca <= 0:
-        raise ValueError("tv and Ca must be > 0")
-    factor = (1 - (0.047 * (M ** 0.404) * (R ** 1.883)))
-    inside_log = (((g * Cd) + Ca) / Ca) * (4 / math.pi)
-    if inside_log <= 0:
-        raise ValueError("Log argument must be > 0")
-    lmax = factor * ((4 * M * M) / (math.pi * math.pi * tv)) * math.log(inside_log)
-    return float(lmax)
+    c = {**BIRLA_COEFFICIENTS, **(coefficients or {})}
+    (M, tv, g, Ca, Cd, R), errors = _columns(M, tv, g, Ca, Cd, R)
+    errors.flag((tv <= 0) | (Ca <= 0), "tv and Ca must be > 0")
+    with np.errstate(all="ignore"):
+        inside_log = (((g * Cd) + Ca) / Ca) * (4 / np.pi)
+        errors.flag(~(inside_log > 0), "Log argument must be > 0")
+        factor = 1 - (c["a"] * (M ** c["m_exp"]) * (R ** c["r_exp"]))
+        lmax = factor * ((4 * M * M) / (np.pi * np.pi * tv)) * np.log(inside_log)
+    errors.flag(~np.isfinite(lmax), "M and R must be >= 0")
+    return errors.result(lmax)
+
+
+@memoize("maier")
+def maier_lmax(M, tv, g, Ca, Cd):
+    """Maier & Grathwohl plume length (Lmax) for one set of inputs."""
+    result = maier_lmax_batch(M, tv, g, Ca, Cd)
+    result.raise_for_errors()
+    return float(result.lmax)
+
+
+@memoize("birla")
+def birla_lmax(M, tv, g, Ca, Cd, R):
+    """Birla et al. plume length (Lmax) for one set of inputs."""
+    result = birla_lmax_batch(M, tv, g, Ca, Cd, R)
+    result.raise_for_errors()
+    return float(result.lmax)
@@ -0,0 +1,86 @@
+# job_routes.py
+import json
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+
+from numerical_jobs import NUMERICAL_JOBS, PHASES
+from settings import NUMERICAL_EVENT_STREAM_SECONDS
+
+job_bp = Blueprint("job_bp", __name__, url_prefix="/api/numerical/jobs")
+
+
+def _not_found(job_id):
+    return jsonify({"error": f"Unknown job {job_id}."}), 404
+
+
+@job_bp.route("", methods=["POST"])
+def submit_job():
+    scenario = request.get_json(silent=True)
+    if not isinstance(scenario, dict):
+        return jsonify({"error": "Send the scenario as a JSON object."}), 400
+    try:
+        job_id = NUMERICAL_JOBS.submit(scenario)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({
+        "job_id": job_id,
+        "status_url": url_for("job_bp.job_status", job_id=job_id),
+        "events_url": url_for("job_bp.job_events", job_id=job_id),
+        "result_url": url_for("job_bp.job_result", job_id=job_id),
+        "phases": list(PHASES),
+    }), 202
+
+
+@job_bp.route("/<job_id>", methods=["GET"])
+def job_status(job_id):
+    try:
+        status = NUMERICAL_JOBS.status(job_id)
+    except ValueError:
+        status = None
+    if status is None:
+        return _not_found(job_id)
+    return jsonify(status)
+
+
+@job_bp.route("/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    try:
+        status = NUMERICAL_JOBS.status(job_id)
+    except ValueError:
+        status = None
+    if status is None:
+        return _not_found(job_id)
+    if status["state"] != "done":
+        return jsonify({"state": status["state"], "error": status.get("error")}), 409
+    grids = NUMERICAL_JOBS.grids(job_id) or {}
+    return jsonify({**status["result"], **{name: values.tolist() for name, values in grids.items()}})
+
+
+@job_bp.route("/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """
+    Server-sent status events for one job.
+
+    Each stream is closed after ``NUMERICAL_EVENT_STREAM_SECONDS`` so it does
+    not pin a sync worker for the whole run; the ``retry`` hint makes
+    EventSource reconnect. Clients that cannot stream should poll ``status_url``.
+    """
+    try:
+        if NUMERICAL_JOBS.status(job_id) is None:
+            return _not_found(job_id)
+    except ValueError:
+        return _not_found(job_id)
+
+    def stream():
+        yield "retry: 1000\n\n"
+        for status in NUMERICAL_JOBS.events(job_id, timeout=NUMERICAL_EVENT_STREAM_SECONDS):
+            if status is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {status['state']}\ndata: {json.dumps(status)}\n\n"
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,175 @@
+"""
+Precomputed dimensionless lookup surface for the Liedl 3D plume length.
+
+With a = W / sqrt(4 alpha_Th), b = alpha_Tv * (pi / 2M)^2 and u = x / a^2, the
+Liedl 3D equation becomes
+
+    erf(1 / sqrt(u)) * exp(-k * u) = target,   k = a^2 * b
+
+so the dimensionless length u depends on only two groups: k, which is
+(pi^2 / 16) * (W^2 / alpha_Th) / (M^2 / alpha_Tv), and target = (pi/4) * ratio.
+The table stores log(u) on a regular (log10 k, log(-log target)) grid. It is
+built once, saved as a .npy file, memory-mapped on first use and interpolated
+bilinearly to give the Newton solver in analytical_models a near-exact start.
+
+Run ``python liedl3d_table.py`` to rebuild the table and print the benchmark.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from analytical_models import _liedl3d_residual, _solve_liedl3d, liedl3d_lmax_batch
+from settings import CACHE_DIR
+
+TABLE_VERSION = 1
+LOG10_K_RANGE = (-8.0, 8.0)
+# t = log(-log(target)) spans target from 1 - 1e-8 down to 1e-10
+T_RANGE = (float(np.log(-np.log1p(-1e-8))), float(np.log(-np.log(1e-10))))
+DEFAULT_SHAPE = (321, 321)
+
+_table: np.ndarray | None = None
+_lock = threading.Lock()
+
+
+def table_path(shape: tuple[int, int] = DEFAULT_SHAPE) -> Path:
+    return CACHE_DIR / f"liedl3d_table_v{TABLE_VERSION}_{shape[0]}x{shape[1]}.npy"
+
+
+def _axes(shape: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    return np.linspace(*LOG10_K_RANGE, shape[0]), np.linspace(*T_RANGE, shape[1])
+
+
+def build_table(shape: tuple[int, int] = DEFAULT_SHAPE, path: Path | None = None) -> Path:
+    """Solve every grid node with the batch solver and write the table atomically."""
+    log10_k, t = _axes(shape)
+    k = 10.0 ** log10_k[:, None]
+    target = np.exp(-np.exp(t))[None, :]
+    k, target = np.broadcast_arrays(k, target)
+
+    # a = 1 makes x equal to u; start from the erf/exp-only roots like the solver does
+    a = np.ones(k.size)
+    b = k.ravel().copy()
+    target = target.ravel().copy()
+    u, _iterations, converged = _solve_liedl3d(a, b, target, np.full(k.size, np.inf), tol=0.0)
+    if not converged.all():
+        raise RuntimeError("Liedl 3D lookup table did not converge at every grid node.")
+
+    path = Path(path) if path is not None else table_path(shape)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npy.tmp")
+    with os.fdopen(fd, "wb") as handle:
+        np.save(handle, np.log(u).reshape(shape))
+    os.chmod(tmp_name, 0o644)
+    os.replace(tmp_name, path)
+    return path
+
+
+def load_table(shape: tuple[int, int] = DEFAULT_SHAPE) -> np.ndarray:
+    """Return the memory-mapped table, building it on first use."""
+    global _table
+    if _table is not None and _table.shape == shape:
+        return _table
+    with _lock:
+        if _table is None or _table.shape != shape:
+            path = table_path(shape)
+            if not path.exists():
+                build_table(shape, path)
+            _table = np.load(path, mmap_mode="r")
+    return _table
+
+
+def table_loaded() -> bool:
+    """True once ``load_table`` has mapped the table in this process."""
+    return _table is not None
+
+
+def initial_guess(a, b, target) -> np.ndarray:
+    """Interpolated plume length for each row; NaN where the groups fall outside the table."""
+    table = load_table()
+    n_k, n_t = table.shape
+    a, b, target = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, target)))
+    with np.errstate(all="ignore"):
+        log10_k = np.log10(a * a * b)
+        t = np.log(-np.log(target))
+
+    fk = (log10_k - LOG10_K_RANGE[0]) / (LOG10_K_RANGE[1] - LOG10_K_RANGE[0]) * (n_k - 1)
+    ft = (t - T_RANGE[0]) / (T_RANGE[1] - T_RANGE[0]) * (n_t - 1)
+    inside = (fk >= 0) & (fk <= n_k - 1) & (ft >= 0) & (ft <= n_t - 1)
+
+    i = np.clip(np.floor(np.where(inside, fk, 0)).astype(np.intp), 0, n_k - 2)
+    j = np.clip(np.floor(np.where(inside, ft, 0)).astype(np.intp), 0, n_t - 2)
+    wk = np.where(inside, fk, 0) - i
+    wt = np.where(inside, ft, 0) - j
+    log_u = (
+        table[i, j] * (1 - wk) * (1 - wt)
+        + table[i + 1, j] * wk * (1 - wt)
+        + table[i, j + 1] * (1 - wk) * wt
+        + table[i + 1, j + 1] * wk * wt
+    )
+    return np.where(inside, np.exp(log_u) * a * a, np.nan)
+
+
+def benchmark(n_samples: int = 200_000, shape: tuple[int, int] = DEFAULT_SHAPE, seed: int = 0) -> dict:
+    """Build the table, then measure interpolation error and solver cost with and without it."""
+    started = time.perf_counter()
+    path = build_table(shape)
+    build_seconds = time.perf_counter() - started
+
+    global _table
+    _table = None
+    load_table(shape)
+
+    rng = np.random.default_rng(seed)
+    cols = [
+        rng.uniform(1, 20, n_samples),          # M
+        10 ** rng.uniform(-3, 0, n_samples),    # alpha_Th
+        10 ** rng.uniform(-4, -1, n_samples),   # alpha_Tv
+        rng.uniform(0.5, 50, n_samples),        # W
+        10 ** rng.uniform(-3, 0, n_samples),    # Cthres
+        rng.uniform(1, 10, n_samples),          # C_EA0
+        rng.uniform(1, 20, n_samples),          # C_ED0
+        rng.uniform(0.5, 4, n_samples),         # gamma
+    ]
+    started = time.perf_counter()
+    exact = liedl3d_lmax_batch(*cols)
+    solve_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    polished = liedl3d_lmax_batch(*cols, use_table=True)
+    table_seconds = time.perf_counter() - started
+
+    M, alpha_Th, alpha_Tv, W, Cthres, C_EA0, C_ED0, gamma = cols
+    a = W / np.sqrt(4.0 * alpha_Th)
+    b = alpha_Tv * (np.pi / (2.0 * M)) ** 2
+    target = 0.25 * np.pi * (gamma * Cthres + C_EA0) / (gamma * C_ED0 + C_EA0)
+    guess = initial_guess(a, b, target)
+    rel_error = np.abs(guess - exact.lmax) / exact.lmax
+    residual, _ = _liedl3d_residual(polished.lmax, a, b, target)
+
+    return {
+        "table_path": str(path),
+        "resolution": shape,
+        "table_bytes": path.stat().st_size,
+        "build_seconds": build_seconds,
+        "samples": n_samples,
+        "inside_table": float(np.mean(np.isfinite(guess))),
+        "max_interpolation_rel_error": float(np.nanmax(rel_error)),
+        "median_interpolation_rel_error": float(np.nanmedian(rel_error)),
+        "solve_seconds": solve_seconds,
+        "solve_seconds_with_table": table_seconds,
+        "mean_iterations": float(np.mean(exact.iterations)),
+        "mean_iterations_with_table": float(np.mean(polished.iterations)),
+        "max_iterations_with_table": int(np.max(polished.iterations)),
+        "max_abs_residual_with_table": float(np.nanmax(np.abs(residual))),
+    }
+
+
+if __name__ == "__main__":
+    for key, value in benchmark().items():
+        print(f"{key:>32}: {value}")
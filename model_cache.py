@@ -0,0 +1,134 @@
+"""
+Process-wide memoization for model evaluations.
+
+Every Panel session runs in the same server process, so a module-level cache is
+shared by all of them (panel_server also publishes it as
+``pn.state.cache["model_cache"]``). Arguments are normalised and rounded to a
+fixed number of significant digits before they become keys, so 20, 20.0 and
+np.float64(20.0000000000001) hit the same entry. Entries are evicted in LRU
+order once the cache is full and expire after a time-to-live.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from settings import MODEL_CACHE_MAX_ENTRIES, MODEL_CACHE_TTL
+
+
+def _normalize(value: Any, digits: int) -> Hashable:
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        if not np.isfinite(value):
+            return repr(value)
+        return float(f"{value:.{digits}g}")
+    if isinstance(value, np.ndarray):
+        return tuple(_normalize(v, digits) for v in value.ravel().tolist()) + (value.shape,)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v, digits) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize(v, digits)) for k, v in value.items()))
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """Mark cached arrays read-only so one caller cannot corrupt another's result."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class ModelCache:
+    """Bounded LRU cache with per-entry time-to-live and hit/miss/eviction counters."""
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 3600.0, digits: int = 12):
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = float(ttl_seconds)
+        self.digits = int(digits)
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> Hashable:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (name,) + tuple((k, _normalize(v, self.digits)) for k, v in bound.arguments.items())
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Compute outside the lock; concurrent misses on the same key simply both compute.
+        value = _freeze(compute())
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+MODEL_CACHE = ModelCache(max_entries=MODEL_CACHE_MAX_ENTRIES, ttl_seconds=MODEL_CACHE_TTL)
+
+
+def memoize(name: str, cache: ModelCache | None = None):
+    """Decorator that routes a model function through ``cache`` (default ``MODEL_CACHE``)."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or MODEL_CACHE
+            key = target.make_key(name, signature, args, kwargs)
+            return target.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
@@ -0,0 +1,204 @@
+"""
+Content-addressed on-disk cache for numerical model results.
+
+Entries are keyed by the sha256 of the model kind, every input and the
+identity (path, size, mtime) of the solver binaries, so a rebuilt solver
+never serves stale results. Each entry is one compressed ``.npz``. Float
+grids are stored as float32, axes stay float64, and scalar metadata sits in
+a JSON string. Writes go to a temporary file and are renamed into place, so
+readers never see a partial entry. Eviction is LRU by total bytes: reads
+bump the entry's mtime. Eviction and the shared hit/miss counters run under
+an ``fcntl`` file lock, so the Panel server, job workers and Flask can share
+one cache directory. Besides model results the cache holds MODFLOW flow
+solutions (see ``put_files``), which transport-only reruns reuse.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Mapping
+
+import numpy as np
+
+from settings import NUMERICAL_CACHE_DIR, NUMERICAL_CACHE_MAX_BYTES
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+# Bump when the model setup changes so old entries stop matching.
+CACHE_VERSION = 3
+
+
+def solver_identity(executables: Mapping[str, str]) -> dict[str, list]:
+    """Path, size and mtime of each solver binary."""
+    identity = {}
+    for name, path in sorted(executables.items()):
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        identity[name] = [str(resolved), stat.st_size, stat.st_mtime_ns]
+    return identity
+
+
+class NumericalCache:
+    def __init__(self, root: Path | str = NUMERICAL_CACHE_DIR, max_bytes: int = NUMERICAL_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self._thread_lock = threading.Lock()
+
+    def key(self, kind: str, inputs: Mapping, solvers: Mapping | None = None) -> str:
+        payload = {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "inputs": {name: _canonical(value) for name, value in sorted(inputs.items())},
+            "solvers": solvers or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npz"
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Serialise index-wide work across threads and, where fcntl exists, processes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._thread_lock, open(self.root / ".lock", "a+") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def get(self, key: str) -> tuple[dict[str, np.ndarray], dict] | None:
+        """(arrays, metadata) for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files if name != "__meta__"}
+                meta = json.loads(str(data["__meta__"]))
+            os.utime(path)
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return arrays, meta
+
+    def put(self, key: str, arrays: Mapping[str, np.ndarray], meta: Mapping) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stored = {}
+        for name, values in arrays.items():
+            values = np.asarray(values)
+            # Grids shrink to float32; 1-D axes keep full precision.
+            if values.dtype.kind == "f" and values.ndim > 1:
+                values = values.astype(np.float32)
+            stored[name] = values
+        tmp = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez_compressed(tmp, __meta__=np.array(json.dumps(dict(meta))), **stored)
+        os.replace(tmp, path)
+        self.evict()
+
+    def get_files(self, key: str) -> dict[str, bytes] | None:
+        """Files stored with ``put_files`` (name -> contents), or None on a miss."""
+        cached = self.get(key)
+        if cached is None:
+            return None
+        arrays, meta = cached
+        return {name: arrays[f"file{i}"].tobytes() for i, name in enumerate(meta["files"])}
+
+    def put_files(self, key: str, files: Mapping[str, bytes]) -> None:
+        """Store small solver files (e.g. a flow-transport link file) as one entry."""
+        names = sorted(files)
+        arrays = {f"file{i}": np.frombuffer(files[name], dtype=np.uint8) for i, name in enumerate(names)}
+        self.put(key, arrays, {"files": names})
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``; returns bytes freed."""
+        freed = 0
+        with self._locked():
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                freed += size
+            if freed:
+                self._update_stats(evicted_bytes=freed)
+        return freed
+
+    def _stats_path(self) -> Path:
+        return self.root / "stats.json"
+
+    def _read_stats(self) -> dict:
+        try:
+            return json.loads(self._stats_path().read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"hits": 0, "misses": 0, "evicted_bytes": 0}
+
+    def _update_stats(self, **increments) -> None:
+        stats = self._read_stats()
+        for name, amount in increments.items():
+            stats[name] = stats.get(name, 0) + amount
+        tmp = self._stats_path().with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(stats))
+        os.replace(tmp, self._stats_path())
+
+    def _count(self, name: str) -> None:
+        with self._locked():
+            self._update_stats(**{name: 1})
+
+    def stats(self) -> dict:
+        """Entry count, bytes on disk and shared hit/miss counters."""
+        with self._locked():
+            stats = self._read_stats()
+            entries = self._entries()
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._locked():
+            for _, _, path in self._entries():
+                path.unlink(missing_ok=True)
+            self._stats_path().unlink(missing_ok=True)
+
+
+def _canonical(value):
+    """JSON-stable form of an input: numbers as exact float hex, so 1 and 1.0 share a key."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value).hex()
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+NUMERICAL_CACHE = NumericalCache()
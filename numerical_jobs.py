@@ -0,0 +1,411 @@
+"""
+Asynchronous numerical scenario jobs.
+
+A scenario has the fields of a ``panel_numerical_multiple`` table row.
+``submit`` validates it and returns a job id at once; the MODFLOW/MT3DMS runs
+then go through the shared solver pool on a coordinator thread. Job status
+(state, current phase, phase history, result summary) is written atomically
+to a JSON file per job, so the Flask API and the Panel server can both read
+it whatever process ran the job. Concentration grids are stored next to it as
+``<job_id>.npz``. In-process callers can also wait on the job's Future.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Mapping
+
+import numpy as np
+
+from analytical_models import cirpka_lmax, cirpka_domain_length, liedl_lmax
+from numerical_models import ENGINES, run_numerical_model, run_numerical_model_horizontal
+from settings import NUMERICAL_JOB_DIR, NUMERICAL_JOB_RETENTION, NUMERICAL_SCENARIO_WORKERS
+
+
+SCENARIO_DEFAULTS: dict[str, float] = {
+    "S_T": 1.0,
+    "R_Ta": 2.0,
+    "R_Tb": 2.0,
+    "delta_x": 1.0,
+    "delta_z": 0.25,
+    "prsity": 0.3,
+    "al": 5.0,
+    "av": 0.5,
+    "gamma": 3.5,
+    "Cd": 5.0,
+    "Ca": 8.0,
+    "h1": 10.0,
+    "h2": 9.0,
+    "hk": 1.0,
+    "Sw": 5.0,
+    "R_Wu": 7.5,
+    "R_Wb": 7.5,
+    "alpha_th": 0.1,
+}
+
+# Optional (x, z) / (x, y) observation wells per model, and MT3DMS snapshots for their curves.
+OBSERVATION_FIELDS = ("observation_wells_v", "observation_wells_h")
+DEFAULT_OUTPUT_TIMES = 50
+
+PHASES = ("queued", "writing_input", "modflow", "flow_cached", "mt3dms", "parsing", "solving", "cached", "done")
+TERMINAL_STATES = ("done", "failed")
+
+
+def prepare_scenario(row: Mapping) -> dict:
+    """
+    Validate a scenario and derive both model domains.
+
+    Missing fields take ``SCENARIO_DEFAULTS``. ``observation_wells_v`` and
+    ``observation_wells_h`` optionally list [x, z] / [x, y] well positions.
+    ``engine`` is "modflow" (default) or "sparse" for a quick preview.
+    Raises ValueError for invalid input before any solver work is queued.
+    """
+    values = {}
+    for name, default in SCENARIO_DEFAULTS.items():
+        raw = row.get(name, default)
+        try:
+            values[name] = float(default if raw is None or raw == "" else raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a number.") from None
+        if not np.isfinite(values[name]):
+            raise ValueError(f"{name} must be finite.")
+
+    if values["S_T"] <= 0:
+        raise ValueError("Source thickness ST must be > 0.")
+    if values["R_Ta"] < 0 or values["R_Tb"] < 0:
+        raise ValueError("Source buffers R_Ta and R_Tb cannot be negative.")
+    if values["delta_x"] <= 0 or values["delta_z"] <= 0:
+        raise ValueError("Grid spacing must be > 0.")
+    if values["h1"] <= values["h2"]:
+        raise ValueError("Head h1 must be greater than head h2.")
+    if values["Sw"] <= 0:
+        raise ValueError("Source width Sw must be > 0.")
+    if values["R_Wu"] < 0 or values["R_Wb"] < 0:
+        raise ValueError("Horizontal reactant buffers R_Wu and R_Wb cannot be negative.")
+    if values["alpha_th"] <= 0:
+        raise ValueError("Horizontal dispersivity alpha_th must be > 0.")
+
+    # Vertical model
+    A_T = values["R_Tb"] + values["R_Ta"] + values["S_T"]
+    analytical_lmax = liedl_lmax(A_T, values["av"], values["gamma"], values["Ca"], values["Cd"])
+    if analytical_lmax <= 0:
+        raise ValueError("Liedl analytical Lmax must be positive.")
+    L_D_v = 1.5 * analytical_lmax
+    n_cols_v = int(np.ceil(L_D_v / values["delta_x"]))
+    n_rows_v = int(np.ceil(A_T / values["delta_z"]))
+    if n_cols_v < 2 or n_rows_v < 2:
+        raise ValueError("Vertical grid too coarse — reduce delta_x or delta_z.")
+
+    # Horizontal model
+    cirpka_lmax_val = cirpka_lmax(values["Sw"], values["alpha_th"], values["gamma"], values["Ca"], values["Cd"])
+    L_D_h = cirpka_domain_length(cirpka_lmax_val)
+    A_W = values["R_Wb"] + values["Sw"] + values["R_Wu"]
+    n_cols_h = int(np.ceil(L_D_h / values["delta_x"]))
+    n_rows_h = int(np.ceil(A_W / values["delta_z"]))
+    if n_cols_h < 2 or n_rows_h < 2:
+        raise ValueError("Horizontal grid too coarse — reduce delta_x or delta_z.")
+
+    # Observation wells
+    wells = {}
+    for name, length, width in (("observation_wells_v", L_D_v, A_T), ("observation_wells_h", L_D_h, A_W)):
+        try:
+            points = np.asarray(row.get(name) or [], dtype=float).reshape(-1, 2)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a list of [x, coordinate] pairs.") from None
+        inside = (points >= 0).all(axis=1) & (points[:, 0] <= length) & (points[:, 1] <= width)
+        if not inside.all():
+            raise ValueError(f"{name} must lie inside the model domain (0-{length:.1f} m, 0-{width:.1f} m).")
+        wells[name] = points.tolist()
+    try:
+        output_times = int(row.get("output_times") or DEFAULT_OUTPUT_TIMES)
+    except (TypeError, ValueError):
+        raise ValueError("output_times must be an integer.") from None
+    if output_times < 2:
+        raise ValueError("output_times must be at least 2.")
+    engine = str(row.get("engine") or "modflow")
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}.")
+
+    return {
+        **values,
+        **wells,
+        "output_times": output_times,
+        "engine": engine,
+        "analytical_lmax": analytical_lmax,
+        "cirpka_lmax": cirpka_lmax_val,
+        "L_D_v": L_D_v,
+        "L_D_h": L_D_h,
+        "A_T": A_T,
+        "A_W": A_W,
+        "n_cols_v": n_cols_v,
+        "n_rows_v": n_rows_v,
+        "n_cols_h": n_cols_h,
+        "n_rows_h": n_rows_h,
+    }
+
+
+def run_scenario(row: Mapping, progress=None, parallel: bool = True) -> dict:
+    """
+    Run the vertical and horizontal models for one scenario.
+
+    The two models are independent, so with ``parallel`` the horizontal run is
+    queued on the solver pool alongside the vertical one rather than after it.
+    ``progress(phase, model)`` is called as each solver job moves through its
+    phases. Returns the prepared scenario plus ``v_result`` and ``h_result``.
+    """
+    scenario = prepare_scenario(row)
+
+    def _reporter(model):
+        return None if progress is None else (lambda phase: progress(phase, model))
+
+    def _vertical():
+        return run_numerical_model(
+            scenario["L_D_v"], scenario["A_T"], scenario["n_cols_v"], scenario["n_rows_v"],
+            scenario["prsity"], scenario["al"], scenario["av"], scenario["gamma"], scenario["Cd"], scenario["Ca"],
+            scenario["h1"], scenario["h2"], scenario["hk"],
+            observation_points=scenario["observation_wells_v"], output_times=scenario["output_times"],
+            progress=_reporter("vertical"), engine=scenario["engine"],
+        )
+
+    def _horizontal():
+        return run_numerical_model_horizontal(
+            scenario["L_D_h"], scenario["A_W"], scenario["Sw"], scenario["n_cols_h"], scenario["n_rows_h"],
+            scenario["prsity"], scenario["al"], scenario["alpha_th"], scenario["gamma"], scenario["Cd"], scenario["Ca"],
+            scenario["h1"], scenario["h2"], scenario["hk"],
+            observation_points=scenario["observation_wells_h"], output_times=scenario["output_times"],
+            progress=_reporter("horizontal"), engine=scenario["engine"],
+        )
+
+    if not parallel:
+        return {**scenario, "v_result": _vertical(), "h_result": _horizontal()}
+    # Both calls only block on solver pool futures, so one helper thread is enough
+    # to have the two runs queued at the same time.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="numerical-horizontal") as helper:
+        h_future = helper.submit(_horizontal)
+        v_result = _vertical()
+        h_result = h_future.result()
+    return {**scenario, "v_result": v_result, "h_result": h_result}
+
+
+def result_summary(run_data: Mapping) -> dict:
+    """JSON-safe scalars of a ``run_scenario`` result."""
+    return {
+        "engine": run_data["v_result"].engine,
+        "vertical_plume_length": float(run_data["v_result"].plume_length),
+        "horizontal_plume_length": float(run_data["h_result"].plume_length),
+        "vertical_plume_area": float(run_data["v_result"].plume_area),
+        "horizontal_plume_area": float(run_data["h_result"].plume_area),
+        "vertical_plume_mass": float(run_data["v_result"].plume_mass),
+        "horizontal_plume_mass": float(run_data["h_result"].plume_mass),
+        "analytical_lmax": float(run_data["analytical_lmax"]),
+        "cirpka_lmax": float(run_data["cirpka_lmax"]),
+        "L_D_v": float(run_data["L_D_v"]),
+        "L_D_h": float(run_data["L_D_h"]),
+        "A_T": float(run_data["A_T"]),
+        "A_W": float(run_data["A_W"]),
+    }
+
+
+class NumericalJobs:
+    def __init__(self, root: Path | str = NUMERICAL_JOB_DIR, max_running: int | None = None):
+        self.root = Path(root)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_running or max(4, NUMERICAL_SCENARIO_WORKERS), thread_name_prefix="numerical-job"
+        )
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str, suffix: str = ".json") -> Path:
+        if not job_id.isalnum():
+            raise ValueError("Invalid job id.")
+        return self.root / f"{job_id}{suffix}"
+
+    def _write(self, status: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        status["updated"] = time.time()
+        path = self._path(status["job_id"])
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(status))
+        os.replace(tmp, path)
+
+    def submit(self, scenario: Mapping) -> str:
+        """Validate ``scenario`` and queue it; returns the job id immediately."""
+        prepared = prepare_scenario(scenario)
+        self.prune()
+        job_id = uuid.uuid4().hex
+        status = {
+            "job_id": job_id,
+            "state": "queued",
+            "phase": "queued",
+            "phases": [],
+            "scenario": {
+                **{name: scenario.get(name, default) for name, default in SCENARIO_DEFAULTS.items()},
+                **{name: prepared[name] for name in (*OBSERVATION_FIELDS, "output_times", "engine")},
+            },
+            "engine": prepared["engine"],
+            "submitted": time.time(),
+            "error": None,
+            "result": None,
+        }
+        self._write(status)
+        future = self._executor.submit(self._execute, status, dict(scenario))
+        with self._lock:
+            self._futures[job_id] = future
+        return job_id
+
+    def _execute(self, status: dict, scenario: dict) -> dict:
+        lock = threading.Lock()
+
+        def progress(phase: str, model: str) -> None:
+            with lock:
+                status.update(state="running", phase=phase)
+                status["phases"].append({"phase": phase, "model": model, "time": time.time()})
+                self._write(status)
+
+        try:
+            run_data = run_scenario(scenario, progress)
+        except Exception as exc:
+            with lock:
+                status.update(state="failed", phase="failed", error=str(exc), finished=time.time())
+                self._write(status)
+            raise
+        grids = {
+            "v_concentration": run_data["v_result"].concentration,
+            "v_x_grid": run_data["v_result"].x_grid,
+            "v_z_grid": run_data["v_result"].z_grid,
+            "h_concentration": run_data["h_result"].concentration,
+            "h_x_grid": run_data["h_result"].x_grid,
+            "h_y_grid": run_data["h_result"].y_grid,
+        }
+        for prefix, result in (("v", run_data["v_result"]), ("h", run_data["h_result"])):
+            grids[f"{prefix}_obs_points"] = result.obs_points
+            grids[f"{prefix}_obs_times"] = result.obs_times
+            grids[f"{prefix}_breakthrough"] = result.breakthrough
+        np.savez_compressed(self._path(status["job_id"], ".npz"), **grids)
+        with lock:
+            status.update(state="done", phase="done", result=result_summary(run_data), finished=time.time())
+            self._write(status)
+        return run_data
+
+    def future(self, job_id: str) -> Future | None:
+        """Future of a job started in this process (None for other processes' jobs)."""
+        with self._lock:
+            return self._futures.get(job_id)
+
+    def status(self, job_id: str) -> dict | None:
+        try:
+            return json.loads(self._path(job_id).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def grids(self, job_id: str) -> dict[str, np.ndarray] | None:
+        """Concentration grids and axes of a finished job."""
+        try:
+            with np.load(self._path(job_id, ".npz")) as data:
+                return {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+
+    def events(
+        self,
+        job_id: str,
+        interval: float = 0.5,
+        heartbeat: float = 15.0,
+        timeout: float | None = None,
+    ) -> Iterator[dict | None]:
+        """
+        Yield the job status whenever it changes, until it finishes.
+
+        ``None`` is yielded every ``heartbeat`` seconds without a change so a
+        streaming response can keep its connection alive. With ``timeout`` the
+        generator also stops after that many seconds, finished or not.
+        """
+        last_update = None
+        last_sent = started = time.monotonic()
+        while timeout is None or time.monotonic() - started < timeout:
+            status = self.status(job_id)
+            if status is None:
+                return
+            if status.get("updated") != last_update:
+                last_update = status.get("updated")
+                last_sent = time.monotonic()
+                yield status
+                if status["state"] in TERMINAL_STATES:
+                    return
+            elif time.monotonic() - last_sent >= heartbeat:
+                last_sent = time.monotonic()
+                yield None
+            time.sleep(interval)
+
+    def prune(self, max_age: float = NUMERICAL_JOB_RETENTION) -> None:
+        """Delete job files older than ``max_age`` seconds."""
+        if not self.root.exists():
+            return
+        cutoff = time.time() - max_age
+        for path in self.root.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            for job_id in [j for j, f in self._futures.items() if f.done() and not self._path(j).exists()]:
+                del self._futures[job_id]
+
+
+NUMERICAL_JOBS = NumericalJobs()
+
+
+_PHASE_LABELS = {
+    "queued": "queued",
+    "writing_input": "writing input",
+    "modflow": "running MODFLOW",
+    "flow_cached": "reusing cached flow solution",
+    "mt3dms": "running MT3DMS",
+    "parsing": "reading output",
+    "solving": "solving with the built-in sparse solver",
+    "cached": "loaded from cache",
+    "done": "done",
+    "failed": "failed",
+}
+
+
+def describe(status: Mapping | None) -> str:
+    """Short human-readable progress text, e.g. "horizontal model: running MT3DMS"."""
+    if not status:
+        return "queued"
+    label = _PHASE_LABELS.get(status.get("phase"), str(status.get("phase")))
+    if status.get("engine", "modflow") != "modflow" and status.get("phase") != "solving":
+        label = f"{label} (sparse preview)"
+    if status.get("phases") and status.get("state") == "running":
+        return f"{status['phases'][-1]['model']} model: {label}"
+    return label
+
+
+async def wait_for_job(job_id: str, on_status=None, interval: float = 0.25, jobs: NumericalJobs | None = None) -> dict:
+    """
+    Await a job submitted in this process without blocking the event loop.
+
+    ``on_status(status)`` is called from the event loop whenever the job's
+    status file changes, so it may update Panel widgets directly.
+    """
+    jobs = jobs or NUMERICAL_JOBS
+    future = jobs.future(job_id)
+    if future is None:
+        raise ValueError(f"Job {job_id} was not started in this process.")
+    wrapped = asyncio.wrap_future(future)
+    last_update = None
+    while not wrapped.done():
+        status = jobs.status(job_id)
+        if on_status is not None and status is not None and status.get("updated") != last_update:
+            last_update = status.get("updated")
+            on_status(status)
+        await asyncio.wait({wrapped}, timeout=interval)
+    return wrapped.result()
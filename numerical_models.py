@@ -1,33 +1,53 @@
 from __future__ import annotations
 
-import base64
-import io
-import os
-import shutil
-import struct
-import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Sequence, Tuple
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 
+from numerical_cache import NUMERICAL_CACHE, solver_identity
+from numerical_plots import plume_html
+from plume_geometry import extract_plume
+from solver_pool import SolverContext, _resolve_executable, get_solver_pool  # noqa: F401 - re-exported
+from ucn_reader import UcnFile, _parse_mt3d_header  # noqa: F401 - re-exported
+
 try:
     import flopy
 except Exception:  # pragma: no cover - dependency may not be installed locally
     flopy = None
 
+# Flow-transport link file written by MODFLOW's LMT package and read by MT3DMS.
+FTL_FILE = "mt3d_link.ftl"
+# "modflow" runs MODFLOW/MT3DMS; "sparse" is the approximate in-process solver
+# in sparse_engine, meant for previews and parameter sweeps.
+ENGINES = ("modflow", "sparse")
+ENGINE_LABELS = {"modflow": "MODFLOW/MT3DMS", "sparse": "Built-in sparse solver (preview)"}
+PERLEN = 6000.0  # simulated period [d]; long enough for the plume to reach steady state
+
 
 @dataclass(frozen=True)
 class NumericalModelResult:
     plume_length: float
-    plot_html: str
     concentration: np.ndarray
     x_grid: np.ndarray
     z_grid: np.ndarray
+    # Region above plume_level (c0 = 2 Ca); mass is electron donor per metre of aquifer [kg/m].
+    plume_level: float = float("nan")
+    plume_width: float = float("nan")
+    plume_area: float = float("nan")
+    plume_mass: float = float("nan")
+    # Breakthrough curves: concentration at each observation point (columns) per output time.
+    obs_points: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    obs_times: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    breakthrough: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    engine: str = "modflow"
+
+    @cached_property
+    def plot_html(self) -> str:
+        """PNG plume outline as an ``<img>`` tag, rendered on first access."""
+        return plume_html(self)
 
 
 @dataclass(frozen=True)
@@ -36,200 +56,183 @@ class HorizontalModelResult:
     concentration: np.ndarray
     x_grid: np.ndarray
     y_grid: np.ndarray
+    plume_level: float = float("nan")
+    plume_width: float = float("nan")
+    plume_area: float = float("nan")
+    plume_mass: float = float("nan")
+    obs_points: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    obs_times: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    breakthrough: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    engine: str = "modflow"
 
 
-def _read_fortran_record(handle) -> bytes | None:
-    """Read one sequential-unformatted Fortran record."""
-    size_bytes = handle.read(4)
-    if not size_bytes:
-        return None
-    if len(size_bytes) != 4:
-        raise RuntimeError("Unexpected end of file while reading Fortran record length.")
-
-    (record_size,) = struct.unpack("<i", size_bytes)
-    payload = handle.read(record_size)
-    if len(payload) != record_size:
-        raise RuntimeError("Unexpected end of file while reading Fortran record payload.")
-
-    end_size_bytes = handle.read(4)
-    if len(end_size_bytes) != 4:
-        raise RuntimeError("Unexpected end of file while reading Fortran record terminator.")
-
-    (end_record_size,) = struct.unpack("<i", end_size_bytes)
-    if end_record_size != record_size:
-        raise RuntimeError("Corrupt Fortran record: length prefix/suffix mismatch.")
-
-    return payload
-
-
-def _parse_mt3d_header(header_payload: bytes) -> tuple[float, str, int, int, int, np.dtype]:
-    if len(header_payload) == 44:
-        ntrans, kstp, kper, totim = struct.unpack("<3if", header_payload[:16])
-        text = header_payload[16:32].decode("ascii", "ignore").strip()
-        ncol_hdr, nrow_hdr, ilay_hdr = struct.unpack("<3i", header_payload[32:44])
-        precision = np.dtype(np.float32)
-    elif len(header_payload) == 48:
-        ntrans, kstp, kper = struct.unpack("<3i", header_payload[:12])
-        (totim,) = struct.unpack("<d", header_payload[12:20])
-        text = header_payload[20:36].decode("ascii", "ignore").strip()
-        ncol_hdr, nrow_hdr, ilay_hdr = struct.unpack("<3i", header_payload[36:48])
-        precision = np.dtype(np.float64)
-    else:
-        raise RuntimeError(f"Unsupported MT3DMS concentration header size {len(header_payload)} bytes.")
+def _read_mt3d_concentration(ucn_path: Path, nlay: int, nrow: int, ncol: int) -> np.ndarray:
+    """
+    Latest MT3DMS concentration cube as (nlay, nrow, ncol) float64.
 
-    return float(totim), text, int(ncol_hdr), int(nrow_hdr), int(ilay_hdr), precision
+    FloPy's UcnFile reader can fail against some MT3DMS builds even when the output is
+    otherwise valid, so this goes through the indexed reader in ``ucn_reader``.
+    """
+    with UcnFile(ucn_path, nrow=nrow, ncol=ncol, nlay=nlay) as ucn:
+        return ucn.get_data().astype(np.float64)
 
 
-def _read_mt3d_concentration(ucn_path: Path, nlay: int, nrow: int, ncol: int) -> np.ndarray:
+def _observation_cells(points, x_grid: np.ndarray, v_grid: np.ndarray, axis_name: str) -> tuple[np.ndarray, list]:
     """
-    Read MT3DMS concentration output written as sequential-unformatted Fortran records.
+    Snap (x, z) or (x, y) observation points to the nearest grid node.
 
-    FloPy's UcnFile reader can fail against some MT3DMS builds even when the output is
-    otherwise valid. This parser handles the standard UCN header/data record pairs and
-    returns the latest concentration cube as (nlay, nrow, ncol).
+    Returns the points as an (n, 2) array and their 0-based (layer, row, col)
+    cells. z / y is measured from the bottom of the domain; model row 0 is the top.
     """
-    latest_by_layer: dict[int, np.ndarray] = {}
-    latest_totim: float | None = None
-    cell_count = nrow * ncol
-
-    def add_record(header_payload: bytes, data_payload: bytes) -> None:
-        nonlocal latest_totim, latest_by_layer
-        totim, text, ncol_hdr, nrow_hdr, ilay_hdr, precision = _parse_mt3d_header(header_payload)
-
-        if ncol_hdr != ncol or nrow_hdr != nrow:
-            raise RuntimeError(
-                f"Unexpected MT3DMS concentration shape ({nrow_hdr}, {ncol_hdr}); "
-                f"expected ({nrow}, {ncol})."
-            )
-
-        if text.upper() != "CONCENTRATION":
-            return
-
-        values = np.frombuffer(data_payload, dtype=precision)
-        if values.size != cell_count:
-            raise RuntimeError(
-                f"Unexpected MT3DMS concentration payload size {values.size}; expected {cell_count}."
-            )
-
-        current_array = values.reshape((nrow, ncol)).astype(np.float64, copy=False)
-        if latest_totim is None or totim > latest_totim:
-            latest_totim = totim
-            latest_by_layer = {ilay_hdr: current_array}
-        elif np.isclose(totim, latest_totim):
-            latest_by_layer[ilay_hdr] = current_array
-
-    def read_fortran_stream() -> None:
-        with ucn_path.open("rb") as handle:
-            while True:
-                header_payload = _read_fortran_record(handle)
-                if header_payload is None:
-                    break
-                data_payload = _read_fortran_record(handle)
-                if data_payload is None:
-                    raise RuntimeError("Incomplete MT3DMS concentration output: missing data record.")
-                add_record(header_payload, data_payload)
-
-    def read_raw_stream() -> None:
-        data = ucn_path.read_bytes()
-        offset = 0
-        total = len(data)
-        while offset < total:
-            parsed = False
-            for header_size, precision in ((44, np.dtype(np.float32)), (48, np.dtype(np.float64))):
-                data_size = cell_count * precision.itemsize
-                if offset + header_size + data_size > total:
-                    continue
-                header_payload = data[offset:offset + header_size]
-                try:
-                    _totim, text, ncol_hdr, nrow_hdr, _ilay_hdr, parsed_precision = _parse_mt3d_header(header_payload)
-                except RuntimeError:
-                    continue
-                if parsed_precision != precision:
-                    continue
-                if text.upper() != "CONCENTRATION" or ncol_hdr != ncol or nrow_hdr != nrow:
-                    continue
-                data_start = offset + header_size
-                data_payload = data[data_start:data_start + data_size]
-                add_record(header_payload, data_payload)
-                offset = data_start + data_size
-                parsed = True
-                break
-            if not parsed:
-                raise RuntimeError(
-                    "Unsupported MT3DMS concentration output format. "
-                    "Expected raw UCN records or sequential-unformatted Fortran records."
-                )
-
-    first_word = struct.unpack("<i", ucn_path.read_bytes()[:4])[0]
-    if first_word in {44, 48}:
-        try:
-            read_fortran_stream()
-        except RuntimeError as exc:
-            if "length prefix/suffix mismatch" not in str(exc):
-                raise
-            latest_by_layer = {}
-            latest_totim = None
-            read_raw_stream()
-    else:
-        read_raw_stream()
-
-    if latest_totim is None or not latest_by_layer:
-        raise RuntimeError("MT3DMS concentration output did not contain any concentration records.")
-
-    concentration = np.zeros((nlay, nrow, ncol), dtype=np.float64)
-    for layer_index, layer_data in latest_by_layer.items():
-        if 1 <= layer_index <= nlay:
-            concentration[layer_index - 1] = layer_data
-
-    return concentration
-
-
-def _resolve_executable(env_name: str, fallback_names: list[str]) -> str:
-    configured = os.getenv(env_name)
-    if configured and Path(configured).exists():
-        configured_path = Path(configured)
-        if os.name != "nt" and configured_path.suffix.lower() == ".exe":
-            raise RuntimeError(
-                f"{env_name} points to a Windows executable ({configured_path.name}), "
-                "which cannot run inside Docker/Linux. Provide a Linux binary instead."
-            )
-        return configured
-
-    local_dirs = [
-        Path.cwd(),
-        Path.cwd() / ".modflow_bin",
-        Path.cwd() / "solvers",
-        Path.cwd() / "bin",
-    ]
-
-    windows_only_candidates: list[str] = []
-
-    for name in fallback_names:
-        found = shutil.which(name)
-        if found:
-            found_path = Path(found)
-            if os.name != "nt" and found_path.suffix.lower() == ".exe":
-                windows_only_candidates.append(str(found_path))
-                continue
-            return found
-        for directory in local_dirs:
-            local = directory / name
-            if local.exists():
-                if os.name != "nt" and local.suffix.lower() == ".exe":
-                    windows_only_candidates.append(str(local))
-                    continue
-                return str(local)
-
-    if os.name != "nt" and windows_only_candidates:
-        raise RuntimeError(
-            f"Only Windows solver binaries were found for {env_name}: {windows_only_candidates}. "
-            "Docker numerical runs require Linux solver binaries in solvers/ or on PATH."
-        )
-
-    raise RuntimeError(
-        f"Missing required executable for {env_name}. "
-        f"Set {env_name} or place one of {fallback_names} on PATH."
+    points = np.asarray(points if points is not None else [], dtype=float).reshape(-1, 2)
+    if not np.all(np.isfinite(points)):
+        raise ValueError("Observation points must be finite numbers.")
+    outside = (
+        (points[:, 0] < x_grid[0]) | (points[:, 0] > x_grid[-1])
+        | (points[:, 1] < v_grid[0]) | (points[:, 1] > v_grid[-1])
     )
+    if np.any(outside):
+        raise ValueError(f"Observation points must lie inside the model domain (x, {axis_name}).")
+    cols = np.abs(x_grid[None, :] - points[:, :1]).argmin(axis=1)
+    rows = v_grid.size - 1 - np.abs(v_grid[None, :] - points[:, 1:]).argmin(axis=1)
+    return points, [(0, int(i), int(j)) for i, j in zip(rows, cols)]
+
+
+def _output_times(n: int) -> np.ndarray:
+    """Evenly spaced MT3DMS output times ending at the end of the simulation."""
+    if n < 2:
+        raise ValueError("output_times must be at least 2.")
+    return np.linspace(PERLEN / n, PERLEN, n)
+
+
+def _read_transport_output(ucn_path: Path, nrow: int, ncol: int, cells: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Latest concentration slice, output times and breakthrough curves at ``cells``."""
+    with UcnFile(ucn_path, nrow=nrow, ncol=ncol, nlay=1) as ucn:
+        conc_slice = ucn.get_data()[0].astype(np.float64)
+        if not cells:
+            return conc_slice, np.zeros(0), np.zeros((0, 0))
+        return conc_slice, ucn.times.astype(np.float64), ucn.time_series(cells)
+
+
+def _vertical_transport_bc(nrow: int, ncol: int, gamma: float, cd: float, ca: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    MT3DMS ``icbund``/``sconc`` of the vertical model, shape (1, nrow, ncol).
+
+    Row 0 (aquifer top) and the outflow column hold ``ca``; the inflow column
+    is the source, gamma * cd + 2 ca. The bottom row is a no-flux boundary.
+    """
+    icbund = np.ones((1, nrow, ncol), dtype=np.int32)
+    icbund[:, 0, :] = -1
+    icbund[:, :, 0] = -1
+    icbund[:, :, -1] = -1
+
+    sconc = np.zeros((1, nrow, ncol), dtype=np.float32)
+    sconc[:, 0, :] = ca
+    sconc[:, :, 0] = (gamma * cd) + (2 * ca)
+    sconc[:, :, -1] = ca
+    return icbund, sconc
+
+
+def _horizontal_transport_bc(A_W: float, Sw: float, nrow: int, ncol: int, gamma: float, cd: float, ca: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    MT3DMS ``icbund``/``sconc`` of the horizontal model, shape (1, nrow, ncol).
+
+    All four edges are fixed; the source strip of width ``Sw`` is centred on
+    the inflow column and everything else starts at and is held at ``ca``.
+    """
+    dely = A_W / nrow
+    source_row_start = max(0, int(np.floor((A_W - Sw) / 2.0 / dely)))
+    source_row_end = min(nrow - 1, int(np.ceil((A_W + Sw) / 2.0 / dely)))
+
+    icbund = np.ones((1, nrow, ncol), dtype=np.int32)
+    icbund[:, :, 0] = -1
+    icbund[:, :, -1] = -1
+    icbund[:, 0, :] = -1
+    icbund[:, -1, :] = -1
+
+    sconc = np.full((1, nrow, ncol), ca, dtype=np.float32)
+    sconc[:, source_row_start:source_row_end + 1, 0] = float(gamma * cd) + 2.0 * float(ca)
+    sconc[:, :, -1] = ca
+    sconc[:, 0, :] = ca
+    sconc[:, -1, :] = ca
+    return icbund, sconc
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}.")
+    if engine == "modflow" and flopy is None:
+        raise RuntimeError("flopy is not installed. Install flopy to run the numerical model.")
+
+
+def _run_cached(
+    kind: str,
+    job: Callable,
+    inputs: dict,
+    progress: Callable[[str], None] | None,
+    engine: str = "modflow",
+    use_cache: bool = True,
+):
+    """
+    Serve a run from the on-disk result cache, or run ``job`` and cache its result.
+
+    MODFLOW jobs are queued on the solver pool and keyed with the solver
+    binaries' identity; the sparse engine runs in the calling thread.
+    """
+    if engine == "sparse":
+        pool, solvers = None, {"engine": "sparse"}
+        kind_key = f"{kind}-sparse"
+    else:
+        pool = get_solver_pool()
+        solvers, kind_key = solver_identity(pool.executables), kind
+    key = NUMERICAL_CACHE.key(kind_key, inputs, solvers)
+    result_cls = NumericalModelResult if kind == "vertical" else HorizontalModelResult
+    cached = NUMERICAL_CACHE.get(key) if use_cache else None
+    if cached is not None:
+        arrays, meta = cached
+        if progress is not None:
+            progress("cached")
+        return result_cls(**meta, **{name: values.astype(np.float64) for name, values in arrays.items()})
+
+    if pool is None:
+        if progress is not None:
+            progress("solving")
+        result = job(**inputs)
+    else:
+        result = pool.submit(job, **inputs, progress=progress).result()
+    values = {f.name: getattr(result, f.name) for f in fields(result)}
+    arrays = {name: value for name, value in values.items() if isinstance(value, np.ndarray)}
+    meta = {name: value for name, value in values.items() if name not in arrays}
+    NUMERICAL_CACHE.put(key, arrays, meta)
+    return result
+
+
+def _solve_flow(ctx: SolverContext, mf, kind: str, flow_inputs: dict, failure_message: str) -> None:
+    """
+    Provide the MODFLOW flow-transport link file (and heads) in ``ctx.workdir``.
+
+    The steady flow field depends only on geometry, grid, heads and hk, so
+    solutions are cached under a hash of those inputs. Transport-only changes
+    (porosity, dispersivities, chemistry) copy the cached files in and skip
+    MODFLOW entirely.
+    """
+    key = NUMERICAL_CACHE.key(f"flow-{kind}", flow_inputs, solver_identity({"mf2005": ctx.executables["mf2005"]}))
+    files = NUMERICAL_CACHE.get_files(key)
+    if files is not None:
+        ctx.report("flow_cached")
+        for name, contents in files.items():
+            (ctx.workdir / name).write_bytes(contents)
+        return
+
+    mf.write_input()
+    ctx.report("modflow")
+    success, _ = ctx.run("mf2005", mf.namefile)
+    if not success:
+        raise RuntimeError(failure_message)
+    link = ctx.workdir / FTL_FILE
+    if link.exists():
+        outputs = [link, *ctx.workdir.glob("*.hds")]
+        NUMERICAL_CACHE.put_files(key, {path.name: path.read_bytes() for path in outputs})
 
 
 def run_numerical_model(
@@ -246,133 +249,151 @@ def run_numerical_model(
     h1: float,
     h2: float,
     hk: float,
+    observation_points: Sequence[Tuple[float, float]] | None = None,
+    output_times: int = 50,
+    progress: Callable[[str], None] | None = None,
+    engine: str = "modflow",
+    use_cache: bool = True,
 ) -> NumericalModelResult:
-    if flopy is None:
-        raise RuntimeError("flopy is not installed. Install flopy to run the numerical model.")
-
+    """
+    Vertical cross-section model, queued on the shared solver pool.
+
+    ``progress`` is called with each phase: writing_input, modflow, mt3dms,
+    parsing. The result holds arrays and metrics only; ``plot_html`` is rendered
+    on first access. ``observation_points`` are (x, z) well positions [m];
+    when given, MT3DMS writes ``output_times`` snapshots and the result carries
+    a breakthrough curve per point. ``engine="sparse"`` opts into the approximate
+    in-process solver in ``sparse_engine`` instead of MODFLOW/MT3DMS; the
+    result's ``engine`` records which one ran.
+    """
+    _check_engine(engine)
     if min(Lx, Ly, prsity, al, hk) <= 0:
         raise ValueError("Lx, Ly, prsity, al, and hk must be positive.")
     if ncol < 2 or nrow < 2:
         raise ValueError("ncol and nrow must both be at least 2.")
 
-    mf_exe = _resolve_executable("MF2005_EXE", ["mf2005.exe", "mf2005"])
-    mt_exe = _resolve_executable("MT3DMS_EXE", ["mt3dms.exe", "mt3dms"])
-
-    run_root = Path.cwd() / ".numerical_runs"
-    run_root.mkdir(exist_ok=True)
-
-    with tempfile.TemporaryDirectory(dir=run_root) as tmpdir:
-        workdir = Path(tmpdir)
-
-        ztop = 0.0
-        zbot = -1.0
-        nlay = 1
-        delx = Lx / ncol
-        dely = Ly / nrow
-        delv = (ztop - zbot) / nlay
-        perlen = 6000.0
-
-        model_id = workdir.name.replace("-", "_")
-
-        t0_mf = f"T02_mf_{model_id}"
-        mf = flopy.modflow.Modflow(modelname=t0_mf, exe_name=mf_exe, model_ws=str(workdir))
-        flopy.modflow.ModflowDis(
-            mf,
-            nlay=nlay,
-            nrow=nrow,
-            ncol=ncol,
-            delr=delx,
-            delc=dely,
-            top=ztop,
-            botm=[ztop - delv],
-            perlen=perlen,
-        )
-
-        ibound = np.ones((nlay, nrow, ncol), dtype=np.int32)
-        ibound[:, :, 0] = -1
-        ibound[:, :, -1] = -1
-        strt = np.ones((nlay, nrow, ncol), dtype=np.float32)
-        strt[:, :, 0] = h1
-        strt[:, :, -1] = h2
-
-        flopy.modflow.ModflowBas(mf, ibound=ibound, strt=strt)
-        flopy.modflow.ModflowLpf(mf, hk=hk, laytyp=0)
-        flopy.modflow.ModflowGmg(mf)
-        flopy.modflow.ModflowLmt(mf, output_file_format="formatted")
-
-        mf.write_input()
-        success, _ = mf.run_model(silent=True)
-        if not success:
-            raise RuntimeError("MODFLOW execution failed.")
-
-        t0_mt = f"T02_mt_{model_id}"
-        mt = flopy.mt3d.Mt3dms(
-            modelname=t0_mt,
-            exe_name=mt_exe,
-            modflowmodel=mf,
-            ftlfree=True,
-            model_ws=str(workdir),
-        )
-
-        icbund = np.ones((nlay, nrow, ncol), dtype=np.int32)
-        icbund[:, 0, :] = -1
-        icbund[:, :, 0] = -1
-        icbund[:, :, -1] = -1
-
-        sconc = np.zeros((nlay, nrow, ncol), dtype=np.float32)
-        sconc[:, 0, :] = ca
-        sconc[:, :, 0] = (gamma * cd) + (2 * ca)
-        sconc[:, :, -1] = ca
-
-        flopy.mt3d.Mt3dBtn(mt, icbund=icbund, prsity=prsity, sconc=sconc)
-        flopy.mt3d.Mt3dAdv(mt, mixelm=-1)
-        trpt = av / al if al > 0 else 0.1
-        flopy.mt3d.Mt3dDsp(mt, al=al, trpt=trpt)
-        flopy.mt3d.Mt3dGcg(mt)
-        flopy.mt3d.Mt3dSsm(mt)
-
-        mt.write_input()
-        success, buff = mt.run_model(silent=True, report=True)
-        if (not success) and not any("Program completed" in str(line) for line in buff):
-            raise RuntimeError("MT3DMS execution failed.")
-
-        ucn_path = workdir / "MT3D001.UCN"
-        if not ucn_path.exists():
-            raise RuntimeError("MT3DMS did not produce MT3D001.UCN concentration output.")
-
-        conc = _read_mt3d_concentration(ucn_path, nlay=nlay, nrow=nrow, ncol=ncol)
-        conc_slice = conc[0]
-        x_grid = np.linspace(0.0, Lx, ncol)
-        z_grid = np.linspace(0.0, Ly, nrow)
-
-        c0 = 2 * ca
-        fig = plt.figure(figsize=(11, 5))
-        ax = plt.axes()
-        mm = flopy.plot.map.PlotMapView(ax=ax, model=mf)
-        cs = mm.contour_array(conc_slice, levels=[c0], colors=["#163c66"], linewidths=2.0)
-        plt.xlabel("Distance Lx [m]")
-        plt.ylabel("Aquifer Thickness [m]")
-        plt.title("Contaminant Plume")
-
-        img = io.BytesIO()
-        plt.savefig(img, format="png", bbox_inches="tight", dpi=300)
-        plt.close(fig)
-        img.seek(0)
-
-        plot_url = base64.b64encode(img.getvalue()).decode()
-
-        segments = cs.allsegs[0] if getattr(cs, "allsegs", None) else []
-        if not segments or len(segments[0]) == 0:
-            plume_length = 0.0
-        else:
-            plume_length = float(np.max(np.asarray(segments[0])[:, 0]))
+    inputs = dict(Lx=Lx, Ly=Ly, ncol=ncol, nrow=nrow, prsity=prsity, al=al, av=av, gamma=gamma, cd=cd, ca=ca, h1=h1, h2=h2, hk=hk)
+    points, _ = _observation_cells(observation_points, np.linspace(0.0, Lx, ncol), np.linspace(0.0, Ly, nrow), "z")
+    if len(points):
+        _output_times(output_times)
+        inputs.update(observation_points=points.tolist(), output_times=int(output_times))
+    if engine == "sparse":
+        from sparse_engine import solve_vertical
+
+        return _run_cached("vertical", solve_vertical, inputs, progress, engine, use_cache)
+    return _run_cached("vertical", _vertical_job, inputs, progress, engine, use_cache)
+
+
+def _vertical_job(
+    ctx: SolverContext,
+    Lx: float,
+    Ly: float,
+    ncol: int,
+    nrow: int,
+    prsity: float,
+    al: float,
+    av: float,
+    gamma: float,
+    cd: float,
+    ca: float,
+    h1: float,
+    h2: float,
+    hk: float,
+    observation_points: Sequence[Tuple[float, float]] | None = None,
+    output_times: int = 50,
+) -> NumericalModelResult:
+    workdir = ctx.workdir
+    ctx.report("writing_input")
+
+    ztop = 0.0
+    zbot = -1.0
+    nlay = 1
+    delx = Lx / ncol
+    dely = Ly / nrow
+    delv = (ztop - zbot) / nlay
+    perlen = PERLEN
+
+    t0_mf = "T02_mf"
+    mf = flopy.modflow.Modflow(modelname=t0_mf, exe_name=ctx.executables["mf2005"], model_ws=str(workdir))
+    flopy.modflow.ModflowDis(
+        mf,
+        nlay=nlay,
+        nrow=nrow,
+        ncol=ncol,
+        delr=delx,
+        delc=dely,
+        top=ztop,
+        botm=[ztop - delv],
+        perlen=perlen,
+    )
+
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int32)
+    ibound[:, :, 0] = -1
+    ibound[:, :, -1] = -1
+    strt = np.ones((nlay, nrow, ncol), dtype=np.float32)
+    strt[:, :, 0] = h1
+    strt[:, :, -1] = h2
+
+    flopy.modflow.ModflowBas(mf, ibound=ibound, strt=strt)
+    flopy.modflow.ModflowLpf(mf, hk=hk, laytyp=0)
+    flopy.modflow.ModflowGmg(mf)
+    flopy.modflow.ModflowLmt(mf, output_file_name=FTL_FILE, output_file_format="formatted")
+
+    _solve_flow(ctx, mf, "vertical", dict(Lx=Lx, Ly=Ly, ncol=ncol, nrow=nrow, h1=h1, h2=h2, hk=hk), "MODFLOW execution failed.")
+
+    t0_mt = "T02_mt"
+    mt = flopy.mt3d.Mt3dms(
+        modelname=t0_mt,
+        exe_name=ctx.executables["mt3dms"],
+        modflowmodel=mf,
+        ftlfilename=FTL_FILE,
+        ftlfree=True,
+        model_ws=str(workdir),
+    )
+
+    icbund, sconc = _vertical_transport_bc(nrow, ncol, gamma, cd, ca)
+    x_grid = np.linspace(0.0, Lx, ncol)
+    z_grid = np.linspace(0.0, Ly, nrow)
+    obs_points, obs_cells = _observation_cells(observation_points, x_grid, z_grid, "z")
+    timprs = _output_times(output_times) if obs_cells else None
+    flopy.mt3d.Mt3dBtn(
+        mt, icbund=icbund, prsity=prsity, sconc=sconc,
+        nprs=0 if timprs is None else len(timprs), timprs=timprs,
+    )
+    flopy.mt3d.Mt3dAdv(mt, mixelm=-1)
+    trpt = av / al if al > 0 else 0.1
+    flopy.mt3d.Mt3dDsp(mt, al=al, trpt=trpt)
+    flopy.mt3d.Mt3dGcg(mt)
+    flopy.mt3d.Mt3dSsm(mt)
+
+    mt.write_input()
+    ctx.report("mt3dms")
+    success, buff = ctx.run("mt3dms", mt.namefile)
+    if (not success) and not any("Program completed" in str(line) for line in buff):
+        raise RuntimeError("MT3DMS execution failed.")
+
+    ctx.report("parsing")
+    ucn_path = workdir / "MT3D001.UCN"
+    if not ucn_path.exists():
+        raise RuntimeError("MT3DMS did not produce MT3D001.UCN concentration output.")
+
+    conc_slice, obs_times, breakthrough = _read_transport_output(ucn_path, nrow, ncol, obs_cells)
+
+    c0 = 2 * ca
+    plume = extract_plume(conc_slice, x_grid, z_grid, c0, porosity=prsity, gamma=gamma)
 
     return NumericalModelResult(
-        plume_length=plume_length,
-        plot_html=f'<img src="data:image/png;base64,{plot_url}" alt="Numerical plume plot" style="width:100%;height:auto;border-radius:12px;" />',
+        plume_length=plume.length,
         concentration=conc_slice,
         x_grid=x_grid,
         z_grid=z_grid,
+        plume_level=c0,
+        plume_width=plume.width,
+        plume_area=plume.area,
+        plume_mass=plume.mass,
+        obs_points=obs_points,
+        obs_times=obs_times,
+        breakthrough=breakthrough,
     )
 
 
@@ -410,6 +431,11 @@ def run_numerical_model_horizontal(
     h1: float,
     h2: float,
     hk: float,
+    observation_points: Sequence[Tuple[float, float]] | None = None,
+    output_times: int = 50,
+    progress: Callable[[str], None] | None = None,
+    engine: str = "modflow",
+    use_cache: bool = True,
 ) -> HorizontalModelResult:
     """
     Plan-view (horizontal) 2-D reactive transport model using MODFLOW/MT3DMS.
@@ -420,9 +446,11 @@ def run_numerical_model_horizontal(
 
     Source: strip of width Sw centred in y at the left (x=0) boundary.
     Ambient reactant at concentration ca enters at top/bottom y-boundaries.
+    ``observation_points`` are (x, y) well positions [m] for breakthrough curves.
+    The run is queued on the shared solver pool; ``progress`` receives its phases.
+    ``engine`` is as for ``run_numerical_model``.
     """
-    if flopy is None:
-        raise RuntimeError("flopy is not installed. Install flopy to run the numerical model.")
+    _check_engine(engine)
     if min(Lx, A_W, prsity, al, hk) <= 0:
         raise ValueError("Lx, A_W, prsity, al, hk must all be positive.")
     if ncol < 2 or nrow < 2:
@@ -430,114 +458,126 @@ def run_numerical_model_horizontal(
     if Sw <= 0 or Sw >= A_W:
         raise ValueError("Source width Sw must be positive and less than domain width A_W.")
 
-    mf_exe = _resolve_executable("MF2005_EXE", ["mf2005.exe", "mf2005"])
-    mt_exe = _resolve_executable("MT3DMS_EXE", ["mt3dms.exe", "mt3dms"])
-
-    run_root = Path.cwd() / ".numerical_runs"
-    run_root.mkdir(exist_ok=True)
-
-    with tempfile.TemporaryDirectory(dir=run_root) as tmpdir:
-        workdir = Path(tmpdir)
-
-        ztop = 0.0
-        zbot = -1.0
-        nlay = 1
-        delx = Lx / ncol
-        dely = A_W / nrow
-        delv = ztop - zbot
-        perlen = 6000.0
-
-        model_id = workdir.name.replace("-", "_")
-
-        t0_mf = f"T03_mf_{model_id}"
-        mf = flopy.modflow.Modflow(modelname=t0_mf, exe_name=mf_exe, model_ws=str(workdir))
-        flopy.modflow.ModflowDis(
-            mf, nlay=nlay, nrow=nrow, ncol=ncol,
-            delr=delx, delc=dely,
-            top=ztop, botm=[ztop - delv],
-            perlen=perlen,
-        )
-
-        # Left/right columns = specified head; top/bottom rows = active (no-flow)
-        ibound = np.ones((nlay, nrow, ncol), dtype=np.int32)
-        ibound[:, :, 0] = -1
-        ibound[:, :, -1] = -1
-
-        strt = np.full((nlay, nrow, ncol), (h1 + h2) / 2.0, dtype=np.float32)
-        strt[:, :, 0] = h1
-        strt[:, :, -1] = h2
-
-        flopy.modflow.ModflowBas(mf, ibound=ibound, strt=strt)
-        flopy.modflow.ModflowLpf(mf, hk=hk, laytyp=0)
-        flopy.modflow.ModflowGmg(mf)
-        flopy.modflow.ModflowLmt(mf, output_file_format="formatted")
-
-        mf.write_input()
-        success, _ = mf.run_model(silent=True)
-        if not success:
-            raise RuntimeError("MODFLOW (horizontal) execution failed.")
-
-        # --- MT3DMS ---
-        t0_mt = f"T03_mt_{model_id}"
-        mt = flopy.mt3d.Mt3dms(
-            modelname=t0_mt, exe_name=mt_exe,
-            modflowmodel=mf, ftlfree=True,
-            model_ws=str(workdir),
-        )
-
-        # Source strip centred in the y-domain
-        source_row_start = max(0, int(np.floor((A_W - Sw) / 2.0 / dely)))
-        source_row_end = min(nrow - 1, int(np.ceil((A_W + Sw) / 2.0 / dely)))
-
-        icbund = np.ones((nlay, nrow, ncol), dtype=np.int32)
-        icbund[:, :, 0] = -1
-        icbund[:, :, -1] = -1
-        icbund[:, 0, :] = -1
-        icbund[:, -1, :] = -1
-
-        sconc = np.full((nlay, nrow, ncol), ca, dtype=np.float32)
-        sconc[:, source_row_start:source_row_end + 1, 0] = float(gamma * cd) + 2.0 * float(ca)
-        sconc[:, :, -1] = ca
-        sconc[:, 0, :] = ca
-        sconc[:, -1, :] = ca
-
-        flopy.mt3d.Mt3dBtn(mt, icbund=icbund, prsity=prsity, sconc=sconc)
-        flopy.mt3d.Mt3dAdv(mt, mixelm=-1)
-        trpt = alpha_Th / al if al > 0 else 0.1
-        flopy.mt3d.Mt3dDsp(mt, al=al, trpt=trpt)
-        flopy.mt3d.Mt3dGcg(mt)
-        flopy.mt3d.Mt3dSsm(mt)
-
-        mt.write_input()
-        success, buff = mt.run_model(silent=True, report=True)
-        if (not success) and not any("Program completed" in str(line) for line in buff):
-            raise RuntimeError("MT3DMS (horizontal) execution failed.")
-
-        ucn_path = workdir / "MT3D001.UCN"
-        if not ucn_path.exists():
-            raise RuntimeError("MT3DMS (horizontal) did not produce MT3D001.UCN.")
-
-        conc = _read_mt3d_concentration(ucn_path, nlay=nlay, nrow=nrow, ncol=ncol)
-        conc_slice = conc[0]
-        x_grid = np.linspace(0.0, Lx, ncol)
-        y_grid = np.linspace(0.0, A_W, nrow)
-
-        # Extract plume length from the c0 = 2*ca contour
-        c0 = 2.0 * ca
-        plume_length = 0.0
-        try:
-            fig_tmp, ax_tmp = plt.subplots()
-            cs = ax_tmp.contour(x_grid, y_grid, conc_slice, levels=[c0])
-            segs = cs.allsegs[0] if getattr(cs, "allsegs", None) else []
-            if segs and len(segs[0]):
-                plume_length = float(np.max(np.asarray(segs[0])[:, 0]))
-            plt.close(fig_tmp)
-        except Exception:
-            plume_length = 0.0
+    inputs = dict(
+        Lx=Lx, A_W=A_W, Sw=Sw, ncol=ncol, nrow=nrow, prsity=prsity, al=al, alpha_Th=alpha_Th,
+        gamma=gamma, cd=cd, ca=ca, h1=h1, h2=h2, hk=hk,
+    )
+    points, _ = _observation_cells(observation_points, np.linspace(0.0, Lx, ncol), np.linspace(0.0, A_W, nrow), "y")
+    if len(points):
+        _output_times(output_times)
+        inputs.update(observation_points=points.tolist(), output_times=int(output_times))
+    if engine == "sparse":
+        from sparse_engine import solve_horizontal
+
+        return _run_cached("horizontal", solve_horizontal, inputs, progress, engine, use_cache)
+    return _run_cached("horizontal", _horizontal_job, inputs, progress, engine, use_cache)
+
+
+def _horizontal_job(
+    ctx: SolverContext,
+    Lx: float,
+    A_W: float,
+    Sw: float,
+    ncol: int,
+    nrow: int,
+    prsity: float,
+    al: float,
+    alpha_Th: float,
+    gamma: float,
+    cd: float,
+    ca: float,
+    h1: float,
+    h2: float,
+    hk: float,
+    observation_points: Sequence[Tuple[float, float]] | None = None,
+    output_times: int = 50,
+) -> HorizontalModelResult:
+    workdir = ctx.workdir
+    ctx.report("writing_input")
+
+    ztop = 0.0
+    zbot = -1.0
+    nlay = 1
+    delx = Lx / ncol
+    dely = A_W / nrow
+    delv = ztop - zbot
+    perlen = PERLEN
+
+    t0_mf = "T03_mf"
+    mf = flopy.modflow.Modflow(modelname=t0_mf, exe_name=ctx.executables["mf2005"], model_ws=str(workdir))
+    flopy.modflow.ModflowDis(
+        mf, nlay=nlay, nrow=nrow, ncol=ncol,
+        delr=delx, delc=dely,
+        top=ztop, botm=[ztop - delv],
+        perlen=perlen,
+    )
+
+    # Left/right columns = specified head; top/bottom rows = active (no-flow)
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int32)
+    ibound[:, :, 0] = -1
+    ibound[:, :, -1] = -1
+
+    strt = np.full((nlay, nrow, ncol), (h1 + h2) / 2.0, dtype=np.float32)
+    strt[:, :, 0] = h1
+    strt[:, :, -1] = h2
+
+    flopy.modflow.ModflowBas(mf, ibound=ibound, strt=strt)
+    flopy.modflow.ModflowLpf(mf, hk=hk, laytyp=0)
+    flopy.modflow.ModflowGmg(mf)
+    flopy.modflow.ModflowLmt(mf, output_file_name=FTL_FILE, output_file_format="formatted")
+
+    _solve_flow(ctx, mf, "horizontal", dict(Lx=Lx, A_W=A_W, ncol=ncol, nrow=nrow, h1=h1, h2=h2, hk=hk), "MODFLOW (horizontal) execution failed.")
+
+    # --- MT3DMS ---
+    t0_mt = "T03_mt"
+    mt = flopy.mt3d.Mt3dms(
+        modelname=t0_mt, exe_name=ctx.executables["mt3dms"],
+        modflowmodel=mf, ftlfilename=FTL_FILE, ftlfree=True,
+        model_ws=str(workdir),
+    )
+
+    icbund, sconc = _horizontal_transport_bc(A_W, Sw, nrow, ncol, gamma, cd, ca)
+    x_grid = np.linspace(0.0, Lx, ncol)
+    y_grid = np.linspace(0.0, A_W, nrow)
+    obs_points, obs_cells = _observation_cells(observation_points, x_grid, y_grid, "y")
+    timprs = _output_times(output_times) if obs_cells else None
+    flopy.mt3d.Mt3dBtn(
+        mt, icbund=icbund, prsity=prsity, sconc=sconc,
+        nprs=0 if timprs is None else len(timprs), timprs=timprs,
+    )
+    flopy.mt3d.Mt3dAdv(mt, mixelm=-1)
+    trpt = alpha_Th / al if al > 0 else 0.1
+    flopy.mt3d.Mt3dDsp(mt, al=al, trpt=trpt)
+    flopy.mt3d.Mt3dGcg(mt)
+    flopy.mt3d.Mt3dSsm(mt)
+
+    mt.write_input()
+    ctx.report("mt3dms")
+    success, buff = ctx.run("mt3dms", mt.namefile)
+    if (not success) and not any("Program completed" in str(line) for line in buff):
+        raise RuntimeError("MT3DMS (horizontal) execution failed.")
+
+    ctx.report("parsing")
+    ucn_path = workdir / "MT3D001.UCN"
+    if not ucn_path.exists():
+        raise RuntimeError("MT3DMS (horizontal) did not produce MT3D001.UCN.")
+
+    conc_slice, obs_times, breakthrough = _read_transport_output(ucn_path, nrow, ncol, obs_cells)
+
+    # Plume geometry from the c0 = 2*ca iso-level
+    c0 = 2.0 * ca
+    plume = extract_plume(conc_slice, x_grid, y_grid, c0, porosity=prsity, gamma=gamma)
 
     return HorizontalModelResult(
-        plume_length=plume_length,
+        plume_length=plume.length,
         concentration=conc_slice,
         x_grid=x_grid,
         y_grid=y_grid,
+        plume_level=c0,
+        plume_width=plume.width,
+        plume_area=plume.area,
+        plume_mass=plume.mass,
+        obs_points=obs_points,
+        obs_times=obs_times,
+        breakthrough=breakthrough,
     )
@@ -0,0 +1,75 @@
+"""
+Static images of numerical model results.
+
+Rendering is kept out of the solves: model results hold arrays and metrics
+only, and these functions are called when a consumer actually asks for an
+image (the legacy ``plot_html`` tag or a PDF report). Matplotlib is imported
+on first use, so batch and API runs never load it. ``Figure`` objects are
+used instead of pyplot so concurrent renders do not share global state.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+
+import numpy as np
+
+
+def new_figure(figsize):
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize)
+
+
+def figure_png(fig, dpi: int = 180) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight", facecolor="white")
+    return buf.getvalue()
+
+
+def contour_png(C, x_grid, v_grid, title, xlabel, ylabel, plume_length, domain_length) -> bytes:
+    """Filled plume image with Lmax and domain-length markers, as used in the PDF reports."""
+    C = np.asarray(C, dtype=float)
+    x_grid = np.asarray(x_grid, dtype=float)
+    v_grid = np.asarray(v_grid, dtype=float)
+    fig = new_figure((9.5, 4.8))
+    ax = fig.add_subplot()
+    im = ax.imshow(
+        np.flipud(C),
+        extent=[float(x_grid.min()), float(x_grid.max()), float(v_grid.min()), float(v_grid.max())],
+        aspect="auto",
+        cmap="RdYlGn_r",
+    )
+    finite = C[np.isfinite(C)]
+    if finite.size and float(np.nanmin(finite)) < float(np.nanmax(finite)):
+        levels = np.linspace(float(np.nanmin(finite)), float(np.nanmax(finite)), 12)
+        ax.contour(x_grid, v_grid, C, levels=levels, colors="black", linewidths=0.45, alpha=0.45)
+    ax.axvline(plume_length, color="#1B3A6B", linestyle="--", linewidth=1.5, label=f"Lmax = {plume_length:.1f} m")
+    ax.axvline(domain_length, color="#6B7280", linestyle=":", linewidth=1.5, label=f"LD = {domain_length:.1f} m")
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(loc="upper right", fontsize=8)
+    fig.colorbar(im, ax=ax, label="Concentration [mg/L]")
+    fig.tight_layout()
+    return figure_png(fig)
+
+
+def plume_html(result) -> str:
+    """300-dpi ``<img>`` tag of the vertical model's plume outline (the c0 iso-line)."""
+    fig = new_figure((11, 5))
+    ax = fig.add_subplot()
+    if np.isfinite(result.plume_level):
+        # Model row 0 is the top of the section.
+        ax.contour(
+            result.x_grid, result.z_grid, np.flipud(result.concentration),
+            levels=[result.plume_level], colors=["#163c66"], linewidths=2.0,
+        )
+    ax.set_xlim(float(result.x_grid[0]), float(result.x_grid[-1]))
+    ax.set_ylim(float(result.z_grid[0]), float(result.z_grid[-1]))
+    ax.set_xlabel("Distance Lx [m]")
+    ax.set_ylabel("Aquifer Thickness [m]")
+    ax.set_title("Contaminant Plume")
+    plot_url = base64.b64encode(figure_png(fig, dpi=300)).decode()
+    return f'<img src="data:image/png;base64,{plot_url}" alt="Numerical plume plot" style="width:100%;height:auto;border-radius:12px;" />'
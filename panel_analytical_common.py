@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
 import panel as pn
 from bokeh.plotting import figure
 
@@ -92,6 +94,38 @@ def error_card(message: str) -> str:
     """
 
 
+def scenario_columns(df: pd.DataFrame, names) -> list:
+    """Scenario table columns for a ``*_lmax_batch`` call; missing columns are 0 and non-numeric cells NaN."""
+    return [pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float) if name in df else 0.0 for name in names]
+
+
+def split_scenarios(result) -> tuple[list[int], list[float], list[tuple[int, str]]]:
+    """
+    Split a batch result into (scenario numbers, plume lengths, failures).
+
+    Scenarios are numbered from 1 in table order; ``failures`` pairs each
+    rejected scenario with its message. Raises only when no scenario is valid.
+    """
+    valid = np.ravel(result.valid)
+    if not valid.any():
+        result.raise_for_errors()
+    rejected = np.flatnonzero(~valid)
+    failures = [(int(i) + 1, str(message)) for i, message in zip(rejected, np.ravel(result.errors)[rejected])]
+    return (np.flatnonzero(valid) + 1).tolist(), np.ravel(result.lmax)[valid].tolist(), failures
+
+
+def failures_card(failures: list[tuple[int, str]]) -> str:
+    if not failures:
+        return ""
+    items = "".join(f"<li>Scenario {number}: {message}</li>" for number, message in failures)
+    return f"""
+    <div style="background:#fff4f4;border:1px solid #f1b7b7;border-radius:14px;padding:16px 18px;box-shadow:0 8px 24px rgba(17,24,39,0.05);">
+      <div style="font-size:0.85rem;font-weight:800;letter-spacing:0.08em;text-transform:uppercase;color:#9f2d2d;margin-bottom:6px;">Skipped scenarios</div>
+      <ul style="margin:0;padding-left:18px;font-size:0.98rem;color:#5f1d1d;">{items}</ul>
+    </div>
+    """
+
+
 def comparison_plot(title: str, manual_label: str, manual_x, manual_y, selected_site_id: int, email: str, manual_axis_label: str):
     p = figure(
         title=title,
@@ -3,8 +3,13 @@ import io
 import pandas as pd
 import panel as pn
 
-from empirical_models import birla_lmax
+from empirical_models import birla_lmax, birla_lmax_batch
+from panel_calibration import calibration_section
 from panel_empirical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str, summary_card
+from panel_empirical_fit import coefficient_fit_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension("tabulator", sizing_mode="stretch_width")
@@ -40,8 +45,17 @@ def birla_single_app():
 
     def _run(_=None):
         try:
-            lmax_current = birla_lmax(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value, w_R.value)
-            result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}")
+            coefficients = fitted_coefficients()
+            if coefficients:
+                result = birla_lmax_batch(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value, w_R.value, coefficients=coefficients)
+                result.raise_for_errors()
+                lmax_current = float(result.lmax)
+                coefficient_text = ", ".join(f"{name} = {value:.4g}" for name, value in coefficients.items())
+                result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}", title="Simulation Result (site-fitted coefficients)")
+            else:
+                lmax_current = birla_lmax(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value, w_R.value)
+                coefficient_text = "published"
+                result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}")
             user_x = [selected_site_id if selected_site_id > 0 else 1]
             plot_pane.object = comparison_plot("Birla et al. (2020)", "Birla model plume length", user_x, [lmax_current], selected_site_id, email, "Run Number")
             _state.update({
@@ -53,7 +67,8 @@ def birla_single_app():
                     {"symbol": "Cd", "name": "Reactant Concentration", "value": w_Cd.value, "unit": "mg/L"},
                     {"symbol": "R", "name": "Recharge Rate", "value": w_R.value, "unit": "m/yr"},
                 ],
-                "outputs": [{"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax_current:.2f}", "unit": "m"}],
+                "outputs": [{"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax_current:.2f}", "unit": "m"},
+                            {"label": "Coefficients", "value": coefficient_text, "unit": ""}],
                 "plot_data": {"labels": ["Lmax"], "values": [lmax_current], "ylabel": "Plume Length (m)", "title": "Maximum Plume Length — Birla et al. (2020)"},
             })
             export_btn.visible = True
@@ -67,4 +82,14 @@ def birla_single_app():
     controls = pn.Column("## Birla et al. - Single Simulation", "### Manual inputs", w_M, w_tv, w_g, w_Ca, w_Cd, w_R, sizing_mode="stretch_width", styles={"flex": "1 1 320px", "min-width": "280px"})
     outputs_col = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs_col, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"M": w_M, "tv": w_tv, "g": w_g, "Ca": w_Ca, "Cd": w_Cd, "R": w_R}
+    surface = response_surface_section(
+        "birla",
+        inputs,
+        default_x="M", default_y="tv",
+    )
+    coefficient_fit, fitted_coefficients = coefficient_fit_section("birla", inputs, email)
+    uncertainty = monte_carlo_section("birla", inputs)
+    sensitivity = sensitivity_section("birla", inputs)
+    calibration = calibration_section("birla", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, coefficient_fit, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
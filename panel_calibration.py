@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import panel as pn
+
+from calibration import CALIBRATION_PARAMETERS, SITE_PARAMETERS, calibrate_sites
+from data_queries import get_user_sites
+from panel_analytical_common import error_card, info_card
+
+
+def calibration_section(model: str, inputs: dict, email: str):
+    """
+    Panel block that calibrates a dispersivity against the user's saved sites.
+
+    ``inputs`` maps model parameter names (as in ``batch_models.MODELS``) to the
+    app's FloatInput widgets. Parameters the ``sites`` table holds are read per
+    site unless overridden; the rest come from the widgets. The calibrated
+    geometric mean can be copied back into the corresponding widget.
+    """
+    parameters = CALIBRATION_PARAMETERS[model]
+    parameter = pn.widgets.Select(name="Calibrate", options=list(parameters), value=parameters[0])
+    use_sites = pn.widgets.Checkbox(name="Use site values for thickness, width and concentrations", value=True)
+    run_btn = pn.widgets.Button(name="Calibrate against my sites", button_type="default", sizing_mode="stretch_width")
+    apply_btn = pn.widgets.Button(name="Use calibrated value", button_type="default", sizing_mode="stretch_width", disabled=True)
+
+    status_pane = pn.pane.HTML(
+        info_card("Solve for the dispersivity that reproduces the observed plume length at each saved site."),
+        sizing_mode="stretch_width",
+    )
+    table = pn.widgets.Tabulator(pd.DataFrame(), height=240, sizing_mode="stretch_width", visible=False, disabled=True, show_index=False)
+
+    _state: dict = {}
+
+    def _run(_=None):
+        apply_btn.disabled = True
+        try:
+            rows = get_user_sites(email)
+            if not rows:
+                raise ValueError("No saved sites found for this account.")
+            fixed = {
+                name: float(widget.value)
+                for name, widget in inputs.items()
+                if name != parameter.value and not (use_sites.value and name in SITE_PARAMETERS)
+            }
+            result = calibrate_sites(model, rows, fixed, parameter.value)
+
+            site_ids = [row[0] for row in rows]
+            table.value = pd.DataFrame({
+                "site_id": site_ids,
+                "observed_length_m": result.observed,
+                parameter.value: np.where(result.valid, result.values, np.nan),
+                "predicted_length_m": result.predicted,
+                "note": np.where(result.valid, "", result.errors),
+            }).round(4)
+            table.visible = True
+
+            stats = result.stats
+            rejected = len(rows) - stats["n_sites"]
+            note = f" {rejected:,} sites could not be calibrated." if rejected else ""
+            status_pane.object = info_card(
+                f"{parameter.value} = {result.representative:.4g} (geometric mean of {stats['n_sites']:,} sites; "
+                f"P10 {stats['p10']:.4g}, P90 {stats['p90']:.4g}). "
+                f"Lmax with this value: RMSE {stats['rmse']:.1f} m, bias {stats['bias']:.1f} m.{note}"
+            )
+            _state.update({"parameter": parameter.value, "value": result.representative})
+            apply_btn.disabled = parameter.value not in inputs
+        except Exception as exc:
+            status_pane.object = error_card(str(exc))
+            table.visible = False
+
+    def _apply(_=None):
+        if _state:
+            inputs[_state["parameter"]].value = round(_state["value"], 6)
+
+    run_btn.on_click(_run)
+    apply_btn.on_click(_apply)
+
+    controls = pn.Row(parameter, use_sites, sizing_mode="stretch_width")
+    return pn.Column(
+        "### Calibrate against site data",
+        controls,
+        pn.Row(run_btn, apply_btn, sizing_mode="stretch_width"),
+        status_pane,
+        table,
+        sizing_mode="stretch_width",
+        styles={"gap": "10px"},
+    )
@@ -3,8 +3,15 @@ import io
 import pandas as pd
 import panel as pn
 
-from analytical_models import chu_lmax, compute_chu_multiple
-from panel_analytical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str, summary_card
+from analytical_models import chu_lmax, chu_lmax_batch
+from panel_analytical_common import (
+    comparison_plot, error_card, failures_card, info_card, metric_card, query_float, query_int, query_str,
+    scenario_columns, split_scenarios, summary_card,
+)
+from panel_calibration import calibration_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension("tabulator", sizing_mode="stretch_width")
@@ -71,7 +78,16 @@ def chu_single_app():
     )
     outputs_col = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs_col, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"W": w, "alpha_Th": alpha_th, "gamma": gamma, "C_EA0": c_ea0, "C_ED0": c_ed0, "epsilon": epsilon}
+    surface = response_surface_section(
+        "chu",
+        inputs,
+        default_x="W", default_y="alpha_Th",
+    )
+    uncertainty = monte_carlo_section("chu", inputs)
+    sensitivity = sensitivity_section("chu", inputs)
+    calibration = calibration_section("chu", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
 
 
 def chu_multiple_app():
@@ -109,18 +125,20 @@ def chu_multiple_app():
                 df = pd.DataFrame(df)
             if df.empty:
                 raise ValueError("No scenarios available.")
-            entries = [[float(row.get(k, 0)) for k in ("W", "alpha_Th", "gamma", "C_EA0", "C_ED0", "epsilon")] for _, row in df.iterrows()]
-            l_vals = compute_chu_multiple(entries)
-            result_pane.object = summary_card([("Successful runs", str(len(l_vals))), ("Max plume length", f"{max(l_vals):.2f} m")])
-            plot_pane.object = comparison_plot("Chu et al.", "Chu model plume length", list(range(1, len(l_vals) + 1)), l_vals, selected_site_id, email, "Scenario Number")
+            result = chu_lmax_batch(*scenario_columns(df, ("W", "alpha_Th", "gamma", "C_EA0", "C_ED0", "epsilon")))
+            scenarios, l_vals, failures = split_scenarios(result)
+            result_pane.object = summary_card([("Successful runs", str(len(l_vals))), ("Skipped", str(len(failures))), ("Max plume length", f"{max(l_vals):.2f} m")]) + failures_card(failures)
+            plot_pane.object = comparison_plot("Chu et al.", "Chu model plume length", scenarios, l_vals, selected_site_id, email, "Scenario Number")
             _state.update({
-                "parameters": [{"symbol": f"Sc.{i+1}", "name": f"Scenario {i+1}", "value": f"L={v:.2f}", "unit": "m"} for i, v in enumerate(l_vals)],
+                "parameters": [{"symbol": f"Sc.{n}", "name": f"Scenario {n}", "value": f"L={v:.2f}", "unit": "m"} for n, v in zip(scenarios, l_vals)]
+                + [{"symbol": f"Sc.{n}", "name": f"Scenario {n} (skipped)", "value": message, "unit": ""} for n, message in failures],
                 "outputs": [
                     {"label": "Scenarios run", "value": str(len(l_vals)), "unit": ""},
+                    {"label": "Scenarios skipped", "value": str(len(failures)), "unit": ""},
                     {"label": "Max plume length", "value": f"{max(l_vals):.2f}", "unit": "m"},
                     {"label": "Min plume length", "value": f"{min(l_vals):.2f}", "unit": "m"},
                 ],
-                "plot_data": {"labels": [f"Sc.{i+1}" for i in range(len(l_vals))], "values": l_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Chu et al."},
+                "plot_data": {"labels": [f"Sc.{n}" for n in scenarios], "values": l_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Chu et al."},
             })
             export_btn.visible = True
         except Exception as exc:
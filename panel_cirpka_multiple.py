@@ -3,9 +3,10 @@ import io
 import pandas as pd
 import panel as pn
 
-from analytical_models import compute_cirpka_multiple
+from analytical_models import cirpka_lmax_batch
 from panel_analytical_common import (
-    comparison_plot, error_card, info_card, query_float, query_int, query_str, summary_card,
+    comparison_plot, error_card, failures_card, info_card, query_float, query_int, query_str, scenario_columns,
+    split_scenarios, summary_card,
 )
 from pdf_report import CASTReport
 
@@ -53,45 +54,37 @@ def cirpka_multiple_app():
             if df.empty:
                 raise ValueError("No scenarios available.")
 
-            entries = [
-                [
-                    float(row.get("Sw", 0.0)),
-                    float(row.get("alpha_Th", 0.0)),
-                    float(row.get("gamma", 0.0)),
-                    float(row.get("C_A", 0.0)),
-                    float(row.get("C_D", 0.0)),
-                ]
-                for _, row in df.iterrows()
-            ]
-
-            results = compute_cirpka_multiple(entries)
-            lmax_vals = [r["Lmax"] for r in results]
+            result = cirpka_lmax_batch(*scenario_columns(df, ("Sw", "alpha_Th", "gamma", "C_A", "C_D")))
+            scenarios, lmax_vals, failures = split_scenarios(result)
 
             result_pane.object = summary_card(
                 [
                     ("Successful runs", str(len(lmax_vals))),
+                    ("Skipped", str(len(failures))),
                     ("Max plume length", f"{max(lmax_vals):.2f} m"),
                     ("Min plume length", f"{min(lmax_vals):.2f} m"),
                 ],
                 title="Cirpka et al. (2005) Summary",
-            )
+            ) + failures_card(failures)
             plot_pane.object = comparison_plot(
                 "Cirpka et al. (2005)",
                 "Cirpka L\u2098\u2090\u2093",
-                list(range(1, len(lmax_vals) + 1)),
+                scenarios,
                 lmax_vals,
                 selected_site_id,
                 email,
                 "Scenario Number",
             )
             _state.update({
-                "parameters": [{"symbol": f"Sc.{i+1}", "name": f"Scenario {i+1}", "value": f"L={v:.2f}", "unit": "m"} for i, v in enumerate(lmax_vals)],
+                "parameters": [{"symbol": f"Sc.{n}", "name": f"Scenario {n}", "value": f"L={v:.2f}", "unit": "m"} for n, v in zip(scenarios, lmax_vals)]
+                + [{"symbol": f"Sc.{n}", "name": f"Scenario {n} (skipped)", "value": message, "unit": ""} for n, message in failures],
                 "outputs": [
                     {"label": "Scenarios run", "value": str(len(lmax_vals)), "unit": ""},
+                    {"label": "Scenarios skipped", "value": str(len(failures)), "unit": ""},
                     {"label": "Max plume length", "value": f"{max(lmax_vals):.2f}", "unit": "m"},
                     {"label": "Min plume length", "value": f"{min(lmax_vals):.2f}", "unit": "m"},
                 ],
-                "plot_data": {"labels": [f"Sc.{i+1}" for i in range(len(lmax_vals))], "values": lmax_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Cirpka et al. (2005)"},
+                "plot_data": {"labels": [f"Sc.{n}" for n in scenarios], "values": lmax_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Cirpka et al. (2005)"},
             })
             export_btn.visible = True
         except Exception as exc:
@@ -7,6 +7,10 @@ from panel_analytical_common import (
     comparison_plot, error_card, info_card, metric_card, summary_card,
     query_float, query_int, query_str,
 )
+from panel_calibration import calibration_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension(sizing_mode="stretch_width")
@@ -106,4 +110,13 @@ def cirpka_single_app():
         styles={"flex": "2 1 540px", "min-width": "340px"},
     )
     body = pn.FlexBox(controls, outputs, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"Sw": sw, "alpha_Th": alpha_th, "gamma": gamma, "C_A": ca, "C_D": cd}
+    surface = response_surface_section(
+        "cirpka",
+        inputs,
+        default_x="Sw", default_y="alpha_Th",
+    )
+    uncertainty = monte_carlo_section("cirpka", inputs)
+    sensitivity = sensitivity_section("cirpka", inputs)
+    calibration = calibration_section("cirpka", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pandas as pd
+import panel as pn
+
+from calibration import SITE_PARAMETERS
+from data_queries import get_user_sites
+from empirical_fit import EMPIRICAL_MODELS, fit_user_sites
+from panel_empirical_common import error_card, info_card
+
+
+def coefficient_fit_section(model: str, inputs: dict, email: str):
+    """
+    Panel block that refits the empirical coefficients to the user's saved sites.
+
+    ``inputs`` maps model input names to the app's FloatInput widgets; inputs
+    the ``sites`` table does not hold (tv, g, R) are taken from them. Returns
+    ``(section, coefficients)`` where ``coefficients()`` gives the fitted
+    coefficients while "Use fitted coefficients" is ticked, otherwise ``None``.
+    """
+    defaults = EMPIRICAL_MODELS[model][2]
+    fit_btn = pn.widgets.Button(name="Fit coefficients to my sites", button_type="default", sizing_mode="stretch_width")
+    use_fit = pn.widgets.Checkbox(name="Use fitted coefficients", value=False, disabled=True)
+
+    published = ", ".join(f"{name} = {value:g}" for name, value in defaults.items())
+    status_pane = pn.pane.HTML(info_card(f"Published coefficients: {published}."), sizing_mode="stretch_width")
+    table = pn.widgets.Tabulator(pd.DataFrame(), height=160, sizing_mode="stretch_width", visible=False, disabled=True, show_index=False)
+
+    _state: dict = {}
+
+    def _fit(_=None):
+        try:
+            rows = get_user_sites(email)
+            if not rows:
+                raise ValueError("No saved sites found for this account.")
+            fixed = {name: float(widget.value) for name, widget in inputs.items() if name not in SITE_PARAMETERS}
+            fit = fit_user_sites(model, email, rows, fixed)
+            table.value = fit.as_table().round(4)
+            table.visible = True
+            warning = "" if fit.converged else " The fit did not converge; check the site data."
+            status_pane.object = info_card(
+                f"Fitted {', '.join(fit.fitted)} to {fit.n_sites:,} sites "
+                f"(log RMSE {fit.rmse_log:.3f}, log R\u00b2 {fit.r2_log:.3f}).{warning}"
+            )
+            _state.update({"coefficients": fit.coefficients, "n_sites": fit.n_sites})
+            use_fit.disabled = False
+        except Exception as exc:
+            status_pane.object = error_card(str(exc))
+            table.visible = False
+            _state.clear()
+            use_fit.value = False
+            use_fit.disabled = True
+
+    def coefficients() -> dict | None:
+        return _state["coefficients"] if use_fit.value and _state else None
+
+    fit_btn.on_click(_fit)
+
+    section = pn.Column(
+        "### Site-fitted coefficients",
+        pn.Row(fit_btn, use_fit, sizing_mode="stretch_width"),
+        status_pane,
+        table,
+        sizing_mode="stretch_width",
+        styles={"gap": "10px"},
+    )
+    return section, coefficients
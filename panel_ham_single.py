@@ -4,6 +4,9 @@ import panel as pn
 
 from analytical_models import ham_lmax
 from panel_analytical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension(sizing_mode="stretch_width")
@@ -64,4 +67,12 @@ def ham_single_app():
     controls = pn.Column("## Ham et al. - Single Simulation", "### Manual inputs", q, alpha_t, gamma, c_ea0, c_ed0, sizing_mode="stretch_width", styles={"flex": "1 1 320px", "min-width": "280px"})
     outputs_col = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs_col, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"Q": q, "alpha_T": alpha_t, "gamma": gamma, "C_EA0": c_ea0, "C_ED0": c_ed0}
+    surface = response_surface_section(
+        "ham",
+        inputs,
+        default_x="Q", default_y="alpha_T",
+    )
+    uncertainty = monte_carlo_section("ham", inputs)
+    sensitivity = sensitivity_section("ham", inputs)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
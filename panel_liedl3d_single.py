@@ -3,7 +3,12 @@ import io
 import panel as pn
 
 from analytical_models import liedl3d_lmax
+from liedl3d_table import table_loaded
 from panel_analytical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str
+from panel_calibration import calibration_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension(sizing_mode="stretch_width")
@@ -41,7 +46,7 @@ def liedl3d_single_app():
 
     def _run(_=None):
         try:
-            lmax = liedl3d_lmax(m.value, alpha_th.value, alpha_tv.value, w.value, cthres.value, c_ea0.value, c_ed0.value, gamma.value)
+            lmax = liedl3d_lmax(m.value, alpha_th.value, alpha_tv.value, w.value, cthres.value, c_ea0.value, c_ed0.value, gamma.value, use_table=table_loaded())
             result_pane.object = metric_card("Plume length", f"{lmax:.2f}")
             user_x = [selected_site_id if selected_site_id > 0 else 1]
             plot_pane.object = comparison_plot("Liedl 3D", "Liedl 3D model plume length", user_x, [lmax], selected_site_id, email, "Run Number")
@@ -74,4 +79,16 @@ def liedl3d_single_app():
     )
     outputs_col = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs_col, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {
+        "M": m, "alpha_Th": alpha_th, "alpha_Tv": alpha_tv, "W": w,
+        "Cthres": cthres, "C_EA0": c_ea0, "C_ED0": c_ed0, "gamma": gamma,
+    }
+    surface = response_surface_section(
+        "liedl3d",
+        inputs,
+        default_x="alpha_Th", default_y="alpha_Tv",
+    )
+    uncertainty = monte_carlo_section("liedl3d", inputs)
+    sensitivity = sensitivity_section("liedl3d", inputs)
+    calibration = calibration_section("liedl3d", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
@@ -3,8 +3,11 @@ import io
 import pandas as pd
 import panel as pn
 
-from analytical_models import compute_liedl_multiple
-from panel_analytical_common import comparison_plot, error_card, info_card, query_float, query_int, query_str, summary_card
+from analytical_models import liedl_lmax_batch
+from panel_analytical_common import (
+    comparison_plot, error_card, failures_card, info_card, query_float, query_int, query_str, scenario_columns,
+    split_scenarios, summary_card,
+)
 from pdf_report import CASTReport
 
 pn.extension("tabulator", sizing_mode="stretch_width")
@@ -45,18 +48,20 @@ def liedl_multiple_app():
                 df = pd.DataFrame(df)
             if df.empty:
                 raise ValueError("No scenarios available.")
-            entries = [[float(row.get(k, 0)) for k in ("M", "alpha_Tv", "gamma", "C_EA0", "C_ED0")] for _, row in df.iterrows()]
-            l_vals = compute_liedl_multiple(entries)
-            result_pane.object = summary_card([("Successful runs", str(len(l_vals))), ("Max plume length", f"{max(l_vals):.2f} m")])
-            plot_pane.object = comparison_plot("Liedl et al. (2005)", "Liedl model plume length", list(range(1, len(l_vals) + 1)), l_vals, selected_site_id, email, "Scenario Number")
+            result = liedl_lmax_batch(*scenario_columns(df, ("M", "alpha_Tv", "gamma", "C_EA0", "C_ED0")))
+            scenarios, l_vals, failures = split_scenarios(result)
+            result_pane.object = summary_card([("Successful runs", str(len(l_vals))), ("Skipped", str(len(failures))), ("Max plume length", f"{max(l_vals):.2f} m")]) + failures_card(failures)
+            plot_pane.object = comparison_plot("Liedl et al. (2005)", "Liedl model plume length", scenarios, l_vals, selected_site_id, email, "Scenario Number")
             _state.update({
-                "parameters": [{"symbol": f"Sc.{i+1}", "name": f"Scenario {i+1}", "value": f"L={v:.2f}", "unit": "m"} for i, v in enumerate(l_vals)],
+                "parameters": [{"symbol": f"Sc.{n}", "name": f"Scenario {n}", "value": f"L={v:.2f}", "unit": "m"} for n, v in zip(scenarios, l_vals)]
+                + [{"symbol": f"Sc.{n}", "name": f"Scenario {n} (skipped)", "value": message, "unit": ""} for n, message in failures],
                 "outputs": [
                     {"label": "Scenarios run", "value": str(len(l_vals)), "unit": ""},
+                    {"label": "Scenarios skipped", "value": str(len(failures)), "unit": ""},
                     {"label": "Max plume length", "value": f"{max(l_vals):.2f}", "unit": "m"},
                     {"label": "Min plume length", "value": f"{min(l_vals):.2f}", "unit": "m"},
                 ],
-                "plot_data": {"labels": [f"Sc.{i+1}" for i in range(len(l_vals))], "values": l_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Liedl et al. (2005)"},
+                "plot_data": {"labels": [f"Sc.{n}" for n in scenarios], "values": l_vals, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Liedl et al. (2005)"},
             })
             export_btn.visible = True
         except Exception as exc:
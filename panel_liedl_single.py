@@ -4,6 +4,10 @@ import panel as pn
 
 from analytical_models import liedl_lmax
 from panel_analytical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str
+from panel_calibration import calibration_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension(sizing_mode="stretch_width")
@@ -72,4 +76,13 @@ def liedl_single_app():
     )
     outputs = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"M": m, "alpha_Tv": alpha_tv, "gamma": gamma, "C_EA0": c_ea0, "C_ED0": c_ed0}
+    surface = response_surface_section(
+        "liedl",
+        inputs,
+        default_x="M", default_y="alpha_Tv",
+    )
+    uncertainty = monte_carlo_section("liedl", inputs)
+    sensitivity = sensitivity_section("liedl", inputs)
+    calibration = calibration_section("liedl", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
@@ -3,7 +3,8 @@ import io
 import pandas as pd
 import panel as pn
 
-from empirical_models import maier_lmax
+from empirical_models import maier_lmax_batch
+from panel_analytical_common import failures_card, scenario_columns, split_scenarios
 from panel_empirical_common import comparison_plot, error_card, info_card, query_float, query_int, query_str, summary_card
 from pdf_report import CASTReport
 
@@ -45,17 +46,20 @@ def maier_multiple_app():
                 df = pd.DataFrame(df)
             if df.empty:
                 raise ValueError("No scenarios available.")
-            lengths = [maier_lmax(float(row.get("M", 0)), float(row.get("tv", 0)), float(row.get("g", 0)), float(row.get("Ca", 0)), float(row.get("Cd", 0))) for _, row in df.iterrows()]
-            result_pane.object = summary_card([("Successful runs", str(len(lengths))), ("Max plume length", f"{max(lengths):.2f} m")])
-            plot_pane.object = comparison_plot("Maier and Grathwohl (2005)", "Maier model plume length", list(range(1, len(lengths) + 1)), lengths, selected_site_id, email, "Scenario Number")
+            result = maier_lmax_batch(*scenario_columns(df, ("M", "tv", "g", "Ca", "Cd")))
+            scenarios, lengths, failures = split_scenarios(result)
+            result_pane.object = summary_card([("Successful runs", str(len(lengths))), ("Skipped", str(len(failures))), ("Max plume length", f"{max(lengths):.2f} m")]) + failures_card(failures)
+            plot_pane.object = comparison_plot("Maier and Grathwohl (2005)", "Maier model plume length", scenarios, lengths, selected_site_id, email, "Scenario Number")
             _state.update({
-                "parameters": [{"symbol": f"Sc.{i+1}", "name": f"Scenario {i+1}", "value": f"L={v:.2f}", "unit": "m"} for i, v in enumerate(lengths)],
+                "parameters": [{"symbol": f"Sc.{n}", "name": f"Scenario {n}", "value": f"L={v:.2f}", "unit": "m"} for n, v in zip(scenarios, lengths)]
+                + [{"symbol": f"Sc.{n}", "name": f"Scenario {n} (skipped)", "value": message, "unit": ""} for n, message in failures],
                 "outputs": [
                     {"label": "Scenarios run", "value": str(len(lengths)), "unit": ""},
+                    {"label": "Scenarios skipped", "value": str(len(failures)), "unit": ""},
                     {"label": "Max plume length", "value": f"{max(lengths):.2f}", "unit": "m"},
                     {"label": "Min plume length", "value": f"{min(lengths):.2f}", "unit": "m"},
                 ],
-                "plot_data": {"labels": [f"Sc.{i+1}" for i in range(len(lengths))], "values": lengths, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Maier & Grathwohl"},
+                "plot_data": {"labels": [f"Sc.{n}" for n in scenarios], "values": lengths, "ylabel": "Plume Length (m)", "title": "Scenario Comparison — Maier & Grathwohl"},
             })
             export_btn.visible = True
         except Exception as exc:
@@ -2,8 +2,13 @@ import io
 
 import panel as pn
 
-from empirical_models import maier_lmax
+from empirical_models import maier_lmax, maier_lmax_batch
+from panel_calibration import calibration_section
 from panel_empirical_common import comparison_plot, error_card, info_card, metric_card, query_float, query_int, query_str
+from panel_empirical_fit import coefficient_fit_section
+from panel_monte_carlo import monte_carlo_section
+from panel_response_surface import response_surface_section
+from panel_sensitivity import sensitivity_section
 from pdf_report import CASTReport
 
 pn.extension(sizing_mode="stretch_width")
@@ -38,8 +43,17 @@ def maier_single_app():
 
     def _run(_=None):
         try:
-            lmax_current = maier_lmax(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value)
-            result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}")
+            coefficients = fitted_coefficients()
+            if coefficients:
+                result = maier_lmax_batch(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value, coefficients=coefficients)
+                result.raise_for_errors()
+                lmax_current = float(result.lmax)
+                coefficient_text = ", ".join(f"{name} = {value:.4g}" for name, value in coefficients.items())
+                result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}", title="Simulation Result (site-fitted coefficients)")
+            else:
+                lmax_current = maier_lmax(w_M.value, w_tv.value, w_g.value, w_Ca.value, w_Cd.value)
+                coefficient_text = "published"
+                result_pane.object = metric_card("Plume length", f"{lmax_current:.2f}")
             user_x = [selected_site_id if selected_site_id > 0 else 1]
             plot_pane.object = comparison_plot("Maier and Grathwohl (2005)", "Maier model plume length", user_x, [lmax_current], selected_site_id, email, "Run Number")
             _state.update({
@@ -50,7 +64,8 @@ def maier_single_app():
                     {"symbol": "Ca", "name": "Contaminant Concentration", "value": w_Ca.value, "unit": "mg/L"},
                     {"symbol": "Cd", "name": "Reactant Concentration", "value": w_Cd.value, "unit": "mg/L"},
                 ],
-                "outputs": [{"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax_current:.2f}", "unit": "m"}],
+                "outputs": [{"label": "Maximum Plume Length L\u2098\u2090\u2093", "value": f"{lmax_current:.2f}", "unit": "m"},
+                            {"label": "Coefficients", "value": coefficient_text, "unit": ""}],
                 "plot_data": {"labels": ["Lmax"], "values": [lmax_current], "ylabel": "Plume Length (m)", "title": "Maximum Plume Length — Maier & Grathwohl"},
             })
             export_btn.visible = True
@@ -64,4 +79,14 @@ def maier_single_app():
     controls = pn.Column("## Maier & Grathwohl - Single Simulation", "### Manual inputs", w_M, w_tv, w_g, w_Ca, w_Cd, sizing_mode="stretch_width", styles={"flex": "1 1 320px", "min-width": "280px"})
     outputs_col = pn.Column(plot_pane, sizing_mode="stretch_both", styles={"flex": "2 1 540px", "min-width": "340px"})
     body = pn.FlexBox(controls, outputs_col, sizing_mode="stretch_both", flex_wrap="wrap", styles={"gap": "16px"})
-    return pn.Column(run_btn, result_pane, body, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
+    inputs = {"M": w_M, "tv": w_tv, "g": w_g, "Ca": w_Ca, "Cd": w_Cd}
+    surface = response_surface_section(
+        "maier",
+        inputs,
+        default_x="M", default_y="tv",
+    )
+    coefficient_fit, fitted_coefficients = coefficient_fit_section("maier", inputs, email)
+    uncertainty = monte_carlo_section("maier", inputs)
+    sensitivity = sensitivity_section("maier", inputs)
+    calibration = calibration_section("maier", inputs, email)
+    return pn.Column(run_btn, result_pane, body, surface, uncertainty, sensitivity, calibration, coefficient_fit, export_btn, sizing_mode="stretch_both", styles={"gap": "14px"})
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import panel as pn
+
+from batch_models import get_model
+from monte_carlo import Distribution, run_monte_carlo
+from panel_analytical_common import error_card, info_card
+from pdf_report import CASTReport
+from plot_functions import plot_monte_carlo_histogram
+
+
+def _distribution(value: float, family: str, spread: float) -> Distribution:
+    """``family`` distribution centred on ``value``; ``spread`` is a fraction of it."""
+    if value == 0 or spread == 0:
+        return Distribution.fixed(value)
+    if family == "uniform":
+        low, high = sorted((value * (1 - spread), value * (1 + spread)))
+        return Distribution("uniform", a=low, b=high)
+    if family == "normal":
+        return Distribution("normal", a=value, b=abs(value) * spread)
+    if value < 0:
+        raise ValueError("Lognormal distributions need positive parameter values.")
+    # Median at the current value; spread is the standard deviation of ln(x).
+    return Distribution("lognormal", a=float(np.log(value)), b=spread, lower=0.0)
+
+
+def monte_carlo_section(model: str, inputs: dict):
+    """
+    Panel block that propagates input uncertainty to an Lmax distribution.
+
+    ``inputs`` maps model parameter names (as in ``batch_models.MODELS``) to the
+    app's FloatInput widgets; the selected parameters are sampled around their
+    current values and the rest stay fixed.
+    """
+    label = get_model(model).label
+    names = list(inputs)
+    vary = pn.widgets.MultiChoice(name="Uncertain parameters", options=names, value=names)
+    family = pn.widgets.Select(name="Distribution", options=["lognormal", "normal", "uniform"], value="lognormal")
+    spread = pn.widgets.FloatInput(name="Spread [% of current value]", value=25.0, step=5.0, start=0.0, end=99.0)
+    n_samples = pn.widgets.IntInput(name="Samples", value=100_000, step=10_000, start=1_000, end=2_000_000)
+    exceed = pn.widgets.FloatInput(name="Exceedance length [m] (optional)", value=0.0, step=10.0, start=0.0)
+    run_btn = pn.widgets.Button(name="Run Monte Carlo", button_type="default", sizing_mode="stretch_width")
+
+    status_pane = pn.pane.HTML(
+        info_card("Choose the uncertain parameters and sample the Lmax distribution around the current inputs."),
+        sizing_mode="stretch_width",
+    )
+    histogram_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=410)
+
+    _state: dict = {}
+
+    def _pdf_callback():
+        if not _state:
+            return io.BytesIO(b"")
+        report = CASTReport(f"{label} \u2014 Monte Carlo Uncertainty", label)
+        return io.BytesIO(report.generate(_state["parameters"], _state["outputs"], _state["plot_data"]))
+
+    export_btn = pn.widgets.FileDownload(
+        callback=_pdf_callback, filename=f"{model}_monte_carlo_report.pdf",
+        label="\u2193 Download Monte Carlo Report", button_type="default",
+        sizing_mode="stretch_width", visible=False,
+    )
+
+    def _run(_=None):
+        try:
+            fraction = spread.value / 100.0
+            distributions = {
+                name: _distribution(float(widget.value), family.value, fraction) if name in vary.value else float(widget.value)
+                for name, widget in inputs.items()
+            }
+            lengths = (float(exceed.value),) if exceed.value and exceed.value > 0 else ()
+            result = run_monte_carlo(model, distributions, n_samples=int(n_samples.value), exceedance_lengths=lengths)
+            if not result.n_valid:
+                raise ValueError("No sample produced a valid plume length.")
+            histogram_pane.object = plot_monte_carlo_histogram(result)
+
+            summary = ", ".join(f"P{p:g} {value:.2f} m" for p, value in result.percentiles.items())
+            exceedance = "".join(f" P(Lmax &gt; {length:g} m) = {prob:.3f}." for length, prob in result.exceedance.items())
+            rejected = result.n_samples - result.n_valid
+            note = f" {rejected:,} samples were outside the model's valid range." if rejected else ""
+            status_pane.object = info_card(
+                f"Mean {result.mean:.2f} m, std {result.std:.2f} m; {summary}.{exceedance}{note}"
+            )
+            _state.update({
+                "parameters": [
+                    {
+                        "symbol": name,
+                        "name": f"{family.value}, \u00b1{spread.value:g} %" if name in vary.value else "fixed",
+                        "value": widget.value,
+                        "unit": "",
+                    }
+                    for name, widget in inputs.items()
+                ],
+                "outputs": result.report_outputs(),
+                "plot_data": {
+                    "labels": [f"P{p:g}" for p in result.percentiles],
+                    "values": list(result.percentiles.values()),
+                    "ylabel": "Plume Length (m)",
+                    "title": f"Monte Carlo L_max Percentiles \u2014 {label}",
+                },
+            })
+            export_btn.visible = True
+        except Exception as exc:
+            status_pane.object = error_card(str(exc))
+            histogram_pane.object = None
+            export_btn.visible = False
+
+    run_btn.on_click(_run)
+
+    controls = pn.Row(family, spread, n_samples, exceed, sizing_mode="stretch_width")
+    return pn.Column(
+        "### Monte Carlo uncertainty",
+        vary,
+        controls,
+        run_btn,
+        status_pane,
+        histogram_pane,
+        export_btn,
+        sizing_mode="stretch_width",
+        styles={"gap": "10px"},
+    )
@@ -1,16 +1,18 @@
+import asyncio
 import io
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import panel as pn
 
-from analytical_models import cirpka_lmax as _cirpka_lmax, cirpka_domain_length, liedl_lmax
+from analytical_models import liedl_lmax_batch
+from calibration import site_columns
 from data_queries import get_user_sites
-from numerical_models import run_numerical_model, run_numerical_model_horizontal
+from numerical_jobs import NUMERICAL_JOBS, describe, wait_for_job
+from numerical_models import ENGINE_LABELS
+from numerical_plots import contour_png, figure_png, new_figure
 from pdf_report import CASTReport
+from settings import NUMERICAL_SCENARIO_WORKERS
 from plot_functions import (
     plot_horizontal_plume_interactive,
     plot_lmax_scatter,
@@ -19,6 +21,8 @@ from plot_functions import (
 
 pn.extension("tabulator", sizing_mode="stretch_width")
 
+_RESULT_COLUMNS = ("analytical_lmax_m", "cirpka_lmax_m", "v_plume_m", "h_plume_m", "status")
+
 
 def _query_float(name, default):
     try:
@@ -45,41 +49,26 @@ def _query_str(name, default=""):
         return default
 
 
-def _safe_float(value):
-    try:
-        if value is None:
-            return None
-        value = float(value)
-        if not np.isfinite(value):
-            return None
-        return value
-    except Exception:
-        return None
-
-
 def _database_lmax_points(email, alpha_tv, gamma, selected_site_id=0):
     try:
         rows = get_user_sites(email)
     except Exception:
         return [], [], None
 
-    analytical, observed, selected = [], [], None
-    for row in rows:
-        site_id = int(row[0])
-        M = _safe_float(row[3])
-        plume_length = _safe_float(row[4])
-        C_ED0 = _safe_float(row[7])
-        C_EA0 = _safe_float(row[8])
-        if None in {M, plume_length, C_ED0, C_EA0}:
-            continue
-        try:
-            model_lmax = liedl_lmax(M, alpha_tv, gamma, C_EA0, C_ED0)
-        except Exception:
-            continue
-        analytical.append(model_lmax)
-        observed.append(plume_length)
-        if selected_site_id and site_id == selected_site_id:
-            selected = {"analytical_lmax": model_lmax, "plume_length": plume_length}
+    sites = site_columns(rows)
+    result = liedl_lmax_batch(
+        sites["aquifer_thickness"], alpha_tv, gamma, sites["electron_acceptor_o2"], sites["electron_donor"]
+    )
+    keep = result.valid & np.isfinite(sites["plume_length"])
+    analytical = result.lmax[keep].tolist()
+    observed = sites["plume_length"][keep].tolist()
+
+    selected = None
+    if selected_site_id:
+        match = np.flatnonzero(keep & (sites["site_id"] == selected_site_id))
+        if match.size:
+            i = int(match[0])
+            selected = {"analytical_lmax": float(result.lmax[i]), "plume_length": float(sites["plume_length"][i])}
     return analytical, observed, selected
 
 
@@ -108,42 +97,9 @@ def _clean_numeric(values):
     return out
 
 
-def _figure_bytes(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=180, bbox_inches="tight", facecolor="white")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
-
-
-def _contour_image_bytes(C, x_grid, y_grid, title, xlabel, ylabel, plume_length, domain_length):
-    C = np.asarray(C, dtype=float)
-    x_grid = np.asarray(x_grid, dtype=float)
-    y_grid = np.asarray(y_grid, dtype=float)
-    fig, ax = plt.subplots(figsize=(9.5, 4.8), dpi=180)
-    im = ax.imshow(
-        np.flipud(C),
-        extent=[float(x_grid.min()), float(x_grid.max()), float(y_grid.min()), float(y_grid.max())],
-        aspect="auto",
-        cmap="RdYlGn_r",
-    )
-    finite = C[np.isfinite(C)]
-    if finite.size and float(np.nanmin(finite)) < float(np.nanmax(finite)):
-        levels = np.linspace(float(np.nanmin(finite)), float(np.nanmax(finite)), 12)
-        ax.contour(x_grid, y_grid, C, levels=levels, colors="black", linewidths=0.45, alpha=0.45)
-    ax.axvline(plume_length, color="#1B3A6B", linestyle="--", linewidth=1.5, label=f"Lmax = {plume_length:.1f} m")
-    ax.axvline(domain_length, color="#6B7280", linestyle=":", linewidth=1.5, label=f"LD = {domain_length:.1f} m")
-    ax.set_title(title)
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.legend(loc="upper right", fontsize=8)
-    fig.colorbar(im, ax=ax, label="Concentration [mg/L]")
-    fig.tight_layout()
-    return _figure_bytes(fig)
-
-
 def _scatter_image_bytes(db_analytical, db_plumes, numerical_runs, selected_site=None):
-    fig, ax = plt.subplots(figsize=(8.5, 5.2), dpi=180)
+    fig = new_figure((8.5, 5.2))
+    ax = fig.add_subplot()
     clean_x = _clean_numeric(db_analytical)
     clean_y = _clean_numeric(db_plumes)
     if clean_x and clean_y:
@@ -166,89 +122,7 @@ def _scatter_image_bytes(db_analytical, db_plumes, numerical_runs, selected_site
     ax.grid(True, alpha=0.25)
     ax.legend(loc="upper left", fontsize=8)
     fig.tight_layout()
-    return _figure_bytes(fig)
-
-
-def _run_row(row):
-    S_T      = float(row.get("S_T",      1.0))
-    R_Ta     = float(row.get("R_Ta",     2.0))
-    R_Tb     = float(row.get("R_Tb",     2.0))
-    delta_x  = float(row.get("delta_x",  1.0))
-    delta_z  = float(row.get("delta_z",  0.25))
-    prsity   = float(row.get("prsity",   0.3))
-    al       = float(row.get("al",       5.0))
-    av       = float(row.get("av",       0.5))
-    gamma    = float(row.get("gamma",    3.5))
-    Cd       = float(row.get("Cd",       5.0))
-    Ca       = float(row.get("Ca",       8.0))
-    h1       = float(row.get("h1",       10.0))
-    h2       = float(row.get("h2",       9.0))
-    hk       = float(row.get("hk",       1.0))
-    Sw       = float(row.get("Sw",       5.0))
-    R_Wu     = float(row.get("R_Wu",     7.5))
-    R_Wb     = float(row.get("R_Wb",     7.5))
-    alpha_th = float(row.get("alpha_th", 0.1))
-
-    if S_T <= 0:
-        raise ValueError("Source thickness ST must be > 0.")
-    if R_Ta < 0 or R_Tb < 0:
-        raise ValueError("Source buffers R_Ta and R_Tb cannot be negative.")
-    if delta_x <= 0 or delta_z <= 0:
-        raise ValueError("Grid spacing must be > 0.")
-    if h1 <= h2:
-        raise ValueError("Head h1 must be greater than head h2.")
-    if Sw <= 0:
-        raise ValueError("Source width Sw must be > 0.")
-    if R_Wu < 0 or R_Wb < 0:
-        raise ValueError("Horizontal reactant buffers R_Wu and R_Wb cannot be negative.")
-    if alpha_th <= 0:
-        raise ValueError("Horizontal dispersivity alpha_th must be > 0.")
-
-    # Vertical model
-    A_T = R_Tb + R_Ta + S_T
-    analytical_lmax = liedl_lmax(A_T, av, gamma, Ca, Cd)
-    if analytical_lmax <= 0:
-        raise ValueError("Liedl analytical Lmax must be positive.")
-    L_D_v = 1.5 * analytical_lmax
-    n_cols_v = int(np.ceil(L_D_v / delta_x))
-    n_rows_v = int(np.ceil(A_T / delta_z))
-    if n_cols_v < 2 or n_rows_v < 2:
-        raise ValueError("Vertical grid too coarse — reduce delta_x or delta_z.")
-
-    v_result = run_numerical_model(L_D_v, A_T, n_cols_v, n_rows_v, prsity, al, av, gamma, Cd, Ca, h1, h2, hk)
-
-    # Horizontal model
-    cirpka_lmax_val = _cirpka_lmax(Sw, alpha_th, gamma, Ca, Cd)
-    L_D_h = cirpka_domain_length(cirpka_lmax_val)
-    A_W = R_Wb + Sw + R_Wu
-    n_cols_h = int(np.ceil(L_D_h / delta_x))
-    n_rows_h = int(np.ceil(A_W / delta_z))
-    if n_cols_h < 2 or n_rows_h < 2:
-        raise ValueError("Horizontal grid too coarse — reduce delta_x or delta_z.")
-
-    h_result = run_numerical_model_horizontal(
-        L_D_h, A_W, Sw, n_cols_h, n_rows_h,
-        prsity, al, alpha_th, gamma, Cd, Ca, h1, h2, hk,
-    )
-
-    return {
-        "v_result":        v_result,
-        "h_result":        h_result,
-        "analytical_lmax": analytical_lmax,
-        "cirpka_lmax":     cirpka_lmax_val,
-        "L_D_v":           L_D_v,
-        "L_D_h":           L_D_h,
-        "A_T":             A_T,
-        "A_W":             A_W,
-        "S_T":             S_T,
-        "Sw":              Sw,
-        "R_Wu":            R_Wu,
-        "R_Wb":            R_Wb,
-        "R_Ta":            R_Ta,
-        "R_Tb":            R_Tb,
-        "av":              av,
-        "gamma":           gamma,
-    }
+    return figure_png(fig)
 
 
 def numerical_multiple_app():
@@ -276,6 +150,15 @@ def numerical_multiple_app():
     ])
 
     table = pn.widgets.Tabulator(default_df, height=320, sizing_mode="stretch_width", name="Numerical scenarios")
+    workers_input = pn.widgets.IntInput(
+        name="Parallel scenarios", value=NUMERICAL_SCENARIO_WORKERS, start=1, end=64, sizing_mode="stretch_width"
+    )
+    engine_select = pn.widgets.Select(
+        name="Solver",
+        options={label: name for name, label in ENGINE_LABELS.items()},
+        value=_query_str("engine", "modflow") if _query_str("engine", "modflow") in ENGINE_LABELS else "modflow",
+        sizing_mode="stretch_width",
+    )
     run_btn = pn.widgets.Button(name="Run numerical scenarios", button_type="primary", sizing_mode="stretch_width")
     result_pane = pn.pane.HTML(
         _result_card("Result", '<div style="font-size:1rem;color:#1f2937;">Run the scenarios to compute plume lengths.</div>'),
@@ -293,7 +176,9 @@ def numerical_multiple_app():
     def _pdf_callback():
         if not _state:
             return io.BytesIO(b"")
-        report = CASTReport("Numerical Model \u2014 Multiple Simulation", "Numerical MODFLOW/MT3DMS")
+        if "plot_images" not in _state:
+            _state["plot_images"] = _state["render_images"]()
+        report = CASTReport("Numerical Model \u2014 Multiple Simulation", f"Numerical {_state['engine_label']}")
         return io.BytesIO(report.generate(
             _state["parameters"],
             _state["outputs"],
@@ -306,7 +191,7 @@ def numerical_multiple_app():
         sizing_mode="stretch_width", visible=False,
     )
 
-    def _run(_=None):
+    async def _run(_=None):
         try:
             df = table.value
             if not isinstance(df, pd.DataFrame):
@@ -314,34 +199,42 @@ def numerical_multiple_app():
             if df.empty:
                 raise ValueError("No scenarios available.")
 
-            status_rows = []
-            successful = []
-
-            for idx, row in df.reset_index(drop=True).iterrows():
-                run_btn.name = f"Running scenario {idx + 1}\u2026"
-                try:
-                    run_data = _run_row(row)
-                    successful.append((idx + 1, run_data))
-                    status_rows.append({
-                        "scenario":          idx + 1,
-                        "analytical_lmax_m": round(run_data["analytical_lmax"], 3),
-                        "cirpka_lmax_m":     round(run_data["cirpka_lmax"], 3),
-                        "v_plume_m":         round(run_data["v_result"].plume_length, 3),
-                        "h_plume_m":         round(run_data["h_result"].plume_length, 3),
-                        "status":            "ok",
-                    })
-                except Exception as exc:
-                    status_rows.append({
-                        "scenario":          idx + 1,
-                        "analytical_lmax_m": None,
-                        "cirpka_lmax_m":     None,
-                        "v_plume_m":         None,
-                        "h_plume_m":         None,
-                        "status":            str(exc),
-                    })
-
+            df = df.drop(columns=[c for c in _RESULT_COLUMNS if c in df.columns]).reset_index(drop=True)
+            n_scenarios = len(df)
+            table.value = df.assign(**{c: None for c in _RESULT_COLUMNS[:-1]}, status="queued")
+            limit = asyncio.Semaphore(max(1, int(workers_input.value or 1)))
+            engine = engine_select.value
+            engine_label = ENGINE_LABELS[engine]
+            results = {}
+            finished = 0
+
+            def _show(idx, text):
+                table.patch({"status": [(idx, text)]})
+
+            async def _scenario(idx, row):
+                nonlocal finished
+                async with limit:
+                    try:
+                        job_id = NUMERICAL_JOBS.submit({**row, "engine": engine})
+                        run_data = await wait_for_job(job_id, lambda status: _show(idx, describe(status)))
+                    except Exception as exc:
+                        _show(idx, str(exc))
+                    else:
+                        results[idx] = run_data
+                        table.patch({
+                            "analytical_lmax_m": [(idx, round(run_data["analytical_lmax"], 3))],
+                            "cirpka_lmax_m":     [(idx, round(run_data["cirpka_lmax"], 3))],
+                            "v_plume_m":         [(idx, round(run_data["v_result"].plume_length, 3))],
+                            "h_plume_m":         [(idx, round(run_data["h_result"].plume_length, 3))],
+                            "status":            [(idx, "ok")],
+                        })
+                    finished += 1
+                    run_btn.name = f"Running scenarios ({finished}/{n_scenarios} finished)\u2026"
+
+            run_btn.name = f"Running scenarios (0/{n_scenarios} finished)\u2026"
+            await asyncio.gather(*(_scenario(idx, row.to_dict()) for idx, row in df.iterrows()))
             run_btn.name = "Run numerical scenarios"
-            table.value = pd.concat([df.reset_index(drop=True), pd.DataFrame(status_rows)], axis=1)
+            successful = [(idx + 1, results[idx]) for idx in sorted(results)]
 
             if not successful:
                 raise ValueError("All numerical scenarios failed.")
@@ -349,7 +242,7 @@ def numerical_multiple_app():
             v_lengths = [rd["v_result"].plume_length for _, rd in successful]
             h_lengths = [rd["h_result"].plume_length for _, rd in successful]
             result_pane.object = _result_card(
-                "Simulation Summary",
+                f"Simulation Summary \u2014 {engine_label}",
                 f"""
                 <div style="display:flex;gap:22px;flex-wrap:wrap;">
                   <div><span style="font-size:0.92rem;color:#5b7a9a;">Successful runs</span>
@@ -407,36 +300,39 @@ def numerical_multiple_app():
                 numerical_runs=numerical_runs,
             )
 
-            plot_images = [
-                {
-                    "title": "Vertical Plume (Scenario 1, Cross-Section)",
-                    "bytes": _contour_image_bytes(
-                        v_res.concentration, v_res.x_grid, v_res.z_grid,
-                        "Contaminant Plume - Vertical Model",
-                        "Distance Lx [m]", "Aquifer Thickness [m]",
-                        v_res.plume_length, first_run["L_D_v"],
-                    ),
-                    "caption": "Vertical numerical plume for the first successful scenario.",
-                },
-                {
-                    "title": "Horizontal Plume (Scenario 1, Plan View)",
-                    "bytes": _contour_image_bytes(
-                        h_res.concentration, h_res.x_grid, h_res.y_grid,
-                        "Contaminant Plume - Horizontal Model",
-                        "Distance Lx [m]", "Horizontal Width [m]",
-                        h_res.plume_length, first_run["L_D_h"],
-                    ),
-                    "caption": "Horizontal numerical plume for the first successful scenario.",
-                },
-                {
-                    "title": "Numerical vs Database Sites",
-                    "bytes": _scatter_image_bytes(
-                        db_analytical, db_plumes, numerical_runs, selected_site,
-                    ),
-                    "caption": "Successful numerical scenarios compared against database plume lengths.",
-                },
-            ]
-
+            # Rendered on the first PDF download, not on every run.
+            def _render_images():
+                return [
+                    {
+                        "title": "Vertical Plume (Scenario 1, Cross-Section)",
+                        "bytes": contour_png(
+                            v_res.concentration, v_res.x_grid, v_res.z_grid,
+                            "Contaminant Plume - Vertical Model",
+                            "Distance Lx [m]", "Aquifer Thickness [m]",
+                            v_res.plume_length, first_run["L_D_v"],
+                        ),
+                        "caption": f"Vertical numerical plume for the first successful scenario ({engine_label}).",
+                    },
+                    {
+                        "title": "Horizontal Plume (Scenario 1, Plan View)",
+                        "bytes": contour_png(
+                            h_res.concentration, h_res.x_grid, h_res.y_grid,
+                            "Contaminant Plume - Horizontal Model",
+                            "Distance Lx [m]", "Horizontal Width [m]",
+                            h_res.plume_length, first_run["L_D_h"],
+                        ),
+                        "caption": f"Horizontal numerical plume for the first successful scenario ({engine_label}).",
+                    },
+                    {
+                        "title": "Numerical vs Database Sites",
+                        "bytes": _scatter_image_bytes(
+                            db_analytical, db_plumes, numerical_runs, selected_site,
+                        ),
+                        "caption": "Successful numerical scenarios compared against database plume lengths.",
+                    },
+                ]
+
+            _state.pop("plot_images", None)
             _state.update({
                 "parameters": [
                     {"symbol": f"Sc.{s}", "name": f"Scenario {s} — Vertical L_max",   "value": f"{rd['v_result'].plume_length:.2f}", "unit": "m"}
@@ -446,13 +342,15 @@ def numerical_multiple_app():
                     for s, rd in successful
                 ],
                 "outputs": [
+                    {"label": "Solver",               "value": engine_label,            "unit": ""},
                     {"label": "Scenarios run",        "value": str(len(successful)),    "unit": ""},
                     {"label": "Max vertical L_max",   "value": f"{max(v_lengths):.2f}", "unit": "m"},
                     {"label": "Max horizontal L_max", "value": f"{max(h_lengths):.2f}", "unit": "m"},
                     {"label": "Min vertical L_max",   "value": f"{min(v_lengths):.2f}", "unit": "m"},
                     {"label": "Min horizontal L_max", "value": f"{min(h_lengths):.2f}", "unit": "m"},
                 ],
-                "plot_images": plot_images,
+                "render_images": _render_images,
+                "engine_label": engine_label,
             })
             export_btn.visible = True
 
@@ -478,6 +376,8 @@ def numerical_multiple_app():
     controls = pn.Column(
         pn.pane.HTML('<p style="margin:0 0 6px 0;font-size:0.9rem;color:#4b5563;">Each row is one scenario. Horizontal domain width is D_w = R_Wb + Sw + R_Wu; use alpha_th for transverse horizontal dispersivity.</p>'),
         table,
+        workers_input,
+        engine_select,
         sizing_mode="stretch_width",
         styles={**card, "padding": "18px"},
     )
@@ -1,16 +1,17 @@
 import io
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import numpy as np
 import panel as pn
 
-from analytical_models import cirpka_lmax as _cirpka_lmax, cirpka_domain_length, liedl_lmax
+from analytical_models import liedl_lmax_batch
+from calibration import site_columns
 from data_queries import get_user_sites
-from numerical_models import run_numerical_model, run_numerical_model_horizontal
+from numerical_jobs import NUMERICAL_JOBS, describe, wait_for_job
+from numerical_models import ENGINE_LABELS
+from numerical_plots import contour_png, figure_png, new_figure
 from pdf_report import CASTReport
 from plot_functions import (
+    plot_breakthrough_curves,
     plot_horizontal_plume_interactive,
     plot_lmax_scatter,
     plot_vertical_plume_interactive,
@@ -47,41 +48,26 @@ def _query_str(name, default=""):
         return default
 
 
-def _safe_float(value):
-    try:
-        if value is None:
-            return None
-        value = float(value)
-        if not np.isfinite(value):
-            return None
-        return value
-    except Exception:
-        return None
-
-
 def _database_lmax_points(email, alpha_tv, gamma, selected_site_id=0):
     try:
         rows = get_user_sites(email)
     except Exception:
         return [], [], None
 
-    analytical, observed, selected = [], [], None
-    for row in rows:
-        site_id = int(row[0])
-        M = _safe_float(row[3])
-        plume_length = _safe_float(row[4])
-        C_ED0 = _safe_float(row[7])
-        C_EA0 = _safe_float(row[8])
-        if None in {M, plume_length, C_ED0, C_EA0}:
-            continue
-        try:
-            model_lmax = liedl_lmax(M, alpha_tv, gamma, C_EA0, C_ED0)
-        except Exception:
-            continue
-        analytical.append(model_lmax)
-        observed.append(plume_length)
-        if selected_site_id and site_id == selected_site_id:
-            selected = {"analytical_lmax": model_lmax, "plume_length": plume_length}
+    sites = site_columns(rows)
+    result = liedl_lmax_batch(
+        sites["aquifer_thickness"], alpha_tv, gamma, sites["electron_acceptor_o2"], sites["electron_donor"]
+    )
+    keep = result.valid & np.isfinite(sites["plume_length"])
+    analytical = result.lmax[keep].tolist()
+    observed = sites["plume_length"][keep].tolist()
+
+    selected = None
+    if selected_site_id:
+        match = np.flatnonzero(keep & (sites["site_id"] == selected_site_id))
+        if match.size:
+            i = int(match[0])
+            selected = {"analytical_lmax": float(result.lmax[i]), "plume_length": float(sites["plume_length"][i])}
     return analytical, observed, selected
 
 
@@ -98,6 +84,31 @@ def _result_card(title, body_html, tone="info"):
     """
 
 
+def _parse_points(text: str) -> list[list[float]]:
+    """Semicolon-separated ``x, coordinate`` pairs, e.g. "20, 2.5; 40, 2.5"."""
+    points = []
+    for part in text.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        pieces = [p.strip() for p in part.split(",")]
+        if len(pieces) != 2:
+            raise ValueError(f"Invalid observation well '{part}', use x, coordinate pairs separated by ';'.")
+        try:
+            points.append([float(pieces[0]), float(pieces[1])])
+        except ValueError:
+            raise ValueError(f"Invalid observation well '{part}'.") from None
+    return points
+
+
+def _well_curves(result, prefix, axis):
+    """(label, times, concentrations) for each observation well of a model result."""
+    return [
+        (f"{prefix}{i + 1} (x={x:g}, {axis}={v:g})", result.obs_times, result.breakthrough[:, i])
+        for i, (x, v) in enumerate(result.obs_points)
+    ]
+
+
 # ── App ────────────────────────────────────────────────────────────────────────
 
 def _clean_numeric(values):
@@ -112,42 +123,9 @@ def _clean_numeric(values):
     return out
 
 
-def _figure_bytes(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=180, bbox_inches="tight", facecolor="white")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
-
-
-def _contour_image_bytes(C, x_grid, y_grid, title, xlabel, ylabel, plume_length, domain_length):
-    C = np.asarray(C, dtype=float)
-    x_grid = np.asarray(x_grid, dtype=float)
-    y_grid = np.asarray(y_grid, dtype=float)
-    fig, ax = plt.subplots(figsize=(9.5, 4.8), dpi=180)
-    im = ax.imshow(
-        np.flipud(C),
-        extent=[float(x_grid.min()), float(x_grid.max()), float(y_grid.min()), float(y_grid.max())],
-        aspect="auto",
-        cmap="RdYlGn_r",
-    )
-    finite = C[np.isfinite(C)]
-    if finite.size and float(np.nanmin(finite)) < float(np.nanmax(finite)):
-        levels = np.linspace(float(np.nanmin(finite)), float(np.nanmax(finite)), 12)
-        ax.contour(x_grid, y_grid, C, levels=levels, colors="black", linewidths=0.45, alpha=0.45)
-    ax.axvline(plume_length, color="#1B3A6B", linestyle="--", linewidth=1.5, label=f"Lmax = {plume_length:.1f} m")
-    ax.axvline(domain_length, color="#6B7280", linestyle=":", linewidth=1.5, label=f"LD = {domain_length:.1f} m")
-    ax.set_title(title)
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.legend(loc="upper right", fontsize=8)
-    fig.colorbar(im, ax=ax, label="Concentration [mg/L]")
-    fig.tight_layout()
-    return _figure_bytes(fig)
-
-
 def _scatter_image_bytes(db_analytical, db_plumes, numerical_lmax, analytical_lmax, selected_site=None):
-    fig, ax = plt.subplots(figsize=(8.5, 5.2), dpi=180)
+    fig = new_figure((8.5, 5.2))
+    ax = fig.add_subplot()
     clean_x = _clean_numeric(db_analytical)
     clean_y = _clean_numeric(db_plumes)
     if clean_x and clean_y:
@@ -167,7 +145,22 @@ def _scatter_image_bytes(db_analytical, db_plumes, numerical_lmax, analytical_lm
     ax.grid(True, alpha=0.25)
     ax.legend(loc="upper left", fontsize=8)
     fig.tight_layout()
-    return _figure_bytes(fig)
+    return figure_png(fig)
+
+
+def _breakthrough_image_bytes(curves):
+    fig = new_figure((9.0, 4.8))
+    ax = fig.add_subplot()
+    for label, times, values in curves:
+        ax.plot(times, values, linewidth=1.8, label=label)
+    ax.set_title("Breakthrough Curves at Observation Wells")
+    ax.set_xlabel("Time [days]")
+    ax.set_ylabel("Concentration [mg/L]")
+    ax.set_ylim(bottom=0)
+    ax.grid(True, alpha=0.25)
+    ax.legend(loc="best", fontsize=8)
+    fig.tight_layout()
+    return figure_png(fig)
 
 
 def numerical_single_app():
@@ -193,6 +186,17 @@ def numerical_single_app():
     r_wb     = pn.widgets.FloatInput(name="Lower Reactant Buffer R_Wb [m]",             value=_query_float("R_Wb", 7.5),   step=0.1)
     alpha_th = pn.widgets.FloatInput(name="Transverse Horizontal Dispersivity \u03b1Th [m]", value=_query_float("alpha_Th", 0.1), step=0.01)
 
+    # -- Observation wells --
+    wells_v      = pn.widgets.TextInput(name="Vertical model wells x, z [m]",   value=_query_str("wells_v", ""), placeholder="e.g. 20, 2.5; 40, 2.5")
+    wells_h      = pn.widgets.TextInput(name="Horizontal model wells x, y [m]", value=_query_str("wells_h", ""), placeholder="e.g. 20, 10; 40, 10")
+    output_times = pn.widgets.IntInput(name="Output times for breakthrough curves", value=_query_int("output_times", 50), start=2, end=1000)
+
+    engine_select = pn.widgets.Select(
+        name="Solver",
+        options={label: name for name, label in ENGINE_LABELS.items()},
+        value=_query_str("engine", "modflow") if _query_str("engine", "modflow") in ENGINE_LABELS else "modflow",
+    )
+
     run_btn = pn.widgets.Button(name="Run Numerical Simulation", button_type="primary", sizing_mode="stretch_width")
 
     result_pane  = pn.pane.HTML(
@@ -202,6 +206,7 @@ def numerical_single_app():
     vertical_pane    = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=430)
     horizontal_pane  = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=430)
     scatter_pane     = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=410)
+    breakthrough_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=410)
 
     email            = _query_str("email", "demo@example.com")
     selected_site_id = _query_int("site_id", 0)
@@ -211,7 +216,9 @@ def numerical_single_app():
     def _pdf_callback():
         if not _state:
             return io.BytesIO(b"")
-        report = CASTReport("Numerical Model \u2014 Single Simulation", "Numerical MODFLOW/MT3DMS")
+        if "plot_images" not in _state:
+            _state["plot_images"] = _state["render_images"]()
+        report = CASTReport("Numerical Model \u2014 Single Simulation", f"Numerical {_state['engine_label']}")
         return io.BytesIO(report.generate(
             _state["parameters"],
             _state["outputs"],
@@ -224,64 +231,38 @@ def numerical_single_app():
         sizing_mode="stretch_width", visible=False,
     )
 
-    def _run(_=None):
+    async def _run(_=None):
         try:
-            if s_t.value <= 0:
-                raise ValueError("Source thickness ST must be greater than zero.")
-            if r_ta.value < 0 or r_tb.value < 0:
-                raise ValueError("Source buffers R_Ta and R_Tb cannot be negative.")
-            if delta_x.value <= 0 or delta_z.value <= 0:
-                raise ValueError("Grid spacing must be greater than zero.")
-            if h1.value <= h2.value:
-                raise ValueError("Head h1 must be greater than head h2.")
-            if sw.value <= 0:
-                raise ValueError("Source width Sw must be positive.")
-            if r_wu.value < 0 or r_wb.value < 0:
-                raise ValueError("Horizontal reactant buffers R_Wu and R_Wb cannot be negative.")
-            if alpha_th.value <= 0:
-                raise ValueError("Horizontal dispersivity \u03b1Th must be positive.")
-
-            # ── Vertical model ────────────────────────────────────────────────
-            A_T = r_tb.value + r_ta.value + s_t.value
-            analytical_lmax = liedl_lmax(A_T, av.value, gamma.value, ca.value, cd.value)
-            if analytical_lmax <= 0:
-                raise ValueError("Liedl Lmax must be positive.")
-            L_D_v = 1.5 * analytical_lmax
-            n_cols_v = int(np.ceil(L_D_v / delta_x.value))
-            n_rows_v = int(np.ceil(A_T / delta_z.value))
-            if n_cols_v < 2 or n_rows_v < 2:
-                raise ValueError("Vertical grid too coarse \u2014 reduce \u0394x or \u0394z.")
-
-            run_btn.name = "Running vertical model\u2026"
-            v_result = run_numerical_model(
-                L_D_v, A_T, n_cols_v, n_rows_v,
-                prsity.value, al.value, av.value,
-                gamma.value, cd.value, ca.value,
-                h1.value, h2.value, hk.value,
-            )
-
-            # ── Horizontal model ──────────────────────────────────────────────
-            cirpka_lmax_val = _cirpka_lmax(sw.value, alpha_th.value, gamma.value, ca.value, cd.value)
-            L_D_h = cirpka_domain_length(cirpka_lmax_val)
-            A_W = r_wb.value + sw.value + r_wu.value
-            n_cols_h = int(np.ceil(L_D_h / delta_x.value))
-            n_rows_h = int(np.ceil(A_W / delta_z.value))
-            if n_cols_h < 2 or n_rows_h < 2:
-                raise ValueError("Horizontal grid too coarse \u2014 reduce \u0394x or \u0394z.")
-
-            run_btn.name = "Running horizontal model\u2026"
-            h_result = run_numerical_model_horizontal(
-                L_D_h, A_W, sw.value,
-                n_cols_h, n_rows_h,
-                prsity.value, al.value, alpha_th.value,
-                gamma.value, cd.value, ca.value,
-                h1.value, h2.value, hk.value,
+            scenario = {
+                "S_T": s_t.value, "R_Ta": r_ta.value, "R_Tb": r_tb.value,
+                "delta_x": delta_x.value, "delta_z": delta_z.value,
+                "prsity": prsity.value, "al": al.value, "av": av.value,
+                "gamma": gamma.value, "Cd": cd.value, "Ca": ca.value,
+                "h1": h1.value, "h2": h2.value, "hk": hk.value,
+                "Sw": sw.value, "R_Wu": r_wu.value, "R_Wb": r_wb.value, "alpha_th": alpha_th.value,
+                "observation_wells_v": _parse_points(wells_v.value),
+                "observation_wells_h": _parse_points(wells_h.value),
+                "output_times": output_times.value,
+                "engine": engine_select.value,
+            }
+            job_id = NUMERICAL_JOBS.submit(scenario)
+            run_btn.name = "Queued\u2026"
+            run_data = await wait_for_job(
+                job_id, lambda status: setattr(run_btn, "name", f"{describe(status).capitalize()}\u2026")
             )
             run_btn.name = "Run Numerical Simulation"
 
+            v_result = run_data["v_result"]
+            h_result = run_data["h_result"]
+            analytical_lmax = run_data["analytical_lmax"]
+            cirpka_lmax_val = run_data["cirpka_lmax"]
+            A_T, L_D_v = run_data["A_T"], run_data["L_D_v"]
+            A_W, L_D_h = run_data["A_W"], run_data["L_D_h"]
+            engine_label = ENGINE_LABELS[v_result.engine]
+
             # ── Result card ───────────────────────────────────────────────────
             result_pane.object = _result_card(
-                "Simulation Results",
+                f"Simulation Results \u2014 {engine_label}",
                 f"""
                 <div style="display:flex;gap:22px;flex-wrap:wrap;align-items:baseline;">
                   <div><span style="font-size:0.88rem;color:#5b7a9a;">Vertical plume L_max</span>
@@ -325,37 +306,52 @@ def numerical_single_app():
                 selected_site=selected_site,
             )
 
-            plot_images = [
-                {
-                    "title": "Vertical Plume (Cross-Section)",
-                    "bytes": _contour_image_bytes(
-                        v_result.concentration, v_result.x_grid, v_result.z_grid,
-                        "Contaminant Plume - Vertical Model",
-                        "Distance Lx [m]", "Aquifer Thickness [m]",
-                        v_result.plume_length, L_D_v,
-                    ),
-                    "caption": "Vertical numerical plume generated by the MODFLOW/MT3DMS model.",
-                },
-                {
-                    "title": "Horizontal Plume (Plan View)",
-                    "bytes": _contour_image_bytes(
-                        h_result.concentration, h_result.x_grid, h_result.y_grid,
-                        "Contaminant Plume - Horizontal Model",
-                        "Distance Lx [m]", "Horizontal Width [m]",
-                        h_result.plume_length, L_D_h,
-                    ),
-                    "caption": "Horizontal numerical plume generated by the MODFLOW/MT3DMS model.",
-                },
-                {
-                    "title": "Numerical vs Database Sites",
-                    "bytes": _scatter_image_bytes(
-                        db_analytical, db_plumes, v_result.plume_length,
-                        analytical_lmax, selected_site,
-                    ),
-                    "caption": "Numerical plume length compared against database plume lengths.",
-                },
-            ]
-
+            # ── Graph 4: Breakthrough curves ──────────────────────────────────
+            curves = _well_curves(v_result, "V", "z") + _well_curves(h_result, "H", "y")
+            breakthrough_pane.object = plot_breakthrough_curves(curves) if curves else None
+            breakthrough_card.visible = bool(curves)
+
+            # Rendered on the first PDF download, not on every run.
+            def _render_images():
+                images = [
+                    {
+                        "title": "Vertical Plume (Cross-Section)",
+                        "bytes": contour_png(
+                            v_result.concentration, v_result.x_grid, v_result.z_grid,
+                            "Contaminant Plume - Vertical Model",
+                            "Distance Lx [m]", "Aquifer Thickness [m]",
+                            v_result.plume_length, L_D_v,
+                        ),
+                        "caption": f"Vertical numerical plume ({engine_label}).",
+                    },
+                    {
+                        "title": "Horizontal Plume (Plan View)",
+                        "bytes": contour_png(
+                            h_result.concentration, h_result.x_grid, h_result.y_grid,
+                            "Contaminant Plume - Horizontal Model",
+                            "Distance Lx [m]", "Horizontal Width [m]",
+                            h_result.plume_length, L_D_h,
+                        ),
+                        "caption": f"Horizontal numerical plume ({engine_label}).",
+                    },
+                    {
+                        "title": "Numerical vs Database Sites",
+                        "bytes": _scatter_image_bytes(
+                            db_analytical, db_plumes, v_result.plume_length,
+                            analytical_lmax, selected_site,
+                        ),
+                        "caption": "Numerical plume length compared against database plume lengths.",
+                    },
+                ]
+                if curves:
+                    images.append({
+                        "title": "Breakthrough Curves",
+                        "bytes": _breakthrough_image_bytes(curves),
+                        "caption": f"Concentration against time at the observation wells ({engine_label}).",
+                    })
+                return images
+
+            _state.pop("plot_images", None)
             _state.update({
                 "parameters": [
                     {"symbol": "S_T",         "name": "Source Thickness",         "value": s_t.value,      "unit": "m"},
@@ -376,12 +372,17 @@ def numerical_single_app():
                     {"symbol": "K",           "name": "Hydraulic Conductivity",    "value": hk.value,       "unit": "m/d"},
                 ],
                 "outputs": [
+                    {"label": "Solver",                    "value": engine_label,                   "unit": ""},
                     {"label": "Vertical Numerical L_max",  "value": f"{v_result.plume_length:.2f}", "unit": "m"},
                     {"label": "Horizontal Numerical L_max","value": f"{h_result.plume_length:.2f}", "unit": "m"},
                     {"label": "Liedl Analytical L_max",    "value": f"{analytical_lmax:.2f}",       "unit": "m"},
                     {"label": "Cirpka Analytical L_max",   "value": f"{cirpka_lmax_val:.2f}",       "unit": "m"},
+                ] + [
+                    {"label": f"Final C at {label}", "value": f"{values[-1]:.3f}", "unit": "mg/L"}
+                    for label, _times, values in curves
                 ],
-                "plot_images": plot_images,
+                "render_images": _render_images,
+                "engine_label": engine_label,
             })
             export_btn.visible = True
 
@@ -391,6 +392,8 @@ def numerical_single_app():
             vertical_pane.object   = None
             horizontal_pane.object = None
             scatter_pane.object    = None
+            breakthrough_pane.object = None
+            breakthrough_card.visible = False
             export_btn.visible = False
 
     run_btn.on_click(_run)
@@ -423,7 +426,14 @@ def numerical_single_app():
         sizing_mode="stretch_width",
         styles={**card, "flex": "1 1 260px", "min-width": "240px"},
     )
-    inputs = pn.FlexBox(domain_card, transport_card, horiz_card,
+    wells_card = pn.Column(
+        pn.pane.HTML('<h3 style="margin:0 0 12px 0;">Observation wells</h3>'),
+        wells_v, wells_h, output_times,
+        pn.pane.HTML('<p style="font-size:0.8rem;color:#6b7280;margin:4px 0 0 0;">Optional. Positions are measured from the inflow boundary (x) and the bottom of the domain (z or y).</p>'),
+        sizing_mode="stretch_width",
+        styles={**card, "flex": "1 1 260px", "min-width": "240px"},
+    )
+    inputs = pn.FlexBox(domain_card, transport_card, horiz_card, wells_card,
                         sizing_mode="stretch_width", flex_wrap="wrap", styles={"gap": "14px"})
 
     def _plot_card(pane, title):
@@ -435,10 +445,14 @@ def numerical_single_app():
             styles={**card, "width": "100%", "overflow": "visible"},
         )
 
+    breakthrough_card = _plot_card(breakthrough_pane, "Graph 4 \u2014 Breakthrough Curves at Observation Wells")
+    breakthrough_card.visible = False
+
     graphs = pn.Column(
         _plot_card(vertical_pane,   "Graph 1 \u2014 Vertical Plume (Cross-Section)"),
         _plot_card(horizontal_pane, "Graph 2 \u2014 Horizontal Plume (Plan View)"),
         _plot_card(scatter_pane,    "Graph 3 \u2014 Numerical vs Database Sites"),
+        breakthrough_card,
         sizing_mode="stretch_width",
         styles={"gap": "18px", "overflow": "visible"},
     )
@@ -452,6 +466,7 @@ def numerical_single_app():
 
     return pn.Column(
         "Run the model below. Both vertical (cross-section) and horizontal (plan-view) simulations execute sequentially.",
+        engine_select,
         run_btn,
         result_pane,
         pn.pane.HTML('<h3 style="margin:6px 0 0 0;">Input Parameters</h3>'),
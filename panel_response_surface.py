@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import panel as pn
+
+from panel_analytical_common import error_card, info_card
+from plot_functions import plot_response_surface
+from response_surface import evaluate_grid, grid_axis
+
+
+def response_surface_section(model: str, inputs: dict, default_x: str, default_y: str):
+    """
+    Panel block that renders an Lmax heatmap over two of the model inputs.
+
+    ``inputs`` maps model parameter names (as in ``batch_models.MODELS``) to the
+    app's FloatInput widgets; their current values fix the remaining parameters
+    and centre the grid axes.
+    """
+    names = list(inputs)
+    x_select = pn.widgets.Select(name="X parameter", options=names, value=default_x)
+    y_select = pn.widgets.Select(name="Y parameter", options=names, value=default_y)
+    spread = pn.widgets.FloatInput(name="Range around current value [%]", value=50.0, step=5.0, start=1.0, end=99.0)
+    resolution = pn.widgets.IntInput(name="Grid points per axis", value=200, step=50, start=20, end=500)
+    render_btn = pn.widgets.Button(name="Render response surface", button_type="default", sizing_mode="stretch_width")
+
+    status_pane = pn.pane.HTML(
+        info_card("Pick two parameters and render the Lmax surface around the current inputs."),
+        sizing_mode="stretch_width",
+    )
+    surface_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=430)
+
+    def _axis(name):
+        centre = float(inputs[name].value)
+        if centre == 0:
+            return grid_axis(0.0, 1.0, resolution.value)
+        low, high = sorted((centre * (1 - spread.value / 100.0), centre * (1 + spread.value / 100.0)))
+        return grid_axis(low, high, resolution.value)
+
+    def _render(_=None):
+        if x_select.value == y_select.value:
+            status_pane.object = error_card("Choose two different parameters.")
+            return
+        try:
+            axes = {x_select.value: _axis(x_select.value), y_select.value: _axis(y_select.value)}
+            fixed = {name: float(widget.value) for name, widget in inputs.items() if name not in axes}
+            grid = evaluate_grid(model, axes, fixed)
+            marker = (float(inputs[x_select.value].value), float(inputs[y_select.value].value))
+            surface_pane.object = plot_response_surface(grid, marker=marker)
+            invalid = int((~grid.valid).sum())
+            note = f" {invalid:,} grid points are outside the model's valid range." if invalid else ""
+            status_pane.object = info_card(f"Evaluated {grid.lmax.size:,} parameter combinations.{note}")
+        except Exception as exc:
+            status_pane.object = error_card(str(exc))
+            surface_pane.object = None
+
+    render_btn.on_click(_render)
+
+    controls = pn.Row(x_select, y_select, spread, resolution, sizing_mode="stretch_width")
+    return pn.Column(
+        "### Response surface",
+        controls,
+        render_btn,
+        status_pane,
+        surface_pane,
+        sizing_mode="stretch_width",
+        styles={"gap": "10px"},
+    )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import io
+
+import pandas as pd
+import panel as pn
+
+from batch_models import get_model
+from panel_analytical_common import error_card, info_card
+from pdf_report import CASTReport
+from plot_functions import plot_tornado
+from sensitivity import factors_around, morris, sobol
+
+
+def sensitivity_section(model: str, inputs: dict):
+    """
+    Panel block that ranks the model inputs by their influence on Lmax.
+
+    ``inputs`` maps model parameter names (as in ``batch_models.MODELS``) to the
+    app's FloatInput widgets; every input varies uniformly around its current
+    value and the factors are ranked with Morris screening or Sobol indices.
+    """
+    label = get_model(model).label
+    method = pn.widgets.Select(name="Method", options={"Morris screening": "morris", "Sobol indices": "sobol"}, value="morris")
+    spread = pn.widgets.FloatInput(name="Range around current value [%]", value=25.0, step=5.0, start=1.0, end=99.0)
+    n_runs = pn.widgets.IntInput(name="Trajectories / base samples", value=256, step=64, start=16, end=65_536)
+    run_btn = pn.widgets.Button(name="Run sensitivity analysis", button_type="default", sizing_mode="stretch_width")
+
+    status_pane = pn.pane.HTML(
+        info_card("Rank the inputs by how strongly they drive Lmax around the current values."),
+        sizing_mode="stretch_width",
+    )
+    tornado_pane = pn.pane.Bokeh(sizing_mode="stretch_width", min_height=300)
+    table = pn.widgets.Tabulator(pd.DataFrame(), height=240, sizing_mode="stretch_width", visible=False, disabled=True, show_index=False)
+
+    _state: dict = {}
+
+    def _pdf_callback():
+        if not _state:
+            return io.BytesIO(b"")
+        report = CASTReport(f"{label} \u2014 Parameter Sensitivity", label)
+        return io.BytesIO(report.generate(_state["parameters"], _state["outputs"], plot_images=_state["plot_images"]))
+
+    export_btn = pn.widgets.FileDownload(
+        callback=_pdf_callback, filename=f"{model}_sensitivity_report.pdf",
+        label="\u2193 Download Sensitivity Report", button_type="default",
+        sizing_mode="stretch_width", visible=False,
+    )
+
+    def _run(_=None):
+        try:
+            nominal = {name: float(widget.value) for name, widget in inputs.items()}
+            factors = factors_around(model, nominal, spread=spread.value / 100.0)
+            if method.value == "sobol":
+                result = sobol(model, factors, n_base=int(n_runs.value))
+            else:
+                result = morris(model, factors, trajectories=int(n_runs.value))
+            tornado_pane.object = plot_tornado(result)
+            table.value = result.table.round(4)
+            table.visible = True
+
+            note = f" {result.n_invalid:,} runs were outside the model's valid range." if result.n_invalid else ""
+            top = result.table.iloc[0]
+            status_pane.object = info_card(
+                f"{result.n_evaluations:,} model runs; most influential input: {top.parameter} "
+                f"({result.metric} = {getattr(top, result.metric):.3f}).{note}"
+            )
+            _state.update({
+                "parameters": [
+                    {"symbol": name, "name": f"\u00b1{spread.value:g} % uniform", "value": widget.value, "unit": ""}
+                    for name, widget in inputs.items()
+                ],
+                "outputs": result.report_outputs(),
+                "plot_images": [result.report_image()],
+            })
+            export_btn.visible = True
+        except Exception as exc:
+            status_pane.object = error_card(str(exc))
+            tornado_pane.object = None
+            table.visible = False
+            export_btn.visible = False
+
+    run_btn.on_click(_run)
+
+    controls = pn.Row(method, spread, n_runs, sizing_mode="stretch_width")
+    return pn.Column(
+        "### Parameter sensitivity",
+        controls,
+        run_btn,
+        status_pane,
+        tornado_pane,
+        table,
+        export_btn,
+        sizing_mode="stretch_width",
+        styles={"gap": "10px"},
+    )
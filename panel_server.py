@@ -2,6 +2,8 @@
 import panel as pn
 
 from settings import PANEL_ALLOW_ORIGINS, PANEL_HOST, PANEL_PORT
+from liedl3d_table import load_table
+from model_cache import MODEL_CACHE
 
 from panel_liedl_single import liedl_single_app
 from panel_liedl_multiple import liedl_multiple_app
@@ -27,6 +29,17 @@ from panel_cirpka_multiple import cirpka_multiple_app
 
 pn.extension("tabulator")
 
+# Model results are memoised process-wide; expose the cache so every session
+# (and the admin panel) can inspect its counters.
+pn.state.cache["model_cache"] = MODEL_CACHE
+
+# Build (or map) the Liedl 3D lookup table before serving, so no request
+# pays for it; the Liedl 3D app uses plain Newton starts if this fails.
+try:
+    load_table()
+except (OSError, RuntimeError) as exc:
+    print(f"Liedl 3D lookup table unavailable: {exc}")
+
 # IMPORTANT:
 # "" maps to "/" (root). This avoids Panel trying to render its index template.
 apps = {
@@ -485,6 +485,255 @@ def plot_lmax_scatter(
     return p
 
 
+def plot_monte_carlo_histogram(result):
+    """Histogram of Monte Carlo Lmax samples with the percentile markers."""
+    counts, edges = result.hist_counts, result.hist_edges
+    total = counts.sum()
+    density = counts / (total * np.diff(edges)) if total else counts.astype(float)
+
+    p = figure(
+        title=f"Monte Carlo L_max ({result.n_valid:,} samples)",
+        x_axis_label="Plume Length L_max [m]",
+        y_axis_label="Density",
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        sizing_mode="stretch_width",
+        height=400,
+        toolbar_location="above",
+        active_drag="pan",
+    )
+    p.quad(top=density, bottom=0, left=edges[:-1], right=edges[1:],
+           fill_color="#2E6EBD", line_color="white", alpha=0.75, legend_label="Samples")
+
+    colors = ["#16803c", "#e6a817", "#d45087", "#a05195"]
+    for idx, (pct, value) in enumerate(result.percentiles.items()):
+        if not np.isfinite(value):
+            continue
+        color = colors[idx % len(colors)]
+        p.add_layout(Span(location=value, dimension="height", line_color=color, line_dash="dashed", line_width=2))
+        p.line([value, value], [0, 0], line_color=color, line_dash="dashed", line_width=2,
+               legend_label=f"P{pct:g} = {value:.1f} m")
+
+    p.y_range.start = 0
+    p.legend.location = "top_right"
+    p.legend.click_policy = "hide"
+    return p
+
+
+def plot_response_surface(grid, slice_index: int = 0, n_levels: int = 10, marker=None):
+    """
+    Heatmap of a ``response_surface.GridResult`` with iso-length contours.
+
+    For 3-D grids the third axis is fixed at ``slice_index``. ``marker`` is an
+    optional (x, y) point, e.g. the current widget values.
+    """
+    x_name, y_name = grid.names[:2]
+    x = grid.axes[x_name]
+    y = grid.axes[y_name]
+    L = grid.lmax if grid.lmax.ndim == 2 else grid.lmax[:, :, slice_index]
+    title = "Lₘₐₓ Response Surface"
+    if grid.lmax.ndim == 3:
+        z_name = grid.names[2]
+        title += f" ({z_name} = {grid.axes[z_name][slice_index]:.4g})"
+
+    finite = L[np.isfinite(L)]
+    l_min = float(finite.min()) if finite.size else 0.0
+    l_max = float(finite.max()) if finite.size else 1.0
+    if l_min == l_max:
+        l_max = l_min + 1.0
+
+    p = figure(
+        title=title,
+        x_axis_label=x_name,
+        y_axis_label=y_name,
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        toolbar_location="above",
+        active_drag="pan",
+        active_scroll="wheel_zoom",
+        sizing_mode="stretch_width",
+        height=430,
+        x_range=(float(x[0]), float(x[-1])),
+        y_range=(float(y[0]), float(y[-1])),
+    )
+    mapper = LinearColorMapper(palette=list(reversed(RdYlGn11)), low=l_min, high=l_max, nan_color="#e5e7eb")
+    # Rows of a Bokeh image run along y, so the (x, y) grid is transposed.
+    image_renderer = p.image(
+        image=[np.ascontiguousarray(L.T)],
+        x=float(x[0]),
+        y=float(y[0]),
+        dw=float(x[-1] - x[0]),
+        dh=float(y[-1] - y[0]),
+        color_mapper=mapper,
+        alpha=0.95,
+    )
+    p.add_layout(ColorBar(color_mapper=mapper, label_standoff=8, title="L_max [m]"), "right")
+    p.add_tools(
+        HoverTool(
+            renderers=[image_renderer],
+            tooltips=[(x_name, "$x{0.0000}"), (y_name, "$y{0.0000}"), ("L_max", "@image{0.0} m")],
+        )
+    )
+
+    if finite.size and l_min < l_max:
+        levels = np.linspace(l_min, l_max, n_levels + 2)[1:-1]
+        contour_fig, contour_ax = plt.subplots()
+        try:
+            contour_obj = contour_ax.contour(x, y, L.T, levels=levels)
+            xs, ys, labels = [], [], []
+            for level, level_segments in zip(contour_obj.levels, contour_obj.allsegs):
+                for segment in level_segments:
+                    if len(segment) >= 2:
+                        xs.append(segment[:, 0].tolist())
+                        ys.append(segment[:, 1].tolist())
+                        labels.append(f"{level:.1f} m")
+            if xs:
+                contour_source = ColumnDataSource(data={"xs": xs, "ys": ys, "level": labels})
+                contour_renderer = p.multi_line("xs", "ys", source=contour_source, color="black", line_width=1.0, alpha=0.6)
+                p.add_tools(HoverTool(renderers=[contour_renderer], tooltips=[("Iso-length", "@level")]))
+        finally:
+            plt.close(contour_fig)
+
+    if marker is not None:
+        p.scatter([marker[0]], [marker[1]], size=14, marker="cross", color="hotpink", line_width=3, legend_label="Current inputs")
+        p.legend.location = "top_right"
+    return p
+
+
+def plot_tornado(result):
+    """Horizontal bar (tornado) chart of a ``sensitivity.SensitivityResult``, most important on top."""
+    table = result.table.iloc[::-1]
+    params = table["parameter"].tolist()
+    data = {"parameter": params, "value": table[result.metric].tolist()}
+    if result.method == "sobol":
+        data["s1"] = table["S1"].tolist()
+
+    p = figure(
+        y_range=params,
+        title=f"Parameter Sensitivity ({result.method.title()}, {result.n_evaluations:,} runs)",
+        x_axis_label=result.metric,
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        sizing_mode="stretch_width",
+        height=max(260, 40 * len(params) + 120),
+        toolbar_location="above",
+        active_drag="pan",
+    )
+    source = ColumnDataSource(data=data)
+    p.hbar(y="parameter", right="value", height=0.7, source=source,
+           color="#2E6EBD", alpha=0.88, legend_label=result.metric)
+    tooltips = [("Parameter", "@parameter"), (result.metric, "@value{0.000}")]
+    if result.method == "sobol":
+        p.hbar(y="parameter", right="s1", height=0.35, source=source,
+               color="#0D9887", alpha=0.95, legend_label="S1")
+        tooltips.append(("S1", "@s1{0.000}"))
+    p.add_tools(HoverTool(tooltips=tooltips))
+    p.x_range.start = 0
+    p.ygrid.grid_line_color = None
+    p.legend.location = "bottom_right"
+    return p
+
+
+def plot_concentration_slice(C, h_axis, v_axis, title: str, h_label: str, v_label: str, threshold: float | None = None):
+    """
+    Heatmap of a 2-D concentration slice ``C[h, v]`` (e.g. a ``bioscreen_field.PlumeField`` plan view).
+
+    ``threshold`` draws the Cthres iso-line, i.e. the plume outline.
+    """
+    C = np.asarray(C, dtype=float)
+    h_axis = np.asarray(h_axis, dtype=float)
+    v_axis = np.asarray(v_axis, dtype=float)
+    c_max = float(np.nanmax(C)) if C.size and np.isfinite(C).any() else 1.0
+
+    p = figure(
+        title=title,
+        x_axis_label=h_label,
+        y_axis_label=v_label,
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        toolbar_location="above",
+        active_drag="pan",
+        active_scroll="wheel_zoom",
+        sizing_mode="stretch_width",
+        height=380,
+        x_range=(float(h_axis[0]), float(h_axis[-1])),
+        y_range=(float(v_axis[0]), float(v_axis[-1])),
+    )
+    mapper = LinearColorMapper(palette=list(reversed(RdYlGn11)), low=0.0, high=c_max if c_max > 0 else 1.0)
+    image_renderer = p.image(
+        image=[np.ascontiguousarray(C.T)],
+        x=float(h_axis[0]),
+        y=float(v_axis[0]),
+        dw=float(h_axis[-1] - h_axis[0]),
+        dh=float(v_axis[-1] - v_axis[0]),
+        color_mapper=mapper,
+        alpha=0.95,
+    )
+    p.add_layout(ColorBar(color_mapper=mapper, label_standoff=8, title="C [mg/L]"), "right")
+    p.add_tools(
+        HoverTool(
+            renderers=[image_renderer],
+            tooltips=[(h_label, "$x{0.00}"), (v_label, "$y{0.00}"), ("C", "@image{0.0000} mg/L")],
+        )
+    )
+
+    if threshold is not None and 0 < threshold < c_max:
+        contour_fig, contour_ax = plt.subplots()
+        try:
+            contour_obj = contour_ax.contour(h_axis, v_axis, C.T, levels=[threshold])
+            segments = [s for s in contour_obj.allsegs[0] if len(s) >= 2]
+            if segments:
+                p.multi_line(
+                    [s[:, 0].tolist() for s in segments],
+                    [s[:, 1].tolist() for s in segments],
+                    color="black", line_width=2, legend_label=f"Cthres = {threshold:g} mg/L",
+                )
+                p.legend.location = "top_right"
+        finally:
+            plt.close(contour_fig)
+    return p
+
+
+def plot_plume_evolution(times, lengths, title: str = "Plume Length Over Time"):
+    """Line plot of plume length against simulation time (e.g. a BIOSCREEN time sweep)."""
+    source = ColumnDataSource(data={"time": list(times), "lmax": list(lengths)})
+    p = figure(
+        title=title,
+        x_axis_label="Time (years)",
+        y_axis_label="Plume Length (m)",
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        toolbar_location="above",
+        active_drag="pan",
+        sizing_mode="stretch_width",
+        height=380,
+    )
+    p.line("time", "lmax", source=source, line_width=2.5, color="#2E6EBD")
+    p.scatter("time", "lmax", source=source, size=5 if len(source.data["time"]) > 30 else 8, color="#163c66")
+    p.add_tools(HoverTool(tooltips=[("Time", "@time{0.0} yr"), ("L_max", "@lmax{0.00} m")]))
+    p.y_range.start = 0
+    return p
+
+
+def plot_breakthrough_curves(curves, title: str = "Breakthrough Curves"):
+    """Concentration against time at observation wells; ``curves`` holds (label, times, concentrations)."""
+    p = figure(
+        title=title,
+        x_axis_label="Time (days)",
+        y_axis_label="Concentration (mg/L)",
+        tools="pan,wheel_zoom,box_zoom,reset,save",
+        toolbar_location="above",
+        active_drag="pan",
+        sizing_mode="stretch_width",
+        height=380,
+    )
+    palette = Category10[10]
+    for i, (label, times, values) in enumerate(curves):
+        source = ColumnDataSource(data={"time": list(times), "conc": list(values), "well": [label] * len(times)})
+        p.line("time", "conc", source=source, line_width=2.5, color=palette[i % 10], legend_label=label)
+    p.add_tools(HoverTool(tooltips=[("Well", "@well"), ("Time", "@time{0.0} d"), ("C", "@conc{0.000} mg/L")]))
+    p.y_range.start = 0
+    if curves:
+        p.legend.location = "bottom_right"
+        p.legend.click_policy = "hide"
+    return p
+
+
 # -------------------------------------------------
 # BAR GRAPH
 # -------------------------------------------------
@@ -0,0 +1,85 @@
+"""
+Response-surface evaluation of a model over a 2-D or 3-D parameter grid.
+
+The chosen parameters are laid out as sparse, mutually orthogonal axes
+(shape (n, 1), (1, m), ...) and handed to the model's batch function together
+with the fixed scalars, so NumPy broadcasting produces the whole Lmax surface in
+one vectorised computation without materialising a meshgrid of inputs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+from batch_models import evaluate, get_model
+
+
+@dataclass(frozen=True)
+class GridResult:
+    """Lmax on the grid spanned by ``axes`` (``indexing="ij"``: axis order = array dimension order)."""
+
+    model: str
+    axes: dict[str, np.ndarray]
+    lmax: np.ndarray
+    valid: np.ndarray
+    fixed: dict[str, float]
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.axes)
+
+
+def grid_axis(low: float, high: float, n: int = 100, log: bool = False) -> np.ndarray:
+    """Evenly spaced (or log-spaced) axis values between ``low`` and ``high``."""
+    if n < 2:
+        raise ValueError("A grid axis needs at least 2 points")
+    if log:
+        if low <= 0 or high <= 0:
+            raise ValueError("Log-spaced axes need positive bounds")
+        return np.geomspace(low, high, n)
+    return np.linspace(low, high, n)
+
+
+def evaluate_grid(
+    model: str,
+    axes: Mapping[str, np.ndarray],
+    fixed: Mapping[str, float],
+    workers: int | None = None,
+) -> GridResult:
+    """
+    Evaluate ``model`` over the Cartesian product of two or three parameter ``axes``.
+
+    Every other model parameter must be given in ``fixed``. Invalid grid points
+    are NaN in ``lmax`` and False in ``valid``.
+    """
+    spec = get_model(model)
+    if not 2 <= len(axes) <= 3:
+        raise ValueError("Choose two or three grid parameters")
+    unknown = [name for name in axes if name not in spec.params]
+    if unknown:
+        raise ValueError(f"'{model}' has no parameter(s): {', '.join(unknown)}")
+    missing = [name for name in spec.params if name not in axes and name not in fixed]
+    if missing:
+        raise ValueError(f"Missing fixed values for '{model}': {', '.join(missing)}")
+
+    ndim = len(axes)
+    columns: dict[str, np.ndarray | float] = {name: float(fixed[name]) for name in spec.params if name not in axes}
+    clean_axes = {}
+    for dim, (name, values) in enumerate(axes.items()):
+        values = np.asarray(values, dtype=float).ravel()
+        clean_axes[name] = values
+        shape = [1] * ndim
+        shape[dim] = values.size
+        columns[name] = values.reshape(shape)
+
+    result = evaluate(model, columns, workers=workers)
+    return GridResult(
+        model=model,
+        axes=clean_axes,
+        lmax=result.lmax,
+        valid=result.valid,
+        fixed={name: value for name, value in columns.items() if name not in axes},
+    )
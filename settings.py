@@ -43,3 +43,23 @@ PANEL_ALLOW_ORIGINS = _env_csv(
     'PANEL_ALLOW_ORIGINS',
     'localhost:5007,127.0.0.1:5007,localhost:5000,127.0.0.1:5000',
 )
+
+CACHE_DIR = Path(os.getenv('CAST_CACHE_DIR', str(BASE_DIR / '.cache')))
+
+MODEL_CACHE_MAX_ENTRIES = int(os.getenv('MODEL_CACHE_MAX_ENTRIES', '4096'))
+MODEL_CACHE_TTL = float(os.getenv('MODEL_CACHE_TTL', '3600'))
+
+# SOLVER_WORKERS bounds solver jobs per process; SOLVER_SLOTS bounds them across
+# every process sharing SOLVER_RUN_DIR (gunicorn workers and the Panel server).
+SOLVER_WORKERS = int(os.getenv('SOLVER_WORKERS', str(os.cpu_count() or 1)))
+SOLVER_SLOTS = int(os.getenv('SOLVER_SLOTS', str(os.cpu_count() or 1)))
+SOLVER_TIMEOUT = float(os.getenv('SOLVER_TIMEOUT', '900'))
+SOLVER_RUN_DIR = Path(os.getenv('SOLVER_RUN_DIR', str(BASE_DIR / '.numerical_runs')))
+NUMERICAL_JOB_DIR = Path(os.getenv('NUMERICAL_JOB_DIR', str(CACHE_DIR / 'numerical_jobs')))
+NUMERICAL_JOB_RETENTION = float(os.getenv('NUMERICAL_JOB_RETENTION', str(24 * 3600)))
+# Each open event stream holds a gunicorn sync worker, so streams close after
+# this many seconds and the browser's EventSource reconnects.
+NUMERICAL_EVENT_STREAM_SECONDS = float(os.getenv('NUMERICAL_EVENT_STREAM_SECONDS', '25'))
+NUMERICAL_CACHE_DIR = Path(os.getenv('NUMERICAL_CACHE_DIR', str(CACHE_DIR / 'numerical')))
+NUMERICAL_CACHE_MAX_BYTES = int(float(os.getenv('NUMERICAL_CACHE_MAX_MB', '512')) * 1024 * 1024)
+NUMERICAL_SCENARIO_WORKERS = int(os.getenv('NUMERICAL_SCENARIO_WORKERS', str(max(2, SOLVER_WORKERS))))
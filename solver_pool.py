@@ -0,0 +1,369 @@
+"""
+Bounded worker pool for the external MODFLOW/MT3DMS solvers.
+
+Every numerical run is queued here instead of spawning solvers directly in the
+caller. Each process runs at most ``SOLVER_WORKERS`` jobs at once. Jobs wait in
+a priority queue: a lower value runs first, and jobs with equal priority run
+FIFO. Every process that shares ``SOLVER_RUN_DIR`` (the gunicorn workers and
+the Panel server in one container) also takes one of ``SOLVER_SLOTS`` lock
+files before running a job, so the total number of concurrent solver jobs is
+bounded across processes where ``fcntl`` is available. Each worker thread owns
+a working directory under a per-process ``pid-<pid>`` directory; it is emptied
+and reused for every job and removed when the process exits. Solver processes are started by ``SolverContext.run`` with the
+time remaining before the job's deadline; a process that overruns is killed
+and the job fails with ``SolverTimeout``. Executables are resolved once per
+pool. Passing ``executables`` explicitly, e.g. pointing at a stub script,
+lets the pool run without real solver binaries.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import heapq
+import itertools
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping
+
+from settings import SOLVER_RUN_DIR, SOLVER_SLOTS, SOLVER_TIMEOUT, SOLVER_WORKERS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+
+class SolverTimeout(RuntimeError):
+    """A solver job ran past its time limit; its running process was killed."""
+
+
+# program key -> (environment variable, fallback executable names)
+SOLVER_EXECUTABLES: dict[str, tuple[str, list[str]]] = {
+    "mf2005": ("MF2005_EXE", ["mf2005.exe", "mf2005"]),
+    "mt3dms": ("MT3DMS_EXE", ["mt3dms.exe", "mt3dms"]),
+}
+
+
+def _resolve_executable(env_name: str, fallback_names: list[str]) -> str:
+    configured = os.getenv(env_name)
+    if configured and Path(configured).exists():
+        configured_path = Path(configured)
+        if os.name != "nt" and configured_path.suffix.lower() == ".exe":
+            raise RuntimeError(
+                f"{env_name} points to a Windows executable ({configured_path.name}), "
+                "which cannot run inside Docker/Linux. Provide a Linux binary instead."
+            )
+        return configured
+
+    local_dirs = [
+        Path.cwd(),
+        Path.cwd() / ".modflow_bin",
+        Path.cwd() / "solvers",
+        Path.cwd() / "bin",
+    ]
+
+    windows_only_candidates: list[str] = []
+
+    for name in fallback_names:
+        found = shutil.which(name)
+        if found:
+            found_path = Path(found)
+            if os.name != "nt" and found_path.suffix.lower() == ".exe":
+                windows_only_candidates.append(str(found_path))
+                continue
+            return found
+        for directory in local_dirs:
+            local = directory / name
+            if local.exists():
+                if os.name != "nt" and local.suffix.lower() == ".exe":
+                    windows_only_candidates.append(str(local))
+                    continue
+                return str(local)
+
+    if os.name != "nt" and windows_only_candidates:
+        raise RuntimeError(
+            f"Only Windows solver binaries were found for {env_name}: {windows_only_candidates}. "
+            "Docker numerical runs require Linux solver binaries in solvers/ or on PATH."
+        )
+
+    raise RuntimeError(
+        f"Missing required executable for {env_name}. "
+        f"Set {env_name} or place one of {fallback_names} on PATH."
+    )
+
+
+@dataclass
+class SolverContext:
+    """What a job sees: its worker's empty working directory, the executables and its deadline."""
+
+    workdir: Path
+    executables: Mapping[str, str]
+    deadline: float | None = None
+    progress: Callable[[str], None] | None = None
+
+    def report(self, phase: str) -> None:
+        """Forward a progress phase (e.g. "modflow") to the submitter's callback, if any."""
+        if self.progress is not None:
+            self.progress(phase)
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def run(self, program: str, namefile: str) -> tuple[bool, list[str]]:
+        """
+        Run ``program`` on ``namefile`` inside ``workdir`` and return (success, output lines).
+
+        Success follows FloPy's convention: the solver reported normal
+        termination (MT3DMS prints "Program completed" instead).
+        """
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise SolverTimeout(f"{program} was not started: the job time limit was reached.")
+        process = subprocess.Popen(
+            [self.executables[program], namefile],
+            cwd=self.workdir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            start_new_session=os.name != "nt",
+        )
+        try:
+            output, _ = process.communicate(timeout=remaining)
+        except subprocess.TimeoutExpired as exc:
+            _kill(process)
+            raise SolverTimeout(f"{program} exceeded the job time limit and was stopped.") from exc
+        lines = output.splitlines()
+        text = output.lower()
+        success = "normal termination" in text or "program completed" in text
+        return success, lines
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Kill a timed-out solver and anything it spawned (its own process group on POSIX)."""
+    try:
+        if os.name != "nt":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.communicate()
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    sequence: int
+    func: Callable = field(compare=False)
+    args: tuple = field(compare=False)
+    kwargs: dict = field(compare=False)
+    timeout: float | None = field(compare=False)
+    progress: Callable[[str], None] | None = field(compare=False)
+    future: Future = field(compare=False)
+
+
+class SolverPool:
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        timeout: float | None = SOLVER_TIMEOUT,
+        root: Path | str | None = None,
+        executables: Mapping[str, str] | None = None,
+        slots: int | None = None,
+        slot_poll: float = 0.25,
+    ):
+        self.max_workers = max(1, int(max_workers or SOLVER_WORKERS))
+        self.timeout = timeout
+        self.root = Path(root) if root is not None else SOLVER_RUN_DIR
+        self.run_dir = self.root / f"pid-{os.getpid()}"
+        self.slots = max(1, int(slots or SOLVER_SLOTS))
+        self.slot_poll = slot_poll
+        self._executables = dict(executables) if executables is not None else None
+        self._queue: list[_Job] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._active = 0
+        self._closed = False
+
+    @property
+    def executables(self) -> dict[str, str]:
+        """Solver paths, resolved on first use and then reused for every job."""
+        with self._condition:
+            if self._executables is None:
+                self._executables = {
+                    name: _resolve_executable(env_name, fallbacks)
+                    for name, (env_name, fallbacks) in SOLVER_EXECUTABLES.items()
+                }
+            return self._executables
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        priority: int = 0,
+        timeout: float | None = None,
+        progress: Callable[[str], None] | None = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Queue ``func(context, *args, **kwargs)``; returns a Future for its result.
+
+        ``timeout`` (seconds, default: the pool's) covers the whole job, queue
+        wait excluded. ``progress`` receives the phases the job reports.
+        """
+        future: Future = Future()
+        job = _Job(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            timeout=self.timeout if timeout is None else timeout,
+            progress=progress,
+            future=future,
+        )
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The solver pool has been shut down.")
+            heapq.heappush(self._queue, job)
+            if len(self._threads) < self.max_workers and len(self._threads) < self._active + len(self._queue):
+                self._start_worker(len(self._threads))
+            self._condition.notify()
+        return future
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {"workers": len(self._threads), "running": self._active, "queued": len(self._queue)}
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        with self._condition:
+            self._closed = True
+            if cancel_pending:
+                for job in self._queue:
+                    job.future.cancel()
+                self._queue.clear()
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def discard(self) -> None:
+        """Cancel queued jobs and delete this process's working directories without waiting."""
+        self.shutdown(wait=False, cancel_pending=True)
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def _start_worker(self, index: int) -> None:
+        thread = threading.Thread(target=self._worker, args=(index,), name=f"solver-worker-{index}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_job(self) -> _Job | None:
+        with self._condition:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            job = heapq.heappop(self._queue)
+            self._active += 1
+            return job
+
+    @contextlib.contextmanager
+    def _slot(self):
+        """Hold one of the ``slots`` lock files shared by every process using ``root``."""
+        if fcntl is None:
+            yield
+            return
+        slot_dir = self.root / "slots"
+        slot_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            for index in range(self.slots):
+                handle = open(slot_dir / f"slot-{index}.lock", "a+")
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    handle.close()
+                    continue
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                    handle.close()
+                return
+            time.sleep(self.slot_poll)
+
+    def _worker(self, index: int) -> None:
+        workdir = self.run_dir / f"worker-{index}"
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with self._slot():
+                        _reset_directory(workdir)
+                        deadline = None if job.timeout is None else time.monotonic() + job.timeout
+                        context = SolverContext(
+                            workdir=workdir, executables=self.executables, deadline=deadline, progress=job.progress
+                        )
+                        job.future.set_result(job.func(context, *job.args, **job.kwargs))
+                except BaseException as exc:
+                    job.future.set_exception(exc)
+            finally:
+                with self._condition:
+                    self._active -= 1
+
+
+def _reset_directory(path: Path) -> None:
+    """Empty (or create) a worker's reusable working directory."""
+    path.mkdir(parents=True, exist_ok=True)
+    for child in path.iterdir():
+        if child.is_dir() and not child.is_symlink():
+            shutil.rmtree(child, ignore_errors=True)
+        else:
+            child.unlink(missing_ok=True)
+
+
+def _remove_stale_run_dirs(root: Path) -> None:
+    """Delete ``pid-<pid>`` directories left behind by processes that no longer exist."""
+    if os.name == "nt" or not root.exists():
+        return
+    for path in root.glob("pid-*"):
+        try:
+            os.kill(int(path.name[4:]), 0)
+        except ValueError:
+            continue
+        except ProcessLookupError:
+            shutil.rmtree(path, ignore_errors=True)
+        except PermissionError:
+            pass
+
+
+_POOL: SolverPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_solver_pool() -> SolverPool:
+    """Process-wide solver pool shared by the Panel apps and job runners."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SolverPool()
+            _remove_stale_run_dirs(_POOL.root)
+            atexit.register(_POOL.discard)
+        return _POOL
@@ -0,0 +1,313 @@
+"""
+In-process steady-state engine for the numerical plume models.
+
+Solves the same 2-D vertical and horizontal setups as the MODFLOW/MT3DMS jobs
+on the same block-centred grid, without external binaries or file I/O:
+
+* flow: fixed heads ``h1``/``h2`` on the inflow/outflow columns, no-flow
+  elsewhere, five-point finite volumes for head;
+* transport: steady advection-dispersion of the mixed conservative component
+  with the MT3DMS fixed-concentration cells, hybrid central/upwind advection
+  and longitudinal/transverse dispersion from the cell velocities.
+
+Both are assembled with scipy.sparse and solved directly. Porosity cancels
+from the steady state; it only enters the breakthrough curves, which are
+integrated with implicit Euler steps on the same transport matrix.
+
+The numerical runners use it only with ``engine="sparse"``, for quick previews
+and parameter sweeps; MODFLOW/MT3DMS stays the reference. ``compare_engines``
+cross-checks a scenario against it: run ``python sparse_engine.py`` on a
+machine with flopy and the solver binaries.
+
+Cross-check against MODFLOW 6.2 GWF/GWT (TVD advection, XT3D dispersion,
+constant-concentration cells for the fixed cells) on the same grids,
+boundaries and 6000 d period; both reference runs had reached steady state
+(change over the second half of the period below 2e-6 mg/L):
+
+===========================  ==========  ==========  ===============
+scenario / model             MF6 Lmax    sparse      max |dC| (mg/L)
+===========================  ==========  ==========  ===============
+defaults, vertical 20x43     32.19 m     32.15 m     0.46
+defaults, horizontal 80x47   43.14 m     43.17 m     0.25
+al=0.5, vertical             28.69 m     28.33 m     1.98
+al=0.5, horizontal           45.53 m     45.68 m     3.58
+al=0.05, dx=0.25, vertical   27.31 m     27.31 m     1.59
+al=0.05, dx=0.25, horizontal 46.04 m     46.06 m     1.54
+===========================  ==========  ==========  ===============
+
+The largest differences sit on the steep plume fringe, where TVD and the
+hybrid scheme smear the front differently. The horizontal lengths above
+the Cirpka estimate (30.8 m) are reproduced by MODFLOW as well: the plume
+runs into the fixed-concentration outflow column at ``L_D_h`` (1.5 times
+the Cirpka length), and in a 300 m long domain it reaches about 210 m. That
+gap therefore comes from the domain sizing shared by both engines, not from
+the transport scheme. MT3DMS itself was not part of this check.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from numerical_models import (
+    HorizontalModelResult,
+    NumericalModelResult,
+    _horizontal_transport_bc,
+    _observation_cells,
+    _output_times,
+    _vertical_transport_bc,
+)
+from plume_geometry import extract_plume
+
+# Implicit Euler steps per MT3DMS output interval for breakthrough curves.
+SUBSTEPS = 5
+
+
+def _assemble(a_east, a_west, a_south, a_north, fixed: np.ndarray) -> tuple[np.ndarray, sp.csr_matrix]:
+    """
+    Diagonal (nrow, ncol) and off-diagonal matrix of a finite-volume balance.
+
+    ``a_east[i, j]`` is the weight of cell (i, j+1) in the balance of (i, j) and
+    ``a_west[i, j]`` that of (i, j) in the balance of (i, j+1); ``a_south`` /
+    ``a_north`` are the same between rows i and i+1. The diagonal is the sum
+    of each cell's neighbour weights.
+    """
+    nrow, ncol = fixed.shape
+    index = np.arange(nrow * ncol).reshape(nrow, ncol)
+    diag = np.zeros((nrow, ncol))
+    diag[:, :-1] += a_east
+    diag[:, 1:] += a_west
+    diag[:-1, :] += a_south
+    diag[1:, :] += a_north
+    rows = np.concatenate([index[:, :-1].ravel(), index[:, 1:].ravel(), index[:-1, :].ravel(), index[1:, :].ravel()])
+    cols = np.concatenate([index[:, 1:].ravel(), index[:, :-1].ravel(), index[1:, :].ravel(), index[:-1, :].ravel()])
+    data = -np.concatenate([a_east.ravel(), a_west.ravel(), a_south.ravel(), a_north.ravel()])
+    return diag, sp.csr_matrix((data, (rows, cols)), shape=(nrow * ncol, nrow * ncol))
+
+
+def _finish(diag: np.ndarray, offdiag: sp.csr_matrix, fixed: np.ndarray) -> sp.csc_matrix:
+    """System matrix with identity rows for fixed cells."""
+    free = (~fixed).ravel().astype(float)
+    matrix = sp.diags(free) @ (offdiag + sp.diags(diag.ravel())) + sp.diags(1.0 - free)
+    return matrix.tocsc()
+
+
+def _flow(nrow: int, ncol: int, dx: float, dy: float, h1: float, h2: float, hk: float):
+    """Darcy fluxes [m/d] on x faces (nrow, ncol-1) and y faces (nrow-1, ncol)."""
+    fixed = np.zeros((nrow, ncol), dtype=bool)
+    fixed[:, [0, -1]] = True
+    cx = np.full((nrow, ncol - 1), hk * dy / dx)
+    cy = np.full((nrow - 1, ncol), hk * dx / dy)
+    diag, offdiag = _assemble(cx, cx, cy, cy, fixed)
+    rhs = np.zeros((nrow, ncol))
+    rhs[:, 0], rhs[:, -1] = h1, h2
+    head = spla.spsolve(_finish(diag, offdiag, fixed), rhs.ravel()).reshape(nrow, ncol)
+    qx = hk * (head[:, :-1] - head[:, 1:]) / dx
+    qy = hk * (head[:-1, :] - head[1:, :]) / dy
+    return qx, qy
+
+
+def _transport_matrix(qx, qy, dx: float, dy: float, al: float, at: float, fixed: np.ndarray):
+    """Steady advection-dispersion operator (unit aquifer thickness) and its diagonal parts."""
+    nrow, ncol = fixed.shape
+    # Cell-centred Darcy velocity, then face values for the dispersion tensor.
+    qx_cell = np.zeros((nrow, ncol))
+    qx_cell[:, :-1] += 0.5 * qx
+    qx_cell[:, 1:] += 0.5 * qx
+    qx_cell[:, [0, -1]] *= 2.0
+    qy_cell = np.zeros((nrow, ncol))
+    qy_cell[:-1, :] += 0.5 * qy
+    qy_cell[1:, :] += 0.5 * qy
+    if nrow > 1:
+        qy_cell[[0, -1], :] *= 2.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qy_xface = 0.5 * (qy_cell[:, :-1] + qy_cell[:, 1:])
+        speed = np.hypot(qx, qy_xface)
+        dxx = np.where(speed > 0, (al * qx**2 + at * qy_xface**2) / speed, 0.0)
+        qx_yface = 0.5 * (qx_cell[:-1, :] + qx_cell[1:, :])
+        speed = np.hypot(qx_yface, qy)
+        dyy = np.where(speed > 0, (at * qx_yface**2 + al * qy**2) / speed, 0.0)
+
+    fx, dfx = qx * dy, dxx * dy / dx
+    fy, dfy = qy * dx, dyy * dx / dy
+    a_east = np.maximum.reduce([-fx, dfx - fx / 2, np.zeros_like(fx)])
+    a_west = np.maximum.reduce([fx, dfx + fx / 2, np.zeros_like(fx)])
+    a_south = np.maximum.reduce([-fy, dfy - fy / 2, np.zeros_like(fy)])
+    a_north = np.maximum.reduce([fy, dfy + fy / 2, np.zeros_like(fy)])
+    diag, offdiag = _assemble(a_east, a_west, a_south, a_north, fixed)
+    # Net outflow keeps the balance exact where the discrete flow field is not divergence free.
+    net_out = np.zeros((nrow, ncol))
+    net_out[:, :-1] += fx
+    net_out[:, 1:] -= fx
+    net_out[:-1, :] += fy
+    net_out[1:, :] -= fy
+    return diag + net_out, offdiag
+
+
+def _solve_transport(qx, qy, dx, dy, al, at, prsity, icbund, sconc, obs_cells, output_times):
+    fixed = icbund[0] < 0
+    initial = sconc[0].astype(np.float64)
+    diag, offdiag = _transport_matrix(qx, qy, dx, dy, al, at, fixed)
+    rhs = np.where(fixed, initial, 0.0).ravel()
+    conc = spla.spsolve(_finish(diag, offdiag, fixed), rhs).reshape(fixed.shape)
+    if not obs_cells:
+        return conc, np.zeros(0), np.zeros((0, 0))
+
+    times = _output_times(output_times)
+    dt = times[0] / SUBSTEPS
+    storage = prsity * dx * dy / dt
+    lu = spla.splu(_finish(diag + storage, offdiag, fixed))
+    rows = np.array([cell[1] for cell in obs_cells])
+    cols = np.array([cell[2] for cell in obs_cells])
+    state = initial.ravel()
+    free = (~fixed).ravel()
+    breakthrough = np.zeros((times.size, len(obs_cells)))
+    for n in range(times.size):
+        for _ in range(SUBSTEPS):
+            state = lu.solve(np.where(free, storage * state, rhs))
+        breakthrough[n] = state.reshape(fixed.shape)[rows, cols]
+    return conc, times, breakthrough
+
+
+def solve_vertical(
+    Lx: float,
+    Ly: float,
+    ncol: int,
+    nrow: int,
+    prsity: float,
+    al: float,
+    av: float,
+    gamma: float,
+    cd: float,
+    ca: float,
+    h1: float,
+    h2: float,
+    hk: float,
+    observation_points=None,
+    output_times: int = 50,
+) -> NumericalModelResult:
+    """Vertical cross-section model; same inputs and result as ``run_numerical_model``."""
+    dx, dy = Lx / ncol, Ly / nrow
+    x_grid = np.linspace(0.0, Lx, ncol)
+    z_grid = np.linspace(0.0, Ly, nrow)
+    obs_points, obs_cells = _observation_cells(observation_points, x_grid, z_grid, "z")
+    icbund, sconc = _vertical_transport_bc(nrow, ncol, gamma, cd, ca)
+    qx, qy = _flow(nrow, ncol, dx, dy, h1, h2, hk)
+    conc, obs_times, breakthrough = _solve_transport(qx, qy, dx, dy, al, av, prsity, icbund, sconc, obs_cells, output_times)
+
+    c0 = 2 * ca
+    plume = extract_plume(conc, x_grid, z_grid, c0, porosity=prsity, gamma=gamma)
+    return NumericalModelResult(
+        plume_length=plume.length,
+        concentration=conc,
+        x_grid=x_grid,
+        z_grid=z_grid,
+        plume_level=c0,
+        plume_width=plume.width,
+        plume_area=plume.area,
+        plume_mass=plume.mass,
+        obs_points=obs_points,
+        obs_times=obs_times,
+        breakthrough=breakthrough,
+        engine="sparse",
+    )
+
+
+def solve_horizontal(
+    Lx: float,
+    A_W: float,
+    Sw: float,
+    ncol: int,
+    nrow: int,
+    prsity: float,
+    al: float,
+    alpha_Th: float,
+    gamma: float,
+    cd: float,
+    ca: float,
+    h1: float,
+    h2: float,
+    hk: float,
+    observation_points=None,
+    output_times: int = 50,
+) -> HorizontalModelResult:
+    """Plan-view model; same inputs and result as ``run_numerical_model_horizontal``."""
+    dx, dy = Lx / ncol, A_W / nrow
+    x_grid = np.linspace(0.0, Lx, ncol)
+    y_grid = np.linspace(0.0, A_W, nrow)
+    obs_points, obs_cells = _observation_cells(observation_points, x_grid, y_grid, "y")
+    icbund, sconc = _horizontal_transport_bc(A_W, Sw, nrow, ncol, gamma, cd, ca)
+    qx, qy = _flow(nrow, ncol, dx, dy, h1, h2, hk)
+    conc, obs_times, breakthrough = _solve_transport(
+        qx, qy, dx, dy, al, alpha_Th, prsity, icbund, sconc, obs_cells, output_times
+    )
+
+    c0 = 2.0 * ca
+    plume = extract_plume(conc, x_grid, y_grid, c0, porosity=prsity, gamma=gamma)
+    return HorizontalModelResult(
+        plume_length=plume.length,
+        concentration=conc,
+        x_grid=x_grid,
+        y_grid=y_grid,
+        plume_level=c0,
+        plume_width=plume.width,
+        plume_area=plume.area,
+        plume_mass=plume.mass,
+        obs_points=obs_points,
+        obs_times=obs_times,
+        breakthrough=breakthrough,
+        engine="sparse",
+    )
+
+
+def compare_engines(scenario) -> dict:
+    """
+    Run one ``numerical_jobs`` scenario with both engines and report the differences.
+
+    Needs flopy and the MODFLOW/MT3DMS binaries. Returns plume lengths, the
+    largest absolute concentration difference and wall times per model.
+    """
+    from numerical_jobs import prepare_scenario
+    from numerical_models import run_numerical_model, run_numerical_model_horizontal
+
+    s = prepare_scenario(scenario)
+    vertical = (
+        s["L_D_v"], s["A_T"], s["n_cols_v"], s["n_rows_v"], s["prsity"], s["al"], s["av"],
+        s["gamma"], s["Cd"], s["Ca"], s["h1"], s["h2"], s["hk"],
+    )
+    horizontal = (
+        s["L_D_h"], s["A_W"], s["Sw"], s["n_cols_h"], s["n_rows_h"], s["prsity"], s["al"], s["alpha_th"],
+        s["gamma"], s["Cd"], s["Ca"], s["h1"], s["h2"], s["hk"],
+    )
+    report = {}
+    for model, runner, args in (
+        ("vertical", run_numerical_model, vertical),
+        ("horizontal", run_numerical_model_horizontal, horizontal),
+    ):
+        timings, results = {}, {}
+        for engine in ("sparse", "modflow"):
+            start = time.perf_counter()
+            results[engine] = runner(*args, engine=engine, use_cache=False)
+            timings[engine] = time.perf_counter() - start
+        report[model] = {
+            "sparse_plume_length": results["sparse"].plume_length,
+            "modflow_plume_length": results["modflow"].plume_length,
+            "plume_length_difference": results["sparse"].plume_length - results["modflow"].plume_length,
+            "max_concentration_difference": float(
+                np.max(np.abs(results["sparse"].concentration - results["modflow"].concentration))
+            ),
+            "sparse_seconds": timings["sparse"],
+            "modflow_seconds": timings["modflow"],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    for model, values in compare_engines({}).items():
+        print(model)
+        for key, value in values.items():
+            print(f"{key:>32}: {value}")
@@ -0,0 +1,259 @@
+"""
+Indexed, memory-mapped reader for MT3DMS concentration (UCN) output.
+
+The file is mapped once and every CONCENTRATION record is indexed by
+(totim, layer) with the byte offset of its data. Arrays returned by ``record``,
+``get_data`` and ``get_alldata`` are views into the map, so nothing is read
+until it is used; ``time_series`` touches only the pages holding the
+requested cells. Both sequential-unformatted Fortran files (4-byte record
+markers) and raw stream files are supported, in single or double precision.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+# Header payload size -> precision of the data record that follows it.
+HEADER_SIZES = {44: np.dtype("<f4"), 48: np.dtype("<f8")}
+
+
+def _parse_mt3d_header(header_payload: bytes) -> tuple[float, str, int, int, int, np.dtype]:
+    if len(header_payload) == 44:
+        ntrans, kstp, kper, totim = struct.unpack("<3if", header_payload[:16])
+        text = header_payload[16:32].decode("ascii", "ignore").strip()
+        ncol_hdr, nrow_hdr, ilay_hdr = struct.unpack("<3i", header_payload[32:44])
+        precision = np.dtype(np.float32)
+    elif len(header_payload) == 48:
+        ntrans, kstp, kper = struct.unpack("<3i", header_payload[:12])
+        (totim,) = struct.unpack("<d", header_payload[12:20])
+        text = header_payload[20:36].decode("ascii", "ignore").strip()
+        ncol_hdr, nrow_hdr, ilay_hdr = struct.unpack("<3i", header_payload[36:48])
+        precision = np.dtype(np.float64)
+    else:
+        raise RuntimeError(f"Unsupported MT3DMS concentration header size {len(header_payload)} bytes.")
+
+    return float(totim), text, int(ncol_hdr), int(nrow_hdr), int(ilay_hdr), precision
+
+
+@dataclass(frozen=True)
+class UcnRecord:
+    totim: float
+    layer: int  # 1-based, as written by MT3DMS
+    offset: int  # byte offset of the data payload
+    dtype: np.dtype
+
+
+class UcnFile:
+    """
+    Random access to every timestep of an MT3DMS UCN file.
+
+    Use as a context manager, or call ``close``; views handed out keep the
+    map alive until they are released.
+    """
+
+    def __init__(self, path: Path | str, nrow: int, ncol: int, nlay: int = 1):
+        self.path = Path(path)
+        self.nrow, self.ncol, self.nlay = int(nrow), int(ncol), int(nlay)
+        with self.path.open("rb") as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise RuntimeError("MT3DMS concentration output is empty.") from None
+        self._size = len(self._mmap)
+
+        self.records = self._index()
+        if not self.records:
+            self.close()
+            raise RuntimeError("MT3DMS concentration output did not contain any concentration records.")
+        self.times = np.unique([rec.totim for rec in self.records])
+        self._lookup = {
+            (int(np.searchsorted(self.times, rec.totim)), rec.layer): rec for rec in self.records
+        }
+        self._cube = self._strided_view()
+
+    # ── Indexing ──────────────────────────────────────────────────────────────
+    def _int(self, offset: int) -> int:
+        return struct.unpack_from("<i", self._mmap, offset)[0]
+
+    def _fortran_record(self, offset: int) -> tuple[int, int]:
+        """(payload offset, payload length) of the Fortran record at ``offset``."""
+        if offset + 4 > self._size:
+            raise RuntimeError("Unexpected end of file while reading Fortran record length.")
+        length = self._int(offset)
+        end = offset + 4 + length
+        if length < 0 or end + 4 > self._size:
+            raise RuntimeError("Unexpected end of file while reading Fortran record payload.")
+        if self._int(end) != length:
+            raise RuntimeError("Corrupt Fortran record: length prefix/suffix mismatch.")
+        return offset + 4, length
+
+    def _add(self, records: list, header_offset: int, header_size: int, data_offset: int, data_size: int | None):
+        totim, text, ncol_hdr, nrow_hdr, ilay_hdr, precision = _parse_mt3d_header(
+            self._mmap[header_offset:header_offset + header_size]
+        )
+        if ncol_hdr != self.ncol or nrow_hdr != self.nrow:
+            raise RuntimeError(
+                f"Unexpected MT3DMS concentration shape ({nrow_hdr}, {ncol_hdr}); "
+                f"expected ({self.nrow}, {self.ncol})."
+            )
+        if text.upper() != "CONCENTRATION" or not 1 <= ilay_hdr <= self.nlay:
+            return
+        if data_size is not None and data_size != self.nrow * self.ncol * precision.itemsize:
+            raise RuntimeError(
+                f"Unexpected MT3DMS concentration payload size {data_size // precision.itemsize}; "
+                f"expected {self.nrow * self.ncol}."
+            )
+        records.append(UcnRecord(totim, ilay_hdr, data_offset, precision.newbyteorder("<")))
+
+    def _index_fortran(self) -> list[UcnRecord]:
+        records: list[UcnRecord] = []
+        offset = 0
+        while offset < self._size:
+            header_offset, header_size = self._fortran_record(offset)
+            offset = header_offset + header_size + 4
+            if offset >= self._size:
+                raise RuntimeError("Incomplete MT3DMS concentration output: missing data record.")
+            data_offset, data_size = self._fortran_record(offset)
+            offset = data_offset + data_size + 4
+            self._add(records, header_offset, header_size, data_offset, data_size)
+        return records
+
+    def _index_raw(self) -> list[UcnRecord]:
+        # The header size is fixed for a file, so it is detected once from the
+        # first record and every later record follows at a known stride.
+        cell_count = self.nrow * self.ncol
+        for header_size, precision in HEADER_SIZES.items():
+            if header_size + cell_count * precision.itemsize > self._size:
+                continue
+            try:
+                _totim, text, ncol_hdr, nrow_hdr, _layer, parsed = _parse_mt3d_header(self._mmap[:header_size])
+            except RuntimeError:
+                continue
+            if parsed == precision and (ncol_hdr, nrow_hdr) == (self.ncol, self.nrow):
+                break
+        else:
+            raise RuntimeError(
+                "Unsupported MT3DMS concentration output format. "
+                "Expected raw UCN records or sequential-unformatted Fortran records."
+            )
+
+        data_size = cell_count * precision.itemsize
+        records: list[UcnRecord] = []
+        offset = 0
+        while offset < self._size:
+            if offset + header_size + data_size > self._size:
+                raise RuntimeError("Incomplete MT3DMS concentration output: truncated record.")
+            self._add(records, offset, header_size, offset + header_size, None)
+            offset += header_size + data_size
+        return records
+
+    def _index(self) -> list[UcnRecord]:
+        if self._size >= 4 and self._int(0) in HEADER_SIZES:
+            try:
+                return self._index_fortran()
+            except RuntimeError as exc:
+                if "length prefix/suffix mismatch" not in str(exc):
+                    raise
+        return self._index_raw()
+
+    def _strided_view(self) -> np.ndarray | None:
+        """(ntimes, nlay, nrow, ncol) view over the whole file if its records are evenly spaced."""
+        nt = self.times.size
+        if len(self.records) != nt * self.nlay or len({rec.dtype for rec in self.records}) != 1:
+            return None
+        expected = [(t, k) for t in range(nt) for k in range(1, self.nlay + 1)]
+        if [(int(np.searchsorted(self.times, rec.totim)), rec.layer) for rec in self.records] != expected:
+            return None
+        offsets = np.array([rec.offset for rec in self.records])
+        stride = int(offsets[1] - offsets[0]) if offsets.size > 1 else 0
+        if offsets.size > 1 and np.any(np.diff(offsets) != stride):
+            return None
+        dtype = self.records[0].dtype
+        return np.ndarray(
+            (nt, self.nlay, self.nrow, self.ncol),
+            dtype=dtype,
+            buffer=self._mmap,
+            offset=int(offsets[0]),
+            strides=(stride * self.nlay, stride, self.ncol * dtype.itemsize, dtype.itemsize),
+        )
+
+    # ── Access ────────────────────────────────────────────────────────────────
+    def time_index(self, totim: float | None = None) -> int:
+        """Index into ``times`` of ``totim`` (the last time when None)."""
+        if totim is None:
+            return self.times.size - 1
+        match = np.flatnonzero(np.isclose(self.times, float(totim)))
+        if not match.size:
+            raise ValueError(f"No concentration output at time {totim}.")
+        return int(match[0])
+
+    def record(self, time_index: int, layer: int = 1) -> np.ndarray | None:
+        """(nrow, ncol) view of one record; ``layer`` is 1-based. None if not written."""
+        rec = self._lookup.get((time_index, layer))
+        if rec is None:
+            return None
+        return np.frombuffer(
+            self._mmap, dtype=rec.dtype, count=self.nrow * self.ncol, offset=rec.offset
+        ).reshape(self.nrow, self.ncol)
+
+    def get_data(self, totim: float | None = None) -> np.ndarray:
+        """(nlay, nrow, ncol) concentrations at ``totim`` (default: the last output time)."""
+        index = self.time_index(totim)
+        if self._cube is not None:
+            return self._cube[index]
+        cube = np.zeros((self.nlay, self.nrow, self.ncol), dtype=np.float64)
+        for layer in range(1, self.nlay + 1):
+            data = self.record(index, layer)
+            if data is not None:
+                cube[layer - 1] = data
+        return cube
+
+    def get_alldata(self) -> np.ndarray:
+        """(ntimes, nlay, nrow, ncol) concentrations for every output time."""
+        if self._cube is not None:
+            return self._cube
+        return np.stack([self.get_data(t) for t in self.times])
+
+    def time_series(self, cells: Iterable[Sequence[int]]) -> np.ndarray:
+        """
+        (ntimes, ncells) concentrations at 0-based (layer, row, col) cells.
+
+        Only the requested values of each record are read.
+        """
+        cells = np.asarray(list(cells), dtype=int).reshape(-1, 3)
+        if cells.size and (
+            np.any(cells < 0) or np.any(cells >= np.array([self.nlay, self.nrow, self.ncol]))
+        ):
+            raise ValueError("Observation cell outside the model grid.")
+        if self._cube is not None:
+            return np.asarray(self._cube[:, cells[:, 0], cells[:, 1], cells[:, 2]], dtype=np.float64)
+        series = np.zeros((self.times.size, len(cells)))
+        for index in range(self.times.size):
+            for n, (k, i, j) in enumerate(cells):
+                rec = self._lookup.get((index, int(k) + 1))
+                if rec is not None:
+                    series[index, n] = np.frombuffer(
+                        self._mmap, dtype=rec.dtype, count=1,
+                        offset=rec.offset + (int(i) * self.ncol + int(j)) * rec.dtype.itemsize,
+                    )[0]
+        return series
+
+    def close(self) -> None:
+        self._cube = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views are still referenced; the map is released with them.
+            pass
+
+    def __enter__(self) -> "UcnFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()